@@ -0,0 +1,26 @@
+"""add entities updated_at index
+
+Revision ID: a2d9f4c7e861
+Revises: f6b2d8e4a173
+Create Date: 2026-10-20 10:27:53.904412
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a2d9f4c7e861'
+down_revision: Union[str, None] = 'f6b2d8e4a173'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Live state mirrors refresh from rows changed since their last sync
+    op.create_index('ix_entities_updated_at', 'entities', ['updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_entities_updated_at', table_name='entities')
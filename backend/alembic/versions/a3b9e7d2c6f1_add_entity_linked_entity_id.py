@@ -0,0 +1,33 @@
+"""add entity linked_entity_id
+
+Revision ID: a3b9e7d2c6f1
+Revises: f2c6d8a4b1e9
+Create Date: 2026-10-19 16:21:09.301754
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3b9e7d2c6f1'
+down_revision: Union[str, None] = 'f2c6d8a4b1e9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('entities', sa.Column('linked_entity_id', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_entities_linked_entity_id'), 'entities', ['linked_entity_id'], unique=False)
+    op.create_foreign_key(
+        'entities_linked_entity_id_fkey', 'entities', 'entities',
+        ['linked_entity_id'], ['id'], ondelete='SET NULL'
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('entities_linked_entity_id_fkey', 'entities', type_='foreignkey')
+    op.drop_index(op.f('ix_entities_linked_entity_id'), table_name='entities')
+    op.drop_column('entities', 'linked_entity_id')
@@ -0,0 +1,52 @@
+"""jsonb event metadata and camera config with gin indexes
+
+Revision ID: a6d2f8c4e157
+Revises: f4c1e7b3d528
+Create Date: 2026-10-19 20:14:52.331806
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+from sqlalchemy.dialects import postgresql
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6d2f8c4e157'
+down_revision: Union[str, None] = 'f4c1e7b3d528'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (table, column, index)
+COLUMNS = (
+    ('events', 'event_metadata', 'ix_events_event_metadata'),
+    ('cameras', 'config', 'ix_cameras_config'),
+)
+
+
+def upgrade() -> None:
+    # jsonb_path_ops indexes only serve containment (@>) and jsonpath
+    # (@?, @@) queries, but are much smaller and faster than the default
+    # jsonb_ops - those are the only operators the API filters with.
+    for table, column, index in COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=postgresql.JSONB(),
+            postgresql_using=f'{column}::jsonb',
+        )
+        op.create_index(
+            index, table, [column],
+            postgresql_using='gin',
+            postgresql_ops={column: 'jsonb_path_ops'},
+        )
+
+
+def downgrade() -> None:
+    for table, column, index in COLUMNS:
+        op.drop_index(index, table_name=table)
+        op.alter_column(
+            table, column,
+            type_=sa.JSON(),
+            postgresql_using=f'{column}::json',
+        )
@@ -0,0 +1,40 @@
+"""add alert zones table
+
+Revision ID: b7e2d4a91c3f
+Revises: 563176853cf4
+Create Date: 2026-10-19 09:12:44.381520
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import geoalchemy2
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2d4a91c3f'
+down_revision: Union[str, None] = '563176853cf4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('alert_zones',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('description', sa.String(), nullable=True),
+    sa.Column('area', geoalchemy2.types.Geography(geometry_type='POLYGON', srid=4326, from_text='ST_GeogFromText', name='geography', nullable=False), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_alert_zones_id'), 'alert_zones', ['id'], unique=False)
+    op.create_index(op.f('ix_alert_zones_name'), 'alert_zones', ['name'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_alert_zones_name'), table_name='alert_zones')
+    op.drop_index(op.f('ix_alert_zones_id'), table_name='alert_zones')
+    op.drop_table('alert_zones')
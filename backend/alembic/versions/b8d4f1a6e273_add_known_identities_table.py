@@ -0,0 +1,40 @@
+"""add known identities table
+
+Revision ID: b8d4f1a6e273
+Revises: a3b9e7d2c6f1
+Create Date: 2026-10-19 17:04:51.662318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d4f1a6e273'
+down_revision: Union[str, None] = 'a3b9e7d2c6f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('known_identities',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('object_type', sa.String(), nullable=False),
+    sa.Column('features', postgresql.ARRAY(sa.Float()), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_known_identities_id'), 'known_identities', ['id'], unique=False)
+    op.create_index(op.f('ix_known_identities_name'), 'known_identities', ['name'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_known_identities_name'), table_name='known_identities')
+    op.drop_index(op.f('ix_known_identities_id'), table_name='known_identities')
+    op.drop_table('known_identities')
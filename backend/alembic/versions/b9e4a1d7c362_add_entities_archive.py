@@ -0,0 +1,87 @@
+"""add entities_archive table and partial entity indexes
+
+Revision ID: b9e4a1d7c362
+Revises: a6d2f8c4e157
+Create Date: 2026-10-19 21:02:37.640519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import geoalchemy2
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9e4a1d7c362'
+down_revision: Union[str, None] = 'a6d2f8c4e157'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('entities_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('entity_id', sa.String(), nullable=False),
+    sa.Column('object_type', sa.String(), nullable=False),
+    sa.Column('location', geoalchemy2.types.Geography(geometry_type='POINT', srid=4326, from_text='ST_GeogFromText', name='geography'), nullable=True),
+    sa.Column('latitude', sa.Float(), sa.Computed('ST_Y(location::geometry)', persisted=True), nullable=True),
+    sa.Column('longitude', sa.Float(), sa.Computed('ST_X(location::geometry)', persisted=True), nullable=True),
+    sa.Column('camera_id', sa.Integer(), nullable=False),
+    sa.Column('first_seen', sa.DateTime(), nullable=False),
+    sa.Column('last_seen', sa.DateTime(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('confidence', sa.Float(), nullable=False),
+    sa.Column('linked_entity_id', sa.Integer(), nullable=True),
+    sa.Column('is_recognized', sa.Boolean(), nullable=True),
+    sa.Column('recognized_as', sa.String(), nullable=True),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['camera_id'], ['cameras.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_entities_archive_entity_id'), 'entities_archive', ['entity_id'], unique=False)
+    op.create_index(op.f('ix_entities_archive_id'), 'entities_archive', ['id'], unique=False)
+    op.create_index(op.f('ix_entities_archive_last_seen'), 'entities_archive', ['last_seen'], unique=False)
+    op.create_index(op.f('ix_entities_archive_linked_entity_id'), 'entities_archive', ['linked_entity_id'], unique=False)
+
+    # Links may now point into the archive, so they can't reference entities
+    op.drop_constraint('entities_linked_entity_id_fkey', 'entities', type_='foreignkey')
+
+    # A boolean index is useless once most rows are inactive - index only
+    # the rows each side actually reads
+    op.drop_index('ix_entities_is_active', table_name='entities')
+    op.create_index('ix_entities_active_camera_id', 'entities', ['camera_id'], postgresql_where=sa.text('is_active'))
+    op.create_index('ix_entities_inactive_last_seen', 'entities', ['last_seen'], postgresql_where=sa.text('NOT is_active'))
+
+
+def downgrade() -> None:
+    # Put archived rows back first so nothing is lost
+    op.execute("""
+        INSERT INTO entities (id, entity_id, object_type, location, camera_id, first_seen, last_seen,
+                              is_active, confidence, linked_entity_id, is_recognized, recognized_as,
+                              created_at, updated_at)
+        SELECT id, entity_id, object_type, location, camera_id, first_seen, last_seen,
+               is_active, confidence, linked_entity_id, is_recognized, recognized_as,
+               created_at, updated_at
+        FROM entities_archive
+        ON CONFLICT DO NOTHING
+    """)
+    op.drop_index('ix_entities_inactive_last_seen', table_name='entities')
+    op.drop_index('ix_entities_active_camera_id', table_name='entities')
+    op.create_index('ix_entities_is_active', 'entities', ['is_active'], unique=False)
+    op.execute("""
+        UPDATE entities SET linked_entity_id = NULL
+        WHERE linked_entity_id IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM entities AS linked WHERE linked.id = entities.linked_entity_id)
+    """)
+    op.create_foreign_key(
+        'entities_linked_entity_id_fkey', 'entities', 'entities',
+        ['linked_entity_id'], ['id'], ondelete='SET NULL'
+    )
+    op.drop_index(op.f('ix_entities_archive_linked_entity_id'), table_name='entities_archive')
+    op.drop_index(op.f('ix_entities_archive_last_seen'), table_name='entities_archive')
+    op.drop_index(op.f('ix_entities_archive_id'), table_name='entities_archive')
+    op.drop_index(op.f('ix_entities_archive_entity_id'), table_name='entities_archive')
+    op.drop_table('entities_archive')
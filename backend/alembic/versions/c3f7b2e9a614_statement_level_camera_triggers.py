@@ -0,0 +1,83 @@
+"""notify camera changes once per statement
+
+Revision ID: c3f7b2e9a614
+Revises: b9e4a1d7c362
+Create Date: 2026-10-19 21:48:09.274163
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f7b2e9a614'
+down_revision: Union[str, None] = 'b9e4a1d7c362'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Longest id list sent; NOTIFY payloads are capped at 8000 bytes
+MAX_IDS_LENGTH = 7000
+
+
+def upgrade() -> None:
+    # One notification per statement listing every changed id, so a bulk
+    # import of thousands of cameras is one re-read per process, not
+    # thousands (see app/services/camera_registry.py)
+    op.execute("DROP TRIGGER cameras_notify_change ON cameras")
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION notify_camera_change() RETURNS trigger AS $$
+        DECLARE
+            ids text;
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                SELECT string_agg(id::text, ',') INTO ids FROM old_rows;
+            ELSE
+                SELECT string_agg(id::text, ',') INTO ids FROM new_rows;
+            END IF;
+            IF ids IS NULL THEN
+                RETURN NULL;
+            END IF;
+            IF length(ids) > {MAX_IDS_LENGTH} THEN
+                PERFORM pg_notify('camera_changes', 'RELOAD');
+            ELSE
+                PERFORM pg_notify('camera_changes', TG_OP || ':' || ids);
+            END IF;
+            PERFORM pg_notify('resource_versions', 'cameras:' || nextval('resource_version_seq'));
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    # Transition tables allow only one event per trigger
+    for event, transition in (
+        ('INSERT', 'NEW TABLE AS new_rows'),
+        ('UPDATE', 'NEW TABLE AS new_rows'),
+        ('DELETE', 'OLD TABLE AS old_rows'),
+    ):
+        op.execute(f"""
+            CREATE TRIGGER cameras_notify_{event.lower()}
+            AFTER {event} ON cameras
+            REFERENCING {transition}
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_camera_change()
+        """)
+
+
+def downgrade() -> None:
+    for event in ('insert', 'update', 'delete'):
+        op.execute(f"DROP TRIGGER cameras_notify_{event} ON cameras")
+    op.execute("""
+        CREATE OR REPLACE FUNCTION notify_camera_change() RETURNS trigger AS $$
+        DECLARE
+            camera_id integer := CASE WHEN TG_OP = 'DELETE' THEN OLD.id ELSE NEW.id END;
+        BEGIN
+            PERFORM pg_notify('camera_changes', TG_OP || ':' || camera_id);
+            PERFORM pg_notify('resource_versions', 'cameras:' || nextval('resource_version_seq'));
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER cameras_notify_change
+        AFTER INSERT OR UPDATE OR DELETE ON cameras
+        FOR EACH ROW EXECUTE FUNCTION notify_camera_change()
+    """)
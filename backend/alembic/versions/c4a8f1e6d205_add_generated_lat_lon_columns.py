@@ -0,0 +1,32 @@
+"""add generated lat/lon columns
+
+Revision ID: c4a8f1e6d205
+Revises: b7e2d4a91c3f
+Create Date: 2026-10-19 10:03:17.552914
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a8f1e6d205'
+down_revision: Union[str, None] = 'b7e2d4a91c3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Stored generated columns: Postgres keeps them in sync with location,
+    # so reads never have to convert the geography per row.
+    for table in ('cameras', 'entities'):
+        op.add_column(table, sa.Column('latitude', sa.Float(), sa.Computed('ST_Y(location::geometry)', persisted=True), nullable=True))
+        op.add_column(table, sa.Column('longitude', sa.Float(), sa.Computed('ST_X(location::geometry)', persisted=True), nullable=True))
+
+
+def downgrade() -> None:
+    for table in ('entities', 'cameras'):
+        op.drop_column(table, 'longitude')
+        op.drop_column(table, 'latitude')
@@ -0,0 +1,50 @@
+"""add playback keyframes and deltas
+
+Revision ID: c5e9a3f7d184
+Revises: b8d4f1a6e273
+Create Date: 2026-10-19 17:48:12.305127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e9a3f7d184'
+down_revision: Union[str, None] = 'b8d4f1a6e273'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('playback_keyframes',
+    sa.Column('ts', sa.DateTime(), nullable=False),
+    sa.Column('entities', sa.JSON(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_playback_keyframes_id'), 'playback_keyframes', ['id'], unique=False)
+    op.create_index(op.f('ix_playback_keyframes_ts'), 'playback_keyframes', ['ts'], unique=True)
+    op.create_table('playback_deltas',
+    sa.Column('ts', sa.DateTime(), nullable=False),
+    sa.Column('changes', sa.JSON(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_playback_deltas_id'), 'playback_deltas', ['id'], unique=False)
+    op.create_index(op.f('ix_playback_deltas_ts'), 'playback_deltas', ['ts'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_playback_deltas_ts'), table_name='playback_deltas')
+    op.drop_index(op.f('ix_playback_deltas_id'), table_name='playback_deltas')
+    op.drop_table('playback_deltas')
+    op.drop_index(op.f('ix_playback_keyframes_ts'), table_name='playback_keyframes')
+    op.drop_index(op.f('ix_playback_keyframes_id'), table_name='playback_keyframes')
+    op.drop_table('playback_keyframes')
@@ -0,0 +1,41 @@
+"""add latency hourly table
+
+Revision ID: d7a4c2e8f395
+Revises: c5e9a3f7d184
+Create Date: 2026-10-19 18:22:37.518904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7a4c2e8f395'
+down_revision: Union[str, None] = 'c5e9a3f7d184'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('latency_hourly',
+    sa.Column('hour', sa.DateTime(), nullable=False),
+    sa.Column('camera_id', sa.Integer(), nullable=False),
+    sa.Column('stage', sa.String(), nullable=False),
+    sa.Column('bucket', sa.Integer(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('total_ms', sa.Float(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['camera_id'], ['cameras.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('hour', 'camera_id', 'stage', 'bucket', name='uq_latency_hourly_key')
+    )
+    op.create_index(op.f('ix_latency_hourly_id'), 'latency_hourly', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_latency_hourly_id'), table_name='latency_hourly')
+    op.drop_table('latency_hourly')
@@ -0,0 +1,43 @@
+"""add heatmap daily table
+
+Revision ID: d91b3c7e5a48
+Revises: c4a8f1e6d205
+Create Date: 2026-10-19 11:26:05.118342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd91b3c7e5a48'
+down_revision: Union[str, None] = 'c4a8f1e6d205'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('heatmap_daily',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('source', sa.String(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('shape', sa.String(), nullable=False),
+    sa.Column('cell_m', sa.Integer(), nullable=False),
+    sa.Column('i', sa.Integer(), nullable=False),
+    sa.Column('j', sa.Integer(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_heatmap_daily_id'), 'heatmap_daily', ['id'], unique=False)
+    op.create_index('ix_heatmap_daily_lookup', 'heatmap_daily', ['source', 'shape', 'cell_m', 'day'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_heatmap_daily_lookup', table_name='heatmap_daily')
+    op.drop_index(op.f('ix_heatmap_daily_id'), table_name='heatmap_daily')
+    op.drop_table('heatmap_daily')
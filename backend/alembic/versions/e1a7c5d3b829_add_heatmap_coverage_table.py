@@ -0,0 +1,43 @@
+"""add heatmap coverage table
+
+Revision ID: e1a7c5d3b829
+Revises: c3f7b2e9a614
+Create Date: 2026-10-19 23:12:41.508217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1a7c5d3b829'
+down_revision: Union[str, None] = 'c3f7b2e9a614'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('heatmap_coverage',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('cell_m', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('cell_m', 'day', name='uq_heatmap_coverage_cell_day')
+    )
+    op.create_index(op.f('ix_heatmap_coverage_id'), 'heatmap_coverage', ['id'], unique=False)
+
+    # Days already in heatmap_daily were rolled up
+    op.execute("""
+        INSERT INTO heatmap_coverage (day, cell_m, created_at, updated_at)
+        SELECT DISTINCT day, cell_m, now() AT TIME ZONE 'utc', now() AT TIME ZONE 'utc'
+        FROM heatmap_daily
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_heatmap_coverage_id'), table_name='heatmap_coverage')
+    op.drop_table('heatmap_coverage')
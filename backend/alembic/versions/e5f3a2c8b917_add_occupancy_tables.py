@@ -0,0 +1,58 @@
+"""add occupancy tables
+
+Revision ID: e5f3a2c8b917
+Revises: d91b3c7e5a48
+Create Date: 2026-10-19 14:02:47.530912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f3a2c8b917'
+down_revision: Union[str, None] = 'd91b3c7e5a48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('occupancy_hourly',
+    sa.Column('hour', sa.DateTime(), nullable=False),
+    sa.Column('camera_id', sa.Integer(), nullable=False),
+    sa.Column('object_type', sa.String(), nullable=False),
+    sa.Column('entered', sa.Integer(), nullable=False),
+    sa.Column('exited', sa.Integer(), nullable=False),
+    sa.Column('peak', sa.Integer(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['camera_id'], ['cameras.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('hour', 'camera_id', 'object_type', name='uq_occupancy_hourly_key')
+    )
+    op.create_index(op.f('ix_occupancy_hourly_id'), 'occupancy_hourly', ['id'], unique=False)
+    op.create_table('dwell_daily',
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('camera_id', sa.Integer(), nullable=False),
+    sa.Column('object_type', sa.String(), nullable=False),
+    sa.Column('bucket', sa.Integer(), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('total_seconds', sa.Float(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['camera_id'], ['cameras.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('day', 'camera_id', 'object_type', 'bucket', name='uq_dwell_daily_key')
+    )
+    op.create_index(op.f('ix_dwell_daily_id'), 'dwell_daily', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_dwell_daily_id'), table_name='dwell_daily')
+    op.drop_table('dwell_daily')
+    op.drop_index(op.f('ix_occupancy_hourly_id'), table_name='occupancy_hourly')
+    op.drop_table('occupancy_hourly')
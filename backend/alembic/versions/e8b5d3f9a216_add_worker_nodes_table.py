@@ -0,0 +1,42 @@
+"""add worker nodes table
+
+Revision ID: e8b5d3f9a216
+Revises: d7a4c2e8f395
+Create Date: 2026-10-19 18:57:04.281736
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e8b5d3f9a216'
+down_revision: Union[str, None] = 'd7a4c2e8f395'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('worker_nodes',
+    sa.Column('worker_id', sa.String(), nullable=False),
+    sa.Column('hostname', sa.String(), nullable=False),
+    sa.Column('pid', sa.Integer(), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=False),
+    sa.Column('heartbeat_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_worker_nodes_heartbeat_at'), 'worker_nodes', ['heartbeat_at'], unique=False)
+    op.create_index(op.f('ix_worker_nodes_id'), 'worker_nodes', ['id'], unique=False)
+    op.create_index(op.f('ix_worker_nodes_worker_id'), 'worker_nodes', ['worker_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_worker_nodes_worker_id'), table_name='worker_nodes')
+    op.drop_index(op.f('ix_worker_nodes_id'), table_name='worker_nodes')
+    op.drop_index(op.f('ix_worker_nodes_heartbeat_at'), table_name='worker_nodes')
+    op.drop_table('worker_nodes')
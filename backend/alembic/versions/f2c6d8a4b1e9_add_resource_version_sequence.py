@@ -0,0 +1,26 @@
+"""add resource version sequence
+
+Revision ID: f2c6d8a4b1e9
+Revises: e5f3a2c8b917
+Create Date: 2026-10-19 15:10:32.448120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c6d8a4b1e9'
+down_revision: Union[str, None] = 'e5f3a2c8b917'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Shared source of resource version numbers (see app/services/versions.py)
+    op.execute("CREATE SEQUENCE resource_version_seq")
+
+
+def downgrade() -> None:
+    op.execute("DROP SEQUENCE resource_version_seq")
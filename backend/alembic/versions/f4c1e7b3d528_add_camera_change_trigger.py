@@ -0,0 +1,44 @@
+"""add camera change notify trigger
+
+Revision ID: f4c1e7b3d528
+Revises: e8b5d3f9a216
+Create Date: 2026-10-19 19:31:45.902184
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c1e7b3d528'
+down_revision: Union[str, None] = 'e8b5d3f9a216'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Every change to cameras, however it's made, tells the camera registry
+    # (app/services/camera_registry.py) which row to re-read and bumps the
+    # shared "cameras" resource version (app/services/versions.py)
+    op.execute("""
+        CREATE FUNCTION notify_camera_change() RETURNS trigger AS $$
+        DECLARE
+            camera_id integer := CASE WHEN TG_OP = 'DELETE' THEN OLD.id ELSE NEW.id END;
+        BEGIN
+            PERFORM pg_notify('camera_changes', TG_OP || ':' || camera_id);
+            PERFORM pg_notify('resource_versions', 'cameras:' || nextval('resource_version_seq'));
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER cameras_notify_change
+        AFTER INSERT OR UPDATE OR DELETE ON cameras
+        FOR EACH ROW EXECUTE FUNCTION notify_camera_change()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER cameras_notify_change ON cameras")
+    op.execute("DROP FUNCTION notify_camera_change()")
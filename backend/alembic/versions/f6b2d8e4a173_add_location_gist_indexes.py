@@ -0,0 +1,30 @@
+"""add GiST indexes on camera and entity locations
+
+Revision ID: f6b2d8e4a173
+Revises: e1a7c5d3b829
+Create Date: 2026-10-20 09:41:17.336095
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6b2d8e4a173'
+down_revision: Union[str, None] = 'e1a7c5d3b829'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Vector tiles filter with `location && <tile as geography>`, which only
+    # an index on the geography column itself can serve. The initial
+    # migration left these commented out, so create them if missing.
+    op.execute("CREATE INDEX IF NOT EXISTS idx_cameras_location ON cameras USING gist (location)")
+    op.execute("CREATE INDEX IF NOT EXISTS idx_entities_location ON entities USING gist (location)")
+
+
+def downgrade() -> None:
+    # Left in place: the initial migration's downgrade drops them
+    pass
@@ -0,0 +1,178 @@
+"""
+Analytics API Endpoints
+Aggregated views of activity over time.
+"""
+from collections import Counter
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.api.v1.formats import json_response
+from app.api.v1.timerange import time_range
+from app.db.session import get_db
+from app.services.heatmap_service import HeatmapService
+from app.services.latency_service import LatencyService
+from app.services.live_state import live_state
+from app.services.occupancy_service import OccupancyService
+
+router = APIRouter()
+
+
+@router.get("/analytics/heatmap")
+async def get_heatmap(
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    event_type: Optional[str] = None,
+    cell_m: int = Query(100, ge=10, le=100000),
+    source: str = Query("events", pattern="^(events|entities)$"),
+    shape: str = Query("square", pattern="^(square|hex)$"),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Activity counts binned into a spatial grid.
+
+    **Query parameters:**
+    - from, to: Time range (default: last 7 days)
+    - event_type: Only count this event type (or object type for entities)
+    - cell_m: Cell size in meters (default: 100)
+    - source: events (default) or entities
+    - shape: square (default) or hex
+
+    **Returns:** Parallel arrays of cell centers (latitude/longitude), count and cell indexes (i/j)
+    """
+    start, end = time_range(start, end, timedelta(days=7))
+
+    service = HeatmapService(db)
+    cells = await service.get_heatmap(
+        source=source,
+        start=start,
+        end=end,
+        cell_m=cell_m,
+        shape=shape,
+        kind=event_type,
+    )
+
+    return json_response({
+        "source": source,
+        "shape": shape,
+        "cell_m": cell_m,
+        "from": start,
+        "to": end,
+        **cells,
+    })
+
+
+@router.get("/analytics/occupancy")
+async def get_occupancy(
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    camera_id: Optional[int] = None,
+    object_type: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    How many entities each camera sees, per hour and right now.
+
+    **Query parameters:**
+    - from, to: Time range (default: last 24 hours)
+    - camera_id: Only this camera
+    - object_type: Only this object type (person, vehicle, ...)
+
+    **Returns:** current counts per camera/object type, and hourly
+    entered/exited/peak (most at once) rows
+    """
+    start, end = time_range(start, end, timedelta(hours=24))
+
+    current = Counter(
+        (e.camera_id, e.object_type) for e in live_state.active()
+        if (camera_id is None or e.camera_id == camera_id)
+        and (object_type is None or e.object_type == object_type)
+    )
+
+    service = OccupancyService(db)
+    rows = await service.get_occupancy(start, end, camera_id, object_type)
+
+    return json_response({
+        "from": start,
+        "to": end,
+        "current": [
+            {"camera_id": cam, "object_type": kind, "count": count}
+            for (cam, kind), count in sorted(current.items())
+        ],
+        "hourly": [
+            {
+                "hour": row.hour,
+                "camera_id": row.camera_id,
+                "object_type": row.object_type,
+                "entered": row.entered,
+                "exited": row.exited,
+                "peak": row.peak,
+            }
+            for row in rows
+        ],
+    })
+
+
+@router.get("/analytics/dwell")
+async def get_dwell(
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    camera_id: Optional[int] = None,
+    object_type: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    How long entities stay in a camera's view.
+
+    **Query parameters:**
+    - from, to: Time range, whole UTC days (default: last 7 days)
+    - camera_id: Only this camera
+    - object_type: Only this object type (person, vehicle, ...)
+
+    **Returns:** Histogram buckets (le_seconds = upper bound, null = longer),
+    count, average_seconds and bucket-resolution p50/p90
+    """
+    start, end = time_range(start, end, timedelta(days=7))
+
+    service = OccupancyService(db)
+    dwell = await service.get_dwell(start.date(), end.date(), camera_id, object_type)
+
+    return json_response({
+        "from": start.date(),
+        "to": end.date(),
+        "camera_id": camera_id,
+        "object_type": object_type,
+        **dwell,
+    })
+
+
+@router.get("/analytics/latency")
+async def get_latency(
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    camera_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Detection latency from frame capture to client delivery, per camera.
+
+    **Query parameters:**
+    - from, to: Time range, whole UTC hours (default: last 24 hours)
+    - camera_id: Only this camera
+
+    **Returns:** Per camera and stage (decode, detect, track, persist,
+    publish, total): count, average_ms, bucket-resolution p50/p90/p99
+    and histogram buckets (le_ms = upper bound, null = slower); plus
+    slo.within, the share of detections within LATENCY_SLO_MS end to end
+    """
+    start, end = time_range(start, end, timedelta(hours=24))
+
+    service = LatencyService(db)
+    cameras = await service.get_latency(start, end, camera_id)
+
+    return json_response({
+        "from": start,
+        "to": end,
+        "cameras": cameras,
+    })
@@ -6,15 +6,23 @@ RESTful API for camera management.
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import text
 from typing import List
 
+from app.api.v1.conditional import conditional_get, tag
+from app.api.v1.formats import FEED_FORMAT, geojson_response, columnar_response
+from app.config import settings
 from app.db.session import get_db
-from app.schemas.camera import CameraCreate, CameraUpdate, CameraResponse
+from app.schemas.camera import (
+    CameraBatchCreate, CameraBatchResponse, CameraCreate, CameraUpdate, CameraResponse
+)
 from app.services.camera_service import CameraService
 
 router = APIRouter()
 
+# Fields carried by the compact feed formats
+CAMERA_PROPERTIES = ("name", "description", "is_active", "is_online")
+CAMERA_COLUMNS = ("id", "name", "latitude", "longitude", "is_active", "is_online")
+
 @router.post("/cameras", response_model=CameraResponse, status_code=status.HTTP_201_CREATED)
 async def create_camera(
     camera: CameraCreate,
@@ -38,13 +46,12 @@ async def create_camera(
     service = CameraService(db)
     created_camera = await service.create_camera(camera)
 
-    # Convert location to lat/lon for response
     return CameraResponse(
         id=created_camera.id,
         name=created_camera.name,
         description=created_camera.description,
-        latitude=camera.latitude,
-        longitude=camera.longitude,
+        latitude=created_camera.latitude,
+        longitude=created_camera.longitude,
         is_active=created_camera.is_active,
         is_online=created_camera.is_online,
         config=created_camera.config,
@@ -53,10 +60,40 @@ async def create_camera(
     )
 
 
+@router.post("/cameras/batch", response_model=CameraBatchResponse)
+async def create_cameras(
+    batch: CameraBatchCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create (or update) many cameras in one transaction.
+
+    **Request body:**
+    - cameras: List of cameras, same fields as POST /cameras
+    - upsert_on: Optional "name" or "rtsp_url" - cameras matching an
+      existing one on this field update it (config only if given)
+
+    Invalid rows are skipped, not fatal: the response reports each row's
+    status ("created", "updated" or "error") with its ID or errors.
+
+    **Raises:** 413 if there are more than CAMERA_BATCH_MAX_ROWS cameras
+    """
+    if len(batch.cameras) > settings.CAMERA_BATCH_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.CAMERA_BATCH_MAX_ROWS} cameras per batch"
+        )
+
+    service = CameraService(db)
+    return await service.import_cameras(batch.cameras, batch.upsert_on)
+
+
 @router.get("/cameras", response_model=List[CameraResponse])
 async def get_cameras(
     skip: int = 0,
     limit: int = 100,
+    feed_format: str = FEED_FORMAT,
+    etag: str = Depends(conditional_get("cameras")),
     db: AsyncSession = Depends(get_db)
 ):
     """
@@ -65,27 +102,28 @@ async def get_cameras(
     **Query parameters:**
     - skip: Number of records to skip (default: 0)
     - limit: Maximum records to return (default: 100)
+    - format: json (default), geojson (FeatureCollection) or columnar (parallel arrays)
 
-    **Returns:** List of cameras
+    **Returns:** List of cameras (304 if If-None-Match matches the ETag),
+    served from the camera registry (no DB query)
+    **Raises:** 503 if the camera registry couldn't be loaded
     """
     service = CameraService(db)
     cameras = await service.get_cameras(skip=skip, limit=limit)
 
+    if feed_format == "geojson":
+        return tag(geojson_response(cameras, CAMERA_PROPERTIES), etag)
+    if feed_format == "columnar":
+        return tag(columnar_response(cameras, CAMERA_COLUMNS), etag)
+
     result = []
     for camera in cameras:
-        # Extract lat/lon from geography using raw SQL
-        lat_lon = await db.execute(
-            text("SELECT ST_Y(location::geometry) as lat, ST_X(location::geometry) as lon FROM cameras WHERE id = :id"),
-            {"id": camera.id}
-        )
-        coords = lat_lon.first()
-
         camera_dict = {
             "id": camera.id,
             "name": camera.name,
             "description": camera.description,
-            "latitude": coords.lat if coords else 0,
-            "longitude": coords.lon if coords else 0,
+            "latitude": camera.latitude,
+            "longitude": camera.longitude,
             "is_active": camera.is_active,
             "is_online": camera.is_online,
             "config": camera.config,
@@ -108,7 +146,7 @@ async def get_camera(
     - camera_id: Camera ID
 
     **Returns:** Camera object
-    **Raises:** 404 if camera not found
+    **Raises:** 404 if camera not found, 503 if the camera registry couldn't be loaded
     """
     service = CameraService(db)
     camera = await service.get_camera(camera_id)
@@ -119,19 +157,12 @@ async def get_camera(
             detail=f"Camera {camera_id} not found"
         )
 
-    # Extract lat/lon from geography using raw SQL
-    lat_lon = await db.execute(
-        text("SELECT ST_Y(location::geometry) as lat, ST_X(location::geometry) as lon FROM cameras WHERE id = :id"),
-        {"id": camera.id}
-    )
-    coords = lat_lon.first()
-
     return CameraResponse(
         id=camera.id,
         name=camera.name,
         description=camera.description,
-        latitude=coords.lat if coords else 0,
-        longitude=coords.lon if coords else 0,
+        latitude=camera.latitude,
+        longitude=camera.longitude,
         is_active=camera.is_active,
         is_online=camera.is_online,
         config=camera.config,
@@ -165,19 +196,12 @@ async def update_camera(
             detail=f"Camera {camera_id} not found"
         )
 
-    # Extract lat/lon from geography using raw SQL
-    lat_lon = await db.execute(
-        text("SELECT ST_Y(location::geometry) as lat, ST_X(location::geometry) as lon FROM cameras WHERE id = :id"),
-        {"id": camera.id}
-    )
-    coords = lat_lon.first()
-
     return CameraResponse(
         id=camera.id,
         name=camera.name,
         description=camera.description,
-        latitude=coords.lat if coords else 0,
-        longitude=coords.lon if coords else 0,
+        latitude=camera.latitude,
+        longitude=camera.longitude,
         is_active=camera.is_active,
         is_online=camera.is_online,
         config=camera.config,
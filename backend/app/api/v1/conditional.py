@@ -0,0 +1,46 @@
+"""
+Conditional GET
+
+ETags for collection endpoints, taken from the resource version counters.
+A client that sends back the current ETag in If-None-Match gets an empty
+304 before the endpoint queries or serializes anything.
+"""
+from typing import Callable
+
+from fastapi import HTTPException, Request, Response, status
+
+from app.services.versions import resource_versions
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    """Does the request's If-None-Match already match etag?"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    # Weak comparison: W/"x" and "x" match each other
+    candidates = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def conditional_get(resource: str) -> Callable[[Request, Response], str]:
+    """
+    Dependency: 304 if the client's copy of resource is current.
+
+    Otherwise sets the ETag header and returns it. Endpoints that build
+    their own Response must copy it over themselves (see tag()).
+    """
+    def check(request: Request, response: Response) -> str:
+        # Read the version before the endpoint reads data, so a write racing
+        # with the request can only make the ETag older, never newer
+        etag = resource_versions.etag(resource)
+        if not_modified(request, etag):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        response.headers["ETag"] = etag
+        return etag
+    return check
+
+
+def tag(response: Response, etag: str) -> Response:
+    """Set the ETag on a Response built by the endpoint."""
+    response.headers["ETag"] = etag
+    return response
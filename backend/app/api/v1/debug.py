@@ -0,0 +1,58 @@
+"""
+Debug API Endpoints
+Slow queries and request profiles (admin only, per process).
+"""
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+
+from app.api.v1.formats import json_response
+from app.config import settings
+from app.db.slow_queries import slow_query_log
+from app.services.profiling import is_admin_token, profile_store
+
+
+def require_debug_token(x_debug_token: Optional[str] = Header(None)):
+    """Requests need X-Debug-Token: <DEBUG_TOKEN>; without a token configured these endpoints don't exist."""
+    if not settings.DEBUG_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not is_admin_token(x_debug_token):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid debug token")
+
+
+router = APIRouter(dependencies=[Depends(require_debug_token)])
+
+
+@router.get("/debug/slow-queries")
+async def get_slow_queries(limit: Optional[int] = Query(None, ge=1)):
+    """
+    Statements slower than SLOW_QUERY_MS, newest first.
+
+    Each has duration_ms, statement, parameters and its EXPLAIN plan
+    (analyzed tells whether it was EXPLAIN ANALYZE; plan_error if the
+    plan couldn't be captured).
+    """
+    return json_response({
+        "threshold_ms": settings.SLOW_QUERY_MS,
+        "queries": slow_query_log.recent(limit),
+    })
+
+
+@router.get("/debug/profiles")
+async def get_profiles():
+    """Stored request profiles, newest first (without the stats)."""
+    return json_response(profile_store.summaries())
+
+
+@router.get("/debug/profiles/{profile_id}")
+async def get_profile(profile_id: int):
+    """One request profile as plain pstats text."""
+    profile = profile_store.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile {profile_id} not found"
+        )
+
+    header = f"{profile['request']} -> {profile['status']} in {profile['duration_ms']}ms at {profile['at'].isoformat()}\n\n"
+    return Response(content=header + profile["stats"], media_type="text/plain")
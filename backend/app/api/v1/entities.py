@@ -1,65 +1,153 @@
 """
 Entity API Endpoints
 """
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from typing import List
+from sqlalchemy import select, union_all
+from typing import List, Optional
+from app.api.v1.conditional import conditional_get, tag
+from app.api.v1.formats import FEED_FORMAT, geojson_response, columnar_response
 from app.db.session import get_db
 from app.schemas.entity import EntityCreate, EntityResponse
+from app.models.entity import Entity, EntityArchive
+from app.services.admission import admission_control
 from app.services.entity_service import EntityService
-from app.models.entity import Entity
+from app.services.export_service import EXPORT_FORMATS, encode_export, export_filename
+from app.services.live_state import live_state
 
 router = APIRouter()
 
+# Fields carried by the compact feed formats
+ENTITY_PROPERTIES = (
+    "entity_id", "object_type", "camera_id", "confidence",
+    "last_seen", "is_recognized", "recognized_as", "linked_entity_id",
+)
+ENTITY_COLUMNS = (
+    "id", "entity_id", "latitude", "longitude",
+    "object_type", "confidence", "camera_id",
+)
+
+ENTITY_EXPORT_COLUMNS = (
+    ("id", "int"),
+    ("entity_id", "str"),
+    ("object_type", "str"),
+    ("camera_id", "int"),
+    ("latitude", "float"),
+    ("longitude", "float"),
+    ("confidence", "float"),
+    ("first_seen", "datetime"),
+    ("last_seen", "datetime"),
+    ("is_active", "bool"),
+    ("is_recognized", "bool"),
+    ("recognized_as", "str"),
+    ("linked_entity_id", "int"),
+)
+
 @router.post("/entities", response_model=EntityResponse)
 async def create_entity(
     entity: EntityCreate,
     db: AsyncSession = Depends(get_db)
 ):
-    """Create a new entity detection."""
-    service = EntityService(db)
-    return await service.create_entity(entity)
+    """
+    Create a new entity detection.
+
+    **Raises:** 429 with Retry-After when ingest is overloaded
+    (motion and low-confidence detections are shed first)
+    """
+    admission_control.load_camera(entity.camera_id)
+    with admission_control.admit(entity.camera_id, entity.object_type, entity.confidence):
+        service = EntityService(db)
+        return await service.create_entity(entity)
 
 @router.get("/entities", response_model=List[EntityResponse])
-async def get_entities(db: AsyncSession = Depends(get_db)):
-    """Get all active entities."""
-    # Query entities with extracted lat/lon from Geography field
-    result = await db.execute(
-        select(
-            Entity.id,
-            Entity.entity_id,
-            Entity.object_type,
-            Entity.camera_id,
-            Entity.confidence,
-            Entity.first_seen,
-            Entity.last_seen,
-            Entity.is_active,
-            Entity.is_recognized,
-            Entity.recognized_as,
-            func.ST_Y(func.ST_AsText(Entity.location)).label('latitude'),
-            func.ST_X(func.ST_AsText(Entity.location)).label('longitude')
-        ).where(Entity.is_active == True)
+async def get_entities(
+    feed_format: str = FEED_FORMAT,
+    etag: str = Depends(conditional_get("entities"))
+):
+    """
+    Get all active entities (served from live state, no DB query).
+
+    **Query parameters:**
+    - format: json (default), geojson (FeatureCollection) or columnar (parallel arrays)
+
+    Returns 304 if If-None-Match matches the ETag.
+    """
+    entities = live_state.active()
+
+    if feed_format == "geojson":
+        return tag(geojson_response(entities, ENTITY_PROPERTIES), etag)
+    if feed_format == "columnar":
+        return tag(columnar_response(entities, ENTITY_COLUMNS), etag)
+
+    return [entity.to_dict() for entity in entities]
+
+
+@router.get("/entities/export")
+async def export_entities(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv|parquet)$"),
+    camera_id: Optional[int] = None,
+    object_type: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    """
+    Stream entity history (active, inactive and archived) as NDJSON, CSV or Parquet.
+
+    **Query parameters:**
+    - format: ndjson (default), csv or parquet
+    - camera_id, object_type, is_active: Optional exact-match filters
+    - start, end: Only entities seen within this time range
+    """
+    selects = []
+    for model in (Entity, EntityArchive):
+        if model is EntityArchive and is_active:
+            continue  # Only inactive entities get archived
+        conditions = []
+        if camera_id is not None:
+            conditions.append(model.camera_id == camera_id)
+        if object_type is not None:
+            conditions.append(model.object_type == object_type)
+        if is_active is not None:
+            conditions.append(model.is_active == is_active)
+        if start is not None:
+            conditions.append(model.last_seen >= start)
+        if end is not None:
+            conditions.append(model.first_seen < end)
+        selects.append(
+            select(*(getattr(model, name) for name, _ in ENTITY_EXPORT_COLUMNS)).where(*conditions)
+        )
+
+    history = union_all(*selects).subquery()
+    statement = select(history).order_by(history.c.id)
+    media_type = EXPORT_FORMATS[export_format][0]
+    filename = export_filename("entities", export_format)
+
+    return StreamingResponse(
+        encode_export(statement, ENTITY_EXPORT_COLUMNS, export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
-    
-    entities_data = result.all()
-    
-    response = []
-    for row in entities_data:
-        entity_dict = {
-            "id": row.id,
-            "entity_id": row.entity_id,
-            "object_type": row.object_type,
-            "latitude": float(row.latitude) if row.latitude else 0,
-            "longitude": float(row.longitude) if row.longitude else 0,
-            "camera_id": row.camera_id,
-            "confidence": row.confidence,
-            "first_seen": row.first_seen,
-            "last_seen": row.last_seen,
-            "is_active": row.is_active,
-            "is_recognized": row.is_recognized,
-            "recognized_as": row.recognized_as,
-        }
-        response.append(EntityResponse(**entity_dict))
-    
-    return response
+
+
+@router.get("/entities/{entity_id}", response_model=EntityResponse)
+async def get_entity(entity_id: str, db: AsyncSession = Depends(get_db)):
+    """
+    Get one entity by entity_id (e.g. person_42).
+
+    Active entities come from live state; older ones from the database,
+    including the archive.
+    """
+    entity = live_state.get(entity_id)
+    if entity is not None:
+        return entity.to_dict()
+
+    entity = await EntityService(db).get_entity(entity_id)
+    if entity is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Entity {entity_id} not found"
+        )
+    return entity
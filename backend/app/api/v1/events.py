@@ -2,24 +2,132 @@
 Events API Endpoints
 Get security events from cameras.
 """
-from fastapi import APIRouter, Depends
+import json
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.dialects.postgresql import JSONPATH
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
-from typing import List
+from sqlalchemy import cast, select, desc
+from typing import List, Optional
+from app.api.v1.conditional import conditional_get
 from app.db.session import get_db
 from app.models.event import Event
 from app.schemas.event import EventResponse
+from app.services.export_service import EXPORT_FORMATS, encode_export, export_filename
 
 router = APIRouter()
 
+EVENT_EXPORT_COLUMNS = (
+    ("id", "int"),
+    ("camera_id", "int"),
+    ("event_type", "str"),
+    ("confidence", "float"),
+    ("event_metadata", "json"),
+    ("timestamp", "datetime"),
+)
+
+
+def metadata_filter(term: str):
+    """
+    Condition for one metadata filter term.
+
+    "key:value" matches events whose metadata contains that value (JSON
+    literals like 3, true or "3" keep their type, anything else is a
+    string); "key" alone matches events that have the key. Dots reach into
+    nested objects, e.g. "latency.captured_at". Both forms are answered by
+    the GIN index on event_metadata.
+    """
+    path, separator, raw = term.partition(":")
+    keys = path.split(".")
+    if not all(keys):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid metadata filter: {term!r}"
+        )
+
+    if not separator:
+        # jsonpath existence (@?) - jsonb_path_ops can't serve the ? operator
+        jsonpath = "$" + "".join(f".{json.dumps(key)}" for key in keys)
+        return Event.event_metadata.op("@?")(cast(jsonpath, JSONPATH))
+
+    try:
+        value = json.loads(raw)
+    except ValueError:
+        value = raw
+    for key in reversed(keys):
+        value = {key: value}
+    return Event.event_metadata.contains(value)
+
+
+def event_filters(
+    camera_id: Optional[int] = None,
+    event_type: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    meta: List[str] = Query([]),
+) -> list:
+    """Shared query filters for event list and export endpoints."""
+    conditions = [metadata_filter(term) for term in meta]
+    if camera_id is not None:
+        conditions.append(Event.camera_id == camera_id)
+    if event_type is not None:
+        conditions.append(Event.event_type == event_type)
+    if start is not None:
+        conditions.append(Event.timestamp >= start)
+    if end is not None:
+        conditions.append(Event.timestamp < end)
+    return conditions
+
+
 @router.get("/events", response_model=List[EventResponse])
 async def get_events(
     limit: int = 50,
+    filters: list = Depends(event_filters),
+    etag: str = Depends(conditional_get("events")),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get recent events."""
+    """
+    Get recent events.
+
+    **Query parameters:**
+    - limit: Maximum events to return (default: 50)
+    - camera_id, event_type: Optional exact-match filters
+    - start, end: Optional time range (ISO 8601, end exclusive)
+    - meta: Metadata filter, repeatable (all must match) - "key:value" for
+      a containment match (e.g. meta=zone_id:3, meta=simulated:true) or
+      "key" for events that have the key (e.g. meta=clip)
+
+    Returns 304 if If-None-Match matches the ETag.
+    """
     result = await db.execute(
-        select(Event).order_by(desc(Event.timestamp)).limit(limit)
+        select(Event).where(*filters).order_by(desc(Event.timestamp)).limit(limit)
     )
     events = result.scalars().all()
     return events
+
+
+@router.get("/events/export")
+async def export_events(
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv|parquet)$"),
+    filters: list = Depends(event_filters),
+):
+    """
+    Stream all matching events as NDJSON, CSV or Parquet.
+
+    Takes the same filters as GET /events (without a limit). Rows are read
+    in chunks from a server-side cursor, oldest first.
+    """
+    statement = (
+        select(*(getattr(Event, name) for name, _ in EVENT_EXPORT_COLUMNS))
+        .where(*filters)
+        .order_by(Event.timestamp, Event.id)
+    )
+    media_type = EXPORT_FORMATS[export_format][0]
+    filename = export_filename("events", export_format)
+
+    return StreamingResponse(
+        encode_export(statement, EVENT_EXPORT_COLUMNS, export_format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,49 @@
+"""
+Compact Feed Formats
+
+GeoJSON and columnar encodings for the map feeds.
+These skip per-row Pydantic models and encode straight to JSON bytes
+with orjson.
+"""
+from typing import Any, Iterable, List, Sequence
+
+import orjson
+from fastapi import Query, Response
+
+# Shared ?format= query parameter for feed endpoints
+FEED_FORMAT = Query("json", alias="format", pattern="^(json|geojson|columnar)$")
+
+
+def json_response(content: Any, media_type: str = "application/json") -> Response:
+    """Encode content with orjson (handles datetimes natively)."""
+    return Response(content=orjson.dumps(content), media_type=media_type)
+
+
+def geojson_response(rows: Iterable[Any], properties: Sequence[str]) -> Response:
+    """
+    FeatureCollection of points.
+
+    Rows need id, latitude and longitude attributes; the named
+    properties are copied into each feature.
+    """
+    features = [
+        {
+            "type": "Feature",
+            "id": row.id,
+            "geometry": {"type": "Point", "coordinates": [row.longitude, row.latitude]},
+            "properties": {name: getattr(row, name) for name in properties},
+        }
+        for row in rows
+    ]
+    return json_response(
+        {"type": "FeatureCollection", "features": features},
+        media_type="application/geo+json",
+    )
+
+
+def columnar_response(rows: List[Any], columns: Sequence[str]) -> Response:
+    """Parallel arrays, one per column: {"count": n, "id": [...], ...}."""
+    content = {"count": len(rows)}
+    for name in columns:
+        content[name] = [getattr(row, name) for row in rows]
+    return json_response(content)
@@ -0,0 +1,112 @@
+"""
+Known Identity API Endpoints
+
+CRUD for the recognition gallery.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from app.db.session import get_db
+from app.schemas.known_identity import (
+    KnownIdentityCreate, KnownIdentityUpdate, KnownIdentityResponse
+)
+from app.services.gallery_service import GalleryService
+
+router = APIRouter()
+
+
+@router.post("/identities", response_model=KnownIdentityResponse, status_code=status.HTTP_201_CREATED)
+async def create_identity(
+    identity: KnownIdentityCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Enroll a known identity.
+
+    **Request body:**
+    - name: Display name, e.g. "John" or "Family Car" (required)
+    - object_type: person, vehicle, ... (required)
+    - features: Appearance descriptor (required, same length as re-id descriptors)
+
+    **Returns:** Created identity (recognition picks it up without a restart)
+    """
+    service = GalleryService(db)
+    return await service.create_identity(identity)
+
+
+@router.get("/identities", response_model=List[KnownIdentityResponse])
+async def get_identities(db: AsyncSession = Depends(get_db)):
+    """Get all known identities."""
+    service = GalleryService(db)
+    return await service.get_identities()
+
+
+@router.get("/identities/{identity_id}", response_model=KnownIdentityResponse)
+async def get_identity(
+    identity_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get a specific known identity.
+
+    **Raises:** 404 if identity not found
+    """
+    service = GalleryService(db)
+    identity = await service.get_identity(identity_id)
+
+    if not identity:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Identity {identity_id} not found"
+        )
+
+    return identity
+
+
+@router.patch("/identities/{identity_id}", response_model=KnownIdentityResponse)
+async def update_identity(
+    identity_id: int,
+    identity_update: KnownIdentityUpdate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Update a known identity.
+
+    **Path parameters:**
+    - identity_id: Identity ID
+
+    **Returns:** Updated identity
+    **Raises:** 404 if identity not found
+    """
+    service = GalleryService(db)
+    updated = await service.update_identity(identity_id, identity_update)
+
+    if not updated:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Identity {identity_id} not found"
+        )
+
+    return updated
+
+
+@router.delete("/identities/{identity_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_identity(
+    identity_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Delete a known identity.
+
+    **Raises:** 404 if identity not found
+    """
+    service = GalleryService(db)
+    deleted = await service.delete_identity(identity_id)
+
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Identity {identity_id} not found"
+        )
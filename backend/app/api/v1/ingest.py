@@ -0,0 +1,20 @@
+"""
+Ingest API Endpoints
+Visibility into admission control on the ingest path.
+"""
+from fastapi import APIRouter
+
+from app.services.admission import admission_control
+
+router = APIRouter()
+
+
+@router.get("/ingest/stats")
+async def get_ingest_stats():
+    """
+    Admission control counters for this process.
+
+    **Returns:** writes in flight, admitted counts by priority and shed
+    counts by reason/priority and by camera
+    """
+    return admission_control.stats()
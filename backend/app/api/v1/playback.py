@@ -0,0 +1,80 @@
+"""
+Playback API Endpoints
+Historical scene reconstruction from the playback store.
+"""
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Optional
+
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.formats import json_response
+from app.api.v1.timerange import time_range
+from app.config import settings
+from app.db.session import get_db
+from app.services.playback_service import PlaybackService, stream_frames
+from app.utils.timestamps import utc_naive
+
+router = APIRouter()
+
+
+@router.get("/playback/scene")
+async def get_scene(
+    at: datetime,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Every active entity's position at a past moment.
+
+    **Query parameters:**
+    - at: Timestamp to reconstruct
+
+    **Returns:** at, keyframe_at and entities as
+    {entity_id: [latitude, longitude, object_type, camera_id]}
+
+    **Raises:** 404 if nothing was recorded by then
+    """
+    at = utc_naive(at)
+    found = await PlaybackService(db).scene_at(at)
+    if found is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No playback recorded at or before {at.isoformat()}"
+        )
+
+    keyframe_at, scene = found
+    return json_response({"at": at, "keyframe_at": keyframe_at, "entities": scene})
+
+
+@router.get("/playback")
+async def stream_playback(
+    start: Optional[datetime] = Query(None, alias="from"),
+    end: Optional[datetime] = Query(None, alias="to"),
+    speed: float = Query(1.0, gt=0, le=1000),
+):
+    """
+    Replay a time range as a stream of NDJSON frames.
+
+    **Query parameters:**
+    - from, to: Time range (default: the last 10 minutes)
+    - speed: Playback rate, e.g. 10 = ten times real time (default: 1)
+
+    **Returns:** One frame per line - first {"type": "scene", ts, entities}
+    for the start, then {"type": "delta", ts, changes} per recorded tick
+    (changes has added, moved and removed), with a fresh "scene" frame at
+    each keyframe. Frames are sent as they would have happened.
+    """
+    start, end = time_range(start, end, timedelta(minutes=10))
+    if end - start > timedelta(hours=settings.PLAYBACK_MAX_RANGE_HOURS):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Range may cover at most {settings.PLAYBACK_MAX_RANGE_HOURS} hours"
+        )
+
+    async def encode() -> AsyncIterator[bytes]:
+        async for frame in stream_frames(start, end, speed):
+            yield orjson.dumps(frame) + b"\n"
+
+    return StreamingResponse(encode(), media_type="application/x-ndjson")
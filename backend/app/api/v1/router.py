@@ -3,9 +3,17 @@ API v1 Router
 Combines all v1 endpoints.
 """
 from fastapi import APIRouter
+from app.api.v1.analytics import router as analytics_router
 from app.api.v1.cameras import router as cameras_router
+from app.api.v1.debug import router as debug_router
 from app.api.v1.entities import router as entities_router
 from app.api.v1.events import router as events_router
+from app.api.v1.identities import router as identities_router
+from app.api.v1.ingest import router as ingest_router
+from app.api.v1.playback import router as playback_router
+from app.api.v1.tiles import router as tiles_router
+from app.api.v1.workers import router as workers_router
+from app.api.v1.zones import router as zones_router
 
 # Create main v1 router
 api_router = APIRouter()
@@ -14,3 +22,11 @@ api_router = APIRouter()
 api_router.include_router(cameras_router, tags=["cameras"])
 api_router.include_router(entities_router, tags=["entities"])
 api_router.include_router(events_router, tags=["events"])
+api_router.include_router(zones_router, tags=["zones"])
+api_router.include_router(tiles_router, tags=["tiles"])
+api_router.include_router(analytics_router, tags=["analytics"])
+api_router.include_router(ingest_router, tags=["ingest"])
+api_router.include_router(identities_router, tags=["identities"])
+api_router.include_router(playback_router, tags=["playback"])
+api_router.include_router(workers_router, tags=["workers"])
+api_router.include_router(debug_router, tags=["debug"])
@@ -0,0 +1,53 @@
+"""
+Vector Tile API Endpoints
+Mapbox vector tiles for the map layers.
+"""
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.conditional import not_modified
+from app.db.session import get_db
+from app.services.tile_service import LAYERS, TileService, tile_etag
+
+router = APIRouter()
+
+
+@router.get("/tiles/{layer}/{z}/{x}/{y}.mvt")
+async def get_tile(
+    layer: str,
+    z: int,
+    x: int,
+    y: int,
+    request: Request,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get a vector tile.
+
+    **Path parameters:**
+    - layer: cameras, entities or events
+    - z/x/y: Tile coordinates (XYZ scheme)
+
+    Points are clustered at low zoom levels (features carry point_count).
+
+    **Raises:** 404 for an unknown layer or out-of-range tile
+    """
+    if layer not in LAYERS or not (0 <= z <= 22) or not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Tile {layer}/{z}/{x}/{y} not found"
+        )
+
+    etag = tile_etag(layer)
+    if not_modified(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+    service = TileService(db)
+    tile = await service.get_tile(layer, z, x, y)
+
+    return Response(
+        content=tile,
+        media_type="application/vnd.mapbox-vector-tile",
+        # Revalidate every time; unchanged layers answer 304
+        headers={"Cache-Control": "no-cache", "ETag": etag},
+    )
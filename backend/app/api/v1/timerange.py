@@ -0,0 +1,22 @@
+"""
+Time Range Parameters
+Shared handling of from/to query timestamps.
+"""
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, status
+
+from app.utils.timestamps import utc_naive
+
+
+def time_range(start: Optional[datetime], end: Optional[datetime], default: timedelta) -> Tuple[datetime, datetime]:
+    """Resolve from/to (naive UTC), defaulting to the last `default`."""
+    end = utc_naive(end) if end else datetime.utcnow()
+    start = utc_naive(start) if start else end - default
+    if start >= end:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'from' must be before 'to'"
+        )
+    return start, end
@@ -0,0 +1,47 @@
+"""
+Worker API Endpoints
+Live workers and which cameras each one processes.
+"""
+from collections import defaultdict
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.v1.formats import json_response
+from app.db.session import get_db
+from app.services.worker_service import WorkerService
+
+router = APIRouter()
+
+
+@router.get("/workers")
+async def get_workers(db: AsyncSession = Depends(get_db)):
+    """
+    Live workers and the current camera assignments.
+
+    **Returns:**
+    - workers: worker_id, hostname, pid, started_at, heartbeat_at and
+      the cameras in its shard
+    - assignments: camera_id -> worker_id (null while no worker is alive)
+    """
+    service = WorkerService(db)
+    workers = await service.live_workers()
+    assignments = await service.assignments(workers)
+
+    shards = defaultdict(list)
+    for camera_id, worker_id in sorted(assignments.items()):
+        shards[worker_id].append(camera_id)
+
+    return json_response({
+        "workers": [
+            {
+                "worker_id": worker.worker_id,
+                "hostname": worker.hostname,
+                "pid": worker.pid,
+                "started_at": worker.started_at,
+                "heartbeat_at": worker.heartbeat_at,
+                "cameras": shards[worker.worker_id],
+            }
+            for worker in workers
+        ],
+        "assignments": {str(camera_id): worker_id for camera_id, worker_id in sorted(assignments.items())},
+    })
@@ -0,0 +1,127 @@
+"""
+Alert Zone API Endpoints
+
+CRUD for geofenced alert zones.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from app.db.session import get_db
+from app.models.alert_zone import AlertZone
+from app.schemas.alert_zone import (
+    AlertZoneCreate, AlertZoneUpdate, AlertZoneResponse, ZonePoint
+)
+from app.services.zone_evaluator import Ring
+from app.services.zone_service import ZoneService
+
+router = APIRouter()
+
+
+def _zone_response(zone: AlertZone, ring: Ring) -> AlertZoneResponse:
+    return AlertZoneResponse(
+        id=zone.id,
+        name=zone.name,
+        description=zone.description,
+        points=[ZonePoint(latitude=lat, longitude=lon) for lon, lat in ring],
+        is_active=zone.is_active,
+        created_at=zone.created_at,
+        updated_at=zone.updated_at,
+    )
+
+
+@router.post("/zones", response_model=AlertZoneResponse, status_code=status.HTTP_201_CREATED)
+async def create_zone(
+    zone: AlertZoneCreate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Create an alert zone.
+
+    **Request body:**
+    - name: Zone name (required)
+    - description: Optional description
+    - points: At least 3 {latitude, longitude} vertices (required)
+
+    **Returns:** Created zone
+    """
+    service = ZoneService(db)
+    created_zone, ring = await service.create_zone(zone)
+    return _zone_response(created_zone, ring)
+
+
+@router.get("/zones", response_model=List[AlertZoneResponse])
+async def get_zones(db: AsyncSession = Depends(get_db)):
+    """Get all alert zones."""
+    service = ZoneService(db)
+    return [_zone_response(zone, ring) for zone, ring in await service.get_zones()]
+
+
+@router.get("/zones/{zone_id}", response_model=AlertZoneResponse)
+async def get_zone(
+    zone_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Get a specific alert zone.
+
+    **Raises:** 404 if zone not found
+    """
+    service = ZoneService(db)
+    zone = await service.get_zone(zone_id)
+
+    if not zone:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Zone {zone_id} not found"
+        )
+
+    return _zone_response(zone, await service.get_ring(zone.id))
+
+
+@router.patch("/zones/{zone_id}", response_model=AlertZoneResponse)
+async def update_zone(
+    zone_id: int,
+    zone_update: AlertZoneUpdate,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Update an alert zone.
+
+    **Path parameters:**
+    - zone_id: Zone ID
+
+    **Returns:** Updated zone
+    **Raises:** 404 if zone not found
+    """
+    service = ZoneService(db)
+    updated = await service.update_zone(zone_id, zone_update)
+
+    if not updated:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Zone {zone_id} not found"
+        )
+
+    return _zone_response(*updated)
+
+
+@router.delete("/zones/{zone_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_zone(
+    zone_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Delete an alert zone.
+
+    **Raises:** 404 if zone not found
+    """
+    service = ZoneService(db)
+    deleted = await service.delete_zone(zone_id)
+
+    if not deleted:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Zone {zone_id} not found"
+        )
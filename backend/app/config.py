@@ -5,6 +5,7 @@ This file loads settings from environment variables.
 Makes it easy to change settings without modifying code.
 """
 
+from typing import List, Optional
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -35,6 +36,118 @@ class Settings(BaseSettings):
     FRAME_PROCESSING_FPS: int = 5  # Process 5 frames per second
     CONFIDENCE_THRESHOLD: float = 0.5  # Only detections above 50% confidence
 
+    # Ingest admission control
+    INGEST_GLOBAL_RATE: float = 200.0  # Writes/second accepted across all cameras
+    INGEST_GLOBAL_BURST: int = 400
+    INGEST_CAMERA_RATE: float = 20.0  # Per camera (Camera.config "ingest_rate" overrides)
+    INGEST_CAMERA_BURST: int = 40  # (Camera.config "ingest_burst" overrides)
+    INGEST_MAX_PENDING: int = 1000  # Writes in flight across all cameras
+    INGEST_MAX_PENDING_PER_CAMERA: int = 100
+    INGEST_LOW_PRIORITY_SHARE: float = 0.5  # Share of capacity motion/low-confidence work may use
+    INGEST_MIN_RETRY_SECONDS: float = 1.0  # Smallest Retry-After sent with a 429
+
+    # Cross-camera re-identification
+    REID_WINDOW_SECONDS: float = 300.0  # How long a finished track can still be linked to
+    REID_MAX_TRACKS: int = 10000  # Descriptors kept in the index
+    REID_MIN_SIMILARITY: float = 0.9  # Cosine similarity needed to link two tracks
+    REID_CAMERA_RADIUS_M: float = 150.0  # Only link tracks on cameras this close
+
+    # Known-identity recognition
+    RECOGNITION_MIN_SIMILARITY: float = 0.92  # Cosine similarity needed to name a track
+    RECOGNITION_RECHECK_SECONDS: float = 30.0  # Re-check a track against the gallery this often
+
+    # Debugging / profiling
+    DEBUG_TOKEN: str = ""  # Admin token for /debug endpoints and request profiling (empty = off)
+    PROFILE_KEEP: int = 20  # Request profiles kept in memory
+    PROFILE_LINES: int = 60  # Functions listed per profile
+    SLOW_QUERY_MS: float = 250.0  # Record statements slower than this (0 = off)
+    SLOW_QUERY_KEEP: int = 100  # Slow statements kept in memory
+    SLOW_QUERY_EXPLAIN: bool = True  # Capture EXPLAIN plans for slow statements
+
+    # Event clips
+    CLIP_STORAGE_DIR: str = "/storage/clips"
+    CLIP_PRE_ROLL_SECONDS: float = 5.0  # Seconds kept before an event
+    CLIP_POST_ROLL_SECONDS: float = 5.0  # Seconds recorded after an event
+    CLIP_BUFFER_MAX_BYTES: int = 16 * 1024 * 1024  # Ring buffer cap per camera
+    CLIP_WRITER_THREADS: int = 2
+    CLIP_FILE_EXTENSION: str = "mjpeg"  # Container for concatenated packets
+    SIMULATOR_PACKET_FPS: float = 2.0  # Synthetic frames per camera fed to the clip buffers
+
+    # Event coalescing
+    EVENT_COALESCE_WINDOW_SECONDS: float = 30.0  # Merge repeats within this gap (0 = off)
+    EVENT_COALESCE_MAX_OPEN: int = 10000  # Cap on open windows held in memory
+
+    # Alert zones
+    ZONE_GRID_CELL_DEGREES: float = 0.001  # ~100m grid cells for the zone index
+    ZONE_GRID_MAX_CELLS: int = 4096  # Bigger zones are checked on every update
+
+    # Batched inserts
+    BATCH_WRITER_MAX_ROWS: int = 500  # Flush as soon as this many rows are queued
+    BATCH_WRITER_MAX_DELAY_MS: float = 20.0  # ...or when the oldest has waited this long
+    ENTITY_ID_BLOCK_SIZE: int = 100  # entities.id values reserved per sequence round-trip
+
+    # Live entity state
+    LIVE_STATE_FLUSH_SECONDS: float = 5.0  # Write-behind (and mirror reload) interval
+    LIVE_STATE_SYNC_OVERLAP_SECONDS: float = 10.0  # Mirrors re-read rows updated this long before their last sync
+
+    # Background workers
+    RUN_BACKGROUND_WORKERS: bool = True  # Run as a worker in the API process too
+    LEADER_LOCK_ID: int = 727001  # Postgres advisory lock key held by the leader
+    LEADER_CHECK_SECONDS: float = 5.0  # How often followers retry the lock
+
+    # Bulk camera provisioning
+    CAMERA_BATCH_MAX_ROWS: int = 10000  # Largest POST /cameras/batch
+
+    # Camera sharding across workers
+    WORKER_ID: str = ""  # Registry name of this worker (default: hostname:pid)
+    WORKER_HEARTBEAT_SECONDS: float = 2.0  # Heartbeat / reassignment interval
+    WORKER_TIMEOUT_SECONDS: float = 10.0  # Missed heartbeats for this long = dead
+    WORKER_VNODES: int = 64  # Points per worker on the hash ring
+
+    # Cross-process notifications (LISTEN/NOTIFY)
+    NOTIFY_CHECK_SECONDS: float = 10.0  # Listener connection health check interval
+
+    # Bulk export
+    EXPORT_CHUNK_SIZE: int = 5000  # Rows fetched per server-side cursor batch
+
+    # Vector tiles
+    TILE_CACHE_MAX_TILES: int = 5000
+    TILE_CLUSTER_MAX_ZOOM: int = 16  # Cluster points below this zoom
+    TILE_CLUSTER_GRID: int = 64  # Cluster cells per tile side
+    TILE_EVENTS_WINDOW_MINUTES: int = 60  # "Recent" events shown in the events layer
+    TILE_EVENTS_BUCKET_SECONDS: int = 60  # Events tiles re-render this often as the window slides
+
+    # Heatmaps
+    HEATMAP_CELL_SIZES: List[int] = [50, 100, 250, 1000]  # Resolutions kept as daily rollups
+    HEATMAP_ROLLUP_LOOKBACK_DAYS: int = 7  # Completed days (re)checked for rollup
+    HEATMAP_ROLLUP_INTERVAL_SECONDS: int = 3600
+
+    # Historical playback
+    PLAYBACK_TICK_SECONDS: float = 3.0  # Scene changes recorded at this resolution
+    PLAYBACK_KEYFRAME_SECONDS: float = 60.0  # Full scene written this often
+    PLAYBACK_RETENTION_DAYS: int = 7
+    PLAYBACK_MAX_RANGE_HOURS: int = 24  # Longest range one /playback stream may cover
+    PLAYBACK_PAGE_SIZE: int = 200  # Frames read per query while streaming (session released between pages)
+
+    # Stream recording / replay
+    SIMULATOR_SEED: Optional[int] = None  # Seed for reproducible synthetic data (None = random)
+    STREAM_RECORD_DIR: str = ""  # Record incoming detections here as gzipped NDJSON (empty = off)
+    STREAM_RECORD_FLUSH_SECONDS: float = 1.0
+    REPLAY_MAX_IN_FLIGHT: int = 256  # Concurrent writes while replaying
+
+    # Entity archival
+    ENTITY_ARCHIVE_AFTER_HOURS: int = 24  # Inactive this long -> moved to entities_archive
+    ENTITY_ARCHIVE_BATCH: int = 1000  # Rows moved per transaction
+    ENTITY_ARCHIVE_INTERVAL_SECONDS: int = 600
+
+    # Detection latency
+    LATENCY_SLO_MS: float = 200.0  # Capture-to-publish target (keep it one of the bucket bounds)
+    LATENCY_BUCKETS_MS: List[float] = [5, 10, 25, 50, 100, 150, 200, 300, 500, 1000, 2000, 5000]  # Histogram upper bounds
+    LATENCY_FLUSH_SECONDS: float = 10.0  # How often histograms are added to latency_hourly
+
+    # Occupancy / dwell analytics
+    DWELL_BUCKETS_SECONDS: List[int] = [5, 15, 30, 60, 120, 300, 600, 1800, 3600]  # Histogram upper bounds
+
     class Config:
         # Load from .env file
         env_file = ".env"
@@ -0,0 +1,107 @@
+"""
+Database Notifications
+
+One long-lived connection per process that LISTENs on Postgres
+notification channels and hands payloads to registered handlers.
+
+If the connection drops it is re-established, and the on_connect
+hooks run again so subscribers can resync whatever they may have
+missed in between.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.config import settings
+from app.db.session import engine
+
+Handler = Callable[[str], None]
+Hook = Callable[[], Awaitable[None]]
+
+
+class NotificationListener:
+    def __init__(self):
+        self.handlers: Dict[str, List[Handler]] = {}
+        self.on_connect: List[Hook] = []
+        self.running = False
+        self._conn: Optional[AsyncConnection] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def listen(self, channel: str, handler: Handler, on_connect: Optional[Hook] = None):
+        """Call handler(payload) for every notification on channel."""
+        self.handlers.setdefault(channel, []).append(handler)
+        if on_connect is not None:
+            self.on_connect.append(on_connect)
+
+    async def start(self):
+        """Connect and start listening"""
+        self.running = True
+        self._task = asyncio.create_task(self._listen_loop())
+
+    async def stop(self):
+        """Stop listening and close the connection"""
+        self.running = False
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self._close()
+
+    def _dispatch(self, connection, pid, channel, payload):
+        for handler in self.handlers.get(channel, ()):
+            try:
+                handler(payload)
+            except Exception as e:
+                print(f"❌ Notification handler failed on {channel}: {e}")
+
+    async def _listen_loop(self):
+        while self.running:
+            try:
+                if self._conn is None:
+                    conn = await engine.connect()
+                    self._conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                    raw = await self._conn.get_raw_connection()
+                    for channel in self.handlers:
+                        await raw.driver_connection.add_listener(channel, self._dispatch)
+                    print(f"👂 Listening on {', '.join(self.handlers) or 'no channels'}")
+
+                    for hook in self.on_connect:
+                        await hook()
+                else:
+                    # Notifications arrive on their own; just make sure we're alive
+                    raw = await self._conn.get_raw_connection()
+                    await raw.driver_connection.execute("SELECT 1")
+            except Exception as e:
+                print(f"❌ Notification listener error: {e}")
+                await self._close()
+
+            await asyncio.sleep(settings.NOTIFY_CHECK_SECONDS)
+
+    async def _close(self):
+        """
+        Drop our listeners and end the session.
+
+        The connection is invalidated rather than returned to the pool, so
+        it can't keep receiving notifications while serving other queries.
+        """
+        if self._conn is not None:
+            try:
+                raw = await self._conn.get_raw_connection()
+                for channel in self.handlers:
+                    await raw.driver_connection.remove_listener(channel, self._dispatch)
+            except Exception:
+                pass  # Invalidating ends the session anyway
+            try:
+                await self._conn.invalidate()
+            except Exception:
+                pass
+            try:
+                await self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
+
+
+# Global listener instance
+notifications = NotificationListener()
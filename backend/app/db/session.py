@@ -5,10 +5,14 @@ Creates async database sessions.
 Each request gets its own session.
 """
 
+import time
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 
 from app.config import settings
+from app.db.slow_queries import slow_query_log
 
 # Create async engine
 # This connects to PostgreSQL
@@ -18,6 +22,20 @@ engine = create_async_engine(
     future=True,
 )
 
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._query_started = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration_ms = (time.perf_counter() - context._query_started) * 1000
+    if duration_ms >= settings.SLOW_QUERY_MS:
+        slow_query_log.record(statement, parameters, duration_ms, executemany)
+
+# Time every statement and keep the slow ones (see GET /debug/slow-queries).
+# Not registered at all when SLOW_QUERY_MS is 0.
+if settings.SLOW_QUERY_MS > 0:
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
 # Create session factory
 # This creates new sessions for each request
 AsyncSessionLocal = sessionmaker(
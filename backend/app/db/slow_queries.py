@@ -0,0 +1,107 @@
+"""
+Slow Query Log
+
+Statements slower than SLOW_QUERY_MS, kept in a bounded in-memory ring
+(newest last) for GET /debug/slow-queries. Timing is done by engine
+events in app/db/session.py.
+
+Each slow statement gets its plan captured in the background on a
+separate connection that is always rolled back:
+- Plain SELECTs run EXPLAIN (ANALYZE, BUFFERS)
+- Anything that writes or has side effects (nextval, pg_notify, advisory
+  locks, row locks) only runs EXPLAIN (BUFFERS), since ANALYZE executes it
+
+Only one plan is captured at a time, and a statement is explained at
+most once per minute, so a burst of slow queries can't pile EXPLAINs on
+top of an already struggling database. The ring is per process.
+"""
+
+import asyncio
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional
+
+from app.config import settings
+
+# Don't EXPLAIN ANALYZE statements containing these (ANALYZE would run them)
+SIDE_EFFECTS = ("nextval", "setval", "pg_notify", "advisory", "for update", "for share")
+
+EXPLAIN_COOLDOWN_SECONDS = 60.0
+MAX_PARAMETERS_LENGTH = 500
+
+
+class SlowQueryLog:
+    def __init__(self):
+        self.entries: Deque[Dict[str, Any]] = deque(maxlen=settings.SLOW_QUERY_KEEP)
+        self.explained: Dict[str, float] = {}  # statement -> when it was last explained
+        self.explaining = False
+        self._tasks = set()
+
+    def record(self, statement: str, parameters: Any, duration_ms: float, executemany: bool):
+        """Called from the engine event when a statement ran too long."""
+        if statement.lstrip()[:7].upper() == "EXPLAIN":
+            return  # Our own plans
+
+        entry = {
+            "at": datetime.utcnow(),
+            "duration_ms": round(duration_ms, 1),
+            "statement": statement,
+            "parameters": repr(parameters)[:MAX_PARAMETERS_LENGTH],
+            "executemany": executemany,
+            "plan": None,
+            "analyzed": False,
+        }
+        self.entries.append(entry)
+
+        if settings.SLOW_QUERY_EXPLAIN and not executemany and self._should_explain(statement):
+            try:
+                task = asyncio.get_running_loop().create_task(self._explain(entry, parameters))
+            except RuntimeError:
+                return  # No event loop (e.g. alembic)
+            self.explaining = True
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    def _should_explain(self, statement: str) -> bool:
+        if self.explaining:
+            return False
+        now = time.monotonic()
+        if now - self.explained.get(statement, -EXPLAIN_COOLDOWN_SECONDS) < EXPLAIN_COOLDOWN_SECONDS:
+            return False
+        if len(self.explained) > 10 * settings.SLOW_QUERY_KEEP:
+            self.explained = {
+                text: at for text, at in self.explained.items()
+                if now - at < EXPLAIN_COOLDOWN_SECONDS
+            }
+        self.explained[statement] = now
+        return True
+
+    async def _explain(self, entry: Dict[str, Any], parameters: Any):
+        from app.db.session import engine
+
+        statement = entry["statement"]
+        lowered = statement.lower()
+        analyze = lowered.lstrip().startswith("select") and not any(word in lowered for word in SIDE_EFFECTS)
+        options = "ANALYZE, BUFFERS" if analyze else "BUFFERS"
+        if isinstance(parameters, list):
+            parameters = tuple(parameters)
+
+        try:
+            async with engine.connect() as conn:  # Closed without commit = rolled back
+                result = await conn.exec_driver_sql(f"EXPLAIN ({options}) {statement}", parameters or ())
+                entry["plan"] = [row[0] for row in result]
+                entry["analyzed"] = analyze
+        except Exception as e:
+            entry["plan_error"] = str(e)
+        finally:
+            self.explaining = False
+
+    def recent(self, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Newest first."""
+        entries = list(reversed(self.entries))
+        return entries[:limit] if limit else entries
+
+
+# Global slow query log instance
+slow_query_log = SlowQueryLog()
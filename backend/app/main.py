@@ -1,13 +1,22 @@
 """
 FastAPI Application Entry Point
 """
-import asyncio
-from fastapi import FastAPI
+import math
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 from app.api.v1.router import api_router
 from app.config import settings
-from app.workers.simulator import simulator
+from app.db.notifications import notifications
+from app.services.admission import Overloaded
+from app.services.camera_registry import RegistryUnavailable
+from app.services.latency_service import latency_tracker
+from app.services.live_state import live_state
+from app.services.profiling import ProfilingMiddleware
+from app.services.stream_recorder import stream_recorder
+from app.services.worker_service import default_worker_id
+from app.workers.runner import background_workers
 
 
 @asynccontextmanager
@@ -22,14 +31,33 @@ async def lifespan(app: FastAPI):
     print(f"📊 Database: {settings.DATABASE_URL.split('@')[1]}")
     print(f"🔧 Debug mode: {settings.DEBUG}")
     
-    # Start simulator
-    asyncio.create_task(simulator.start())
+    # Follow resource versions bumped by other processes (ETags, caches)
+    await notifications.start()
+    
+    # Detection latency histograms from API ingest
+    await latency_tracker.start()
+    
+    # Record ingested detections for replay (STREAM_RECORD_DIR)
+    await stream_recorder.start(default_worker_id())
+    
+    # Simulator, rollups and entity write-behind run in the elected leader
+    # only. Production runs them via `python -m app.workers` instead.
+    if settings.RUN_BACKGROUND_WORKERS:
+        await background_workers.start()
+    else:
+        await live_state.start(writer=False)
     
     yield
     
     # Shutdown
     print("👋 Shutting down gracefully...")
-    await simulator.stop()
+    if settings.RUN_BACKGROUND_WORKERS:
+        await background_workers.stop()
+    else:
+        await live_state.stop()
+    await stream_recorder.stop()
+    await latency_tracker.stop()
+    await notifications.stop()
 
 
 # Create FastAPI application
@@ -51,8 +79,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Profile requests carrying the admin token (only installed when one is set)
+if settings.DEBUG_TOKEN:
+    app.add_middleware(ProfilingMiddleware)
+
 app.include_router(api_router, prefix="/api/v1")
 
+# Shed ingest work -> 429 so clients back off instead of retrying at once
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request: Request, exc: Overloaded):
+    return JSONResponse(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        content={"detail": str(exc), "reason": exc.reason},
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
+
+# Registry never loaded -> 503, not an empty camera list
+@app.exception_handler(RegistryUnavailable)
+async def registry_unavailable_handler(request: Request, exc: RegistryUnavailable):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "5"},
+    )
+
 # Health check endpoint
 @app.get("/health")
 async def health_check():
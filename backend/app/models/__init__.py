@@ -1,8 +1,18 @@
 """
 Models Package
 """
+from app.models.alert_zone import AlertZone
 from app.models.camera import Camera
-from app.models.entity import Entity
+from app.models.entity import Entity, EntityArchive
 from app.models.event import Event
+from app.models.heatmap import HeatmapCoverage, HeatmapDaily
+from app.models.known_identity import KnownIdentity
+from app.models.latency import LatencyHourly
+from app.models.occupancy import DwellDaily, OccupancyHourly
+from app.models.playback import PlaybackDelta, PlaybackKeyframe
+from app.models.worker_node import WorkerNode
 
-__all__ = ["Camera", "Entity", "Event"]
+__all__ = [
+    "AlertZone", "Camera", "DwellDaily", "Entity", "EntityArchive", "Event", "HeatmapCoverage", "HeatmapDaily", "KnownIdentity", "LatencyHourly",
+    "OccupancyHourly", "PlaybackDelta", "PlaybackKeyframe", "WorkerNode",
+]
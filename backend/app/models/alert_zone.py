@@ -0,0 +1,35 @@
+"""
+Alert Zone Model
+
+A restricted area drawn on the map. Entities entering or leaving
+a zone generate zone_enter / zone_exit events.
+"""
+
+from sqlalchemy import Column, String, Boolean
+from geoalchemy2 import Geography
+
+from app.db.base import BaseModel
+
+class AlertZone(BaseModel):
+    """
+    Geofenced Alert Zone
+
+    The area is stored as a PostGIS polygon so it can be drawn and
+    queried like any other geography, but live enter/exit checks run
+    in memory (see app/services/zone_evaluator.py).
+    """
+    __tablename__ = "alert_zones"
+
+    name = Column(String, nullable=False, index=True)
+    description = Column(String, nullable=True)
+
+    # Polygon outline (SRID 4326 = WGS84 lat/lon)
+    area = Column(
+        Geography(geometry_type='POLYGON', srid=4326),
+        nullable=False
+    )
+
+    is_active = Column(Boolean, default=True)
+
+    def __repr__(self):
+        return f"<AlertZone {self.name} (id={self.id})>"
@@ -4,7 +4,8 @@ Camera Model
 Represents a security camera in the database.
 """
 
-from sqlalchemy import Column, String, Float, Boolean, JSON
+from sqlalchemy import Column, String, Float, Boolean, Computed, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from geoalchemy2 import Geography
 
 from app.db.base import BaseModel
@@ -32,6 +33,12 @@ class Camera(BaseModel):
         nullable=False
     )
 
+    # Plain lat/lon copies of location, kept in sync by Postgres
+    # (generated columns - never written by the app). Reading these avoids
+    # converting the geography on every query.
+    latitude = Column(Float, Computed("ST_Y(location::geometry)", persisted=True))
+    longitude = Column(Float, Computed("ST_X(location::geometry)", persisted=True))
+
     # Connection
     rtsp_url = Column(String, nullable=False)  # e.g., rtsp://192.168.1.100:554/stream1
     username = Column(String, nullable=True)
@@ -42,11 +49,23 @@ class Camera(BaseModel):
     is_online = Column(Boolean, default=False)  # Updated by collector
 
     # Configuration
-    config = Column(JSON, default={
+    config = Column(JSONB, default={
         "fps": 30,
         "resolution": "1920x1080",
         "detection_enabled": True
     })
 
+    # Fetch generated lat/lon right after INSERT/UPDATE (no lazy load later)
+    __mapper_args__ = {"eager_defaults": True}
+
+    # GIN index so config lookups (config @> '{...}') don't scan the table
+    __table_args__ = (
+        Index(
+            "ix_cameras_config", "config",
+            postgresql_using="gin",
+            postgresql_ops={"config": "jsonb_path_ops"},
+        ),
+    )
+
     def __repr__(self):
         return f"<Camera {self.name} (id={self.id})>"
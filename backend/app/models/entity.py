@@ -7,9 +7,13 @@ An "entity" is any detected object:
 - dog_3
 
 Each entity gets a unique ID and is tracked across frames.
+
+Entities inactive for longer than ENTITY_ARCHIVE_AFTER_HOURS are moved to
+entities_archive (app/workers/entity_archiver.py), so the hot table only
+holds the live population plus recent history.
 """
 
-from sqlalchemy import Column, String, Float, Boolean, ForeignKey, Integer, DateTime
+from sqlalchemy import Column, String, Float, Boolean, ForeignKey, Index, Integer, DateTime, Computed, text
 from geoalchemy2 import Geography
 
 from app.db.base import BaseModel
@@ -32,20 +36,71 @@ class Entity(BaseModel):
     # Where is it? (current location)
     location = Column(Geography(geometry_type='POINT', srid=4326))
 
+    # Generated lat/lon copies of location (see Camera)
+    latitude = Column(Float, Computed("ST_Y(location::geometry)", persisted=True))
+    longitude = Column(Float, Computed("ST_X(location::geometry)", persisted=True))
+
     # Which camera saw it?
     camera_id = Column(Integer, ForeignKey('cameras.id'), nullable=False)
 
     # Tracking info
     first_seen = Column(DateTime, nullable=False)
     last_seen = Column(DateTime, nullable=False)
-    is_active = Column(Boolean, default=True, index=True)
+    is_active = Column(Boolean, default=True)
 
     # Detection confidence (0.0 to 1.0)
     confidence = Column(Float, nullable=False)
 
+    # Re-identification: first entity of the same object seen on a nearby
+    # camera shortly before (see app/services/reid.py). No foreign key - it
+    # may point at an entity that has since been archived.
+    linked_entity_id = Column(Integer, nullable=True, index=True)
+
     # Recognition (optional)
     is_recognized = Column(Boolean, default=False)
     recognized_as = Column(String, nullable=True)  # "John", "Family Car", etc.
 
+    # Fetch generated lat/lon right after INSERT/UPDATE (no lazy load later)
+    __mapper_args__ = {"eager_defaults": True}
+
+    # Partial indexes: hot queries only ever touch active rows, the
+    # archiver only old inactive ones - neither scans the other's rows
+    __table_args__ = (
+        Index("ix_entities_active_camera_id", "camera_id", postgresql_where=text("is_active")),
+        Index("ix_entities_inactive_last_seen", "last_seen", postgresql_where=text("NOT is_active")),
+        # Live state mirrors re-read recently changed rows by this
+        Index("ix_entities_updated_at", "updated_at"),
+    )
+
     def __repr__(self):
         return f"<Entity {self.entity_id} ({self.object_type})>"
+
+
+class EntityArchive(BaseModel):
+    """
+    Archived (long inactive) entity.
+
+    Same columns as Entity, keeping the original id so linked_entity_id
+    still resolves, plus when the row was archived. entity_id is not unique
+    here: a name reused after archival would otherwise block the archiver.
+    """
+    __tablename__ = "entities_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    entity_id = Column(String, index=True, nullable=False)
+    object_type = Column(String, nullable=False)
+    location = Column(Geography(geometry_type='POINT', srid=4326))
+    latitude = Column(Float, Computed("ST_Y(location::geometry)", persisted=True))
+    longitude = Column(Float, Computed("ST_X(location::geometry)", persisted=True))
+    camera_id = Column(Integer, ForeignKey('cameras.id'), nullable=False)
+    first_seen = Column(DateTime, nullable=False)
+    last_seen = Column(DateTime, nullable=False, index=True)
+    is_active = Column(Boolean, default=False)
+    confidence = Column(Float, nullable=False)
+    linked_entity_id = Column(Integer, nullable=True, index=True)
+    is_recognized = Column(Boolean, default=False)
+    recognized_as = Column(String, nullable=True)
+    archived_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<EntityArchive {self.entity_id} ({self.object_type})>"
@@ -2,7 +2,8 @@
 Event Model
 Stores security events (motion, person detected, etc.)
 """
-from sqlalchemy import Column, String, Float, JSON, DateTime, ForeignKey, Integer
+from sqlalchemy import Column, String, Float, DateTime, ForeignKey, Index, Integer
+from sqlalchemy.dialects.postgresql import JSONB
 from app.db.base import BaseModel
 from datetime import datetime
 
@@ -14,5 +15,14 @@ class Event(BaseModel):
     camera_id = Column(Integer, ForeignKey("cameras.id"), nullable=False)
     event_type = Column(String, nullable=False)  # motion, person, vehicle, etc.
     confidence = Column(Float, nullable=False)
-    event_metadata = Column(JSON, default={})  # Renamed from 'metadata' to avoid SQLAlchemy conflict
+    event_metadata = Column(JSONB, default={})  # Renamed from 'metadata' to avoid SQLAlchemy conflict
     timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    # GIN index for metadata containment filters (GET /events?meta=...)
+    __table_args__ = (
+        Index(
+            "ix_events_event_metadata", "event_metadata",
+            postgresql_using="gin",
+            postgresql_ops={"event_metadata": "jsonb_path_ops"},
+        ),
+    )
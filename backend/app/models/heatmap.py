@@ -0,0 +1,57 @@
+"""
+Heatmap Model
+
+Precomputed daily activity counts per grid cell.
+Long heatmap time ranges read these instead of raw rows.
+"""
+
+from sqlalchemy import Column, String, Integer, Date, Index, UniqueConstraint
+
+from app.db.base import BaseModel
+
+class HeatmapDaily(BaseModel):
+    """
+    One grid cell's count for one day.
+
+    Cells are indexed in Web Mercator meters: for squares, i/j are
+    floor(x / cell_m) and floor(y / cell_m); for hexagons they are the
+    ST_HexagonGrid indexes. Either way ST_Square/ST_Hexagon(cell_m, i, j)
+    rebuilds the cell.
+    """
+    __tablename__ = "heatmap_daily"
+
+    day = Column(Date, nullable=False)
+    source = Column(String, nullable=False)  # events or entities
+    kind = Column(String, nullable=False)  # event_type or object_type
+    shape = Column(String, nullable=False)  # square or hex
+    cell_m = Column(Integer, nullable=False)
+    i = Column(Integer, nullable=False)
+    j = Column(Integer, nullable=False)
+    count = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        Index("ix_heatmap_daily_lookup", "source", "shape", "cell_m", "day"),
+    )
+
+    def __repr__(self):
+        return f"<HeatmapDaily {self.day} {self.source}/{self.kind} ({self.i},{self.j})={self.count}>"
+
+
+class HeatmapCoverage(BaseModel):
+    """
+    Marks a day as rolled up at one resolution.
+
+    Written in the same transaction as the day's heatmap_daily rows, so a
+    day with no activity at all still counts as covered.
+    """
+    __tablename__ = "heatmap_coverage"
+
+    day = Column(Date, nullable=False)
+    cell_m = Column(Integer, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("cell_m", "day", name="uq_heatmap_coverage_cell_day"),
+    )
+
+    def __repr__(self):
+        return f"<HeatmapCoverage {self.day} {self.cell_m}m>"
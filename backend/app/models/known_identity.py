@@ -0,0 +1,29 @@
+"""
+Known Identity Model
+
+A person or vehicle the system should recognize by name
+("John", "Family Car").
+"""
+
+from sqlalchemy import Column, String, Boolean, Float
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from app.db.base import BaseModel
+
+class KnownIdentity(BaseModel):
+    """
+    Recognition gallery entry
+
+    features is an appearance descriptor in the same space as the
+    re-identification descriptors (see app/services/reid.py). Matching
+    runs in memory (see app/services/recognition.py).
+    """
+    __tablename__ = "known_identities"
+
+    name = Column(String, nullable=False, index=True)
+    object_type = Column(String, nullable=False)  # person, vehicle, ...
+    features = Column(ARRAY(Float), nullable=False)
+    is_active = Column(Boolean, default=True, nullable=False)
+
+    def __repr__(self):
+        return f"<KnownIdentity {self.name} ({self.object_type})>"
@@ -0,0 +1,34 @@
+"""
+Latency Models
+
+Detection latency histograms, per camera and pipeline stage.
+"""
+
+from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, UniqueConstraint
+
+from app.db.base import BaseModel
+
+class LatencyHourly(BaseModel):
+    """
+    Latency histogram for one camera and stage over one hour.
+
+    stage is a pipeline stage (decode, detect, track, persist, publish)
+    or "total" (capture to publish). bucket indexes
+    settings.LATENCY_BUCKETS_MS (upper bounds); the extra last bucket
+    holds everything slower.
+    """
+    __tablename__ = "latency_hourly"
+
+    hour = Column(DateTime, nullable=False)  # Start of the hour (UTC)
+    camera_id = Column(Integer, ForeignKey('cameras.id'), nullable=False)
+    stage = Column(String, nullable=False)
+    bucket = Column(Integer, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+    total_ms = Column(Float, nullable=False, default=0.0)
+
+    __table_args__ = (
+        UniqueConstraint("hour", "camera_id", "stage", "bucket", name="uq_latency_hourly_key"),
+    )
+
+    def __repr__(self):
+        return f"<LatencyHourly {self.hour} camera {self.camera_id}/{self.stage} [{self.bucket}]={self.count}>"
@@ -0,0 +1,58 @@
+"""
+Occupancy Models
+
+Incrementally maintained activity summaries per camera and object type.
+Updated as entities appear and expire, so reading them never scans
+the entities table.
+"""
+
+from sqlalchemy import Column, String, Integer, Float, Date, DateTime, ForeignKey, UniqueConstraint
+
+from app.db.base import BaseModel
+
+class OccupancyHourly(BaseModel):
+    """
+    Entity traffic through one camera's view for one hour.
+
+    peak is the most entities of this type the camera had at once
+    during the hour.
+    """
+    __tablename__ = "occupancy_hourly"
+
+    hour = Column(DateTime, nullable=False)  # Start of the hour (UTC)
+    camera_id = Column(Integer, ForeignKey('cameras.id'), nullable=False)
+    object_type = Column(String, nullable=False)
+    entered = Column(Integer, nullable=False, default=0)
+    exited = Column(Integer, nullable=False, default=0)
+    peak = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("hour", "camera_id", "object_type", name="uq_occupancy_hourly_key"),
+    )
+
+    def __repr__(self):
+        return f"<OccupancyHourly {self.hour} camera {self.camera_id}/{self.object_type} peak={self.peak}>"
+
+
+class DwellDaily(BaseModel):
+    """
+    Dwell-time histogram for one camera and object type on one day.
+
+    bucket indexes settings.DWELL_BUCKETS_SECONDS (upper bounds); the extra
+    last bucket holds everything longer.
+    """
+    __tablename__ = "dwell_daily"
+
+    day = Column(Date, nullable=False)  # Day the entity expired (UTC)
+    camera_id = Column(Integer, ForeignKey('cameras.id'), nullable=False)
+    object_type = Column(String, nullable=False)
+    bucket = Column(Integer, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+    total_seconds = Column(Float, nullable=False, default=0.0)
+
+    __table_args__ = (
+        UniqueConstraint("day", "camera_id", "object_type", "bucket", name="uq_dwell_daily_key"),
+    )
+
+    def __repr__(self):
+        return f"<DwellDaily {self.day} camera {self.camera_id}/{self.object_type} [{self.bucket}]={self.count}>"
@@ -0,0 +1,45 @@
+"""
+Playback Models
+
+Recorded scene history for historical playback.
+
+A keyframe holds every active entity's position at one moment; a delta
+holds what changed in one tick since the previous keyframe or delta.
+Any moment is rebuilt from the nearest earlier keyframe plus the deltas
+after it, so the cost doesn't depend on how far back you scrub.
+"""
+
+from sqlalchemy import Column, DateTime, JSON
+
+from app.db.base import BaseModel
+
+class PlaybackKeyframe(BaseModel):
+    """
+    Full scene at ts.
+
+    entities: {entity_id: [latitude, longitude, object_type, camera_id]}
+    """
+    __tablename__ = "playback_keyframes"
+
+    ts = Column(DateTime, nullable=False, unique=True, index=True)
+    entities = Column(JSON, nullable=False)
+
+    def __repr__(self):
+        return f"<PlaybackKeyframe {self.ts} ({len(self.entities)} entities)>"
+
+
+class PlaybackDelta(BaseModel):
+    """
+    Changes in the tick ending at ts.
+
+    changes: {"added": {entity_id: [lat, lon, object_type, camera_id]},
+              "moved": {entity_id: [lat, lon]},
+              "removed": [entity_id, ...]}
+    """
+    __tablename__ = "playback_deltas"
+
+    ts = Column(DateTime, nullable=False, unique=True, index=True)
+    changes = Column(JSON, nullable=False)
+
+    def __repr__(self):
+        return f"<PlaybackDelta {self.ts}>"
@@ -0,0 +1,24 @@
+"""
+Worker Node Model
+
+Registry of background worker processes. Each live worker refreshes
+heartbeat_at every WORKER_HEARTBEAT_SECONDS; one that stops doing so for
+WORKER_TIMEOUT_SECONDS is considered dead and its cameras move to the
+others.
+"""
+
+from sqlalchemy import Column, String, Integer, DateTime
+
+from app.db.base import BaseModel
+
+class WorkerNode(BaseModel):
+    __tablename__ = "worker_nodes"
+
+    worker_id = Column(String, nullable=False, unique=True, index=True)  # hostname:pid unless WORKER_ID is set
+    hostname = Column(String, nullable=False)
+    pid = Column(Integer, nullable=False)
+    started_at = Column(DateTime, nullable=False)
+    heartbeat_at = Column(DateTime, nullable=False, index=True)  # Database clock (UTC)
+
+    def __repr__(self):
+        return f"<WorkerNode {self.worker_id}>"
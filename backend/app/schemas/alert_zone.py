@@ -0,0 +1,42 @@
+"""
+Alert Zone Schemas
+Request/response models for alert zones.
+"""
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+
+class ZonePoint(BaseModel):
+    """One vertex of a zone outline"""
+    latitude: float = Field(..., ge=-90, le=90)
+    longitude: float = Field(..., ge=-180, le=180)
+
+
+class AlertZoneCreate(BaseModel):
+    """Data needed to create a zone"""
+    name: str
+    description: Optional[str] = None
+    points: List[ZonePoint] = Field(..., min_length=3)  # Ring is closed automatically
+
+
+class AlertZoneUpdate(BaseModel):
+    """Data that can be updated"""
+    name: Optional[str] = None
+    description: Optional[str] = None
+    is_active: Optional[bool] = None
+    points: Optional[List[ZonePoint]] = Field(None, min_length=3)
+
+
+class AlertZoneResponse(BaseModel):
+    """What API returns"""
+    id: int
+    name: str
+    description: Optional[str] = None
+    points: List[ZonePoint]
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
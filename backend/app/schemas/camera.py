@@ -3,7 +3,7 @@ Camera Schemas
 Request/response models for camera API.
 """
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Literal
 from datetime import datetime
 
 
@@ -43,3 +43,25 @@ class CameraResponse(CameraBase):
 
     class Config:
         from_attributes = True
+
+
+class CameraBatchCreate(BaseModel):
+    """Many cameras at once"""
+    cameras: List[Dict[str, Any]]  # CameraCreate fields; checked row by row
+    upsert_on: Optional[Literal["name", "rtsp_url"]] = None  # Update cameras matching on this field
+
+
+class CameraBatchRow(BaseModel):
+    """What happened to one row"""
+    row: int  # Index in the request
+    status: Literal["created", "updated", "error"]
+    id: Optional[int] = None
+    errors: List[str] = []
+
+
+class CameraBatchResponse(BaseModel):
+    """Result of a batch"""
+    created: int
+    updated: int
+    failed: int
+    rows: List[CameraBatchRow]
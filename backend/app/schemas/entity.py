@@ -6,7 +6,7 @@ API models for detected objects.
 
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
 
 class EntityBase(BaseModel):
     entity_id: str
@@ -17,6 +17,8 @@ class EntityBase(BaseModel):
 
 class EntityCreate(EntityBase):
     camera_id: int
+    captured_at: Optional[datetime] = None  # Frame capture time (default: now)
+    stages: Optional[Dict[str, datetime]] = None  # When decode/detect/track finished upstream
 
 class EntityResponse(EntityBase):
     id: int
@@ -26,6 +28,7 @@ class EntityResponse(EntityBase):
     is_active: bool
     is_recognized: bool
     recognized_as: Optional[str] = None
+    linked_entity_id: Optional[int] = None
 
     class Config:
         from_attributes = True
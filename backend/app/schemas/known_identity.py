@@ -0,0 +1,38 @@
+"""
+Known Identity Schemas
+Request/response models for the recognition gallery.
+"""
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime
+
+from app.services.reid import DESCRIPTOR_SIZE
+
+
+class KnownIdentityCreate(BaseModel):
+    """Data needed to enroll an identity"""
+    name: str
+    object_type: str
+    features: List[float] = Field(..., min_length=DESCRIPTOR_SIZE, max_length=DESCRIPTOR_SIZE)
+
+
+class KnownIdentityUpdate(BaseModel):
+    """Data that can be updated"""
+    name: Optional[str] = None
+    object_type: Optional[str] = None
+    is_active: Optional[bool] = None
+    features: Optional[List[float]] = Field(None, min_length=DESCRIPTOR_SIZE, max_length=DESCRIPTOR_SIZE)
+
+
+class KnownIdentityResponse(BaseModel):
+    """What API returns"""
+    id: int
+    name: str
+    object_type: str
+    features: List[float]
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
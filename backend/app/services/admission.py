@@ -0,0 +1,177 @@
+"""
+Admission Control
+
+Bounds the write load the ingest path accepts, so a flood from one camera
+(or all of them) slows down ingestion instead of taking Postgres down.
+
+Every detection/event write first asks for admission:
+- Token buckets limit the rate globally and per camera (INGEST_* settings,
+  overridable per camera with Camera.config "ingest_rate"/"ingest_burst")
+- Writes in flight are capped globally and per camera (the bounded queue)
+- Low-priority work (motion events and detections below
+  CONFIDENCE_THRESHOLD) may only use part of the capacity, so it is shed
+  first; zone alerts skip the rate limits and only respect the hard cap
+
+Rejected work raises Overloaded with a Retry-After hint; shed counts are
+kept for GET /ingest/stats. Limits and counters are per process.
+"""
+
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+from app.config import settings
+from app.services.camera_registry import camera_registry
+from app.services.versions import resource_versions
+
+# Priorities, lowest first
+LOW, NORMAL, HIGH = 0, 1, 2
+PRIORITY_NAMES = {LOW: "low", NORMAL: "normal", HIGH: "high"}
+
+
+class Overloaded(Exception):
+    """Work was shed; try again after retry_after seconds."""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(f"Ingest overloaded ({reason})")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, reserve: float = 0.0) -> float:
+        """Seconds until a token is available above the reserve (0 = now)."""
+        self._refill(time.monotonic())
+        missing = reserve + 1 - self.tokens
+        if missing <= 0:
+            return 0.0
+        return missing / self.rate if self.rate > 0 else float("inf")
+
+    def take(self):
+        self.tokens -= 1
+
+
+def priority_of(kind: str, confidence: float) -> int:
+    """Priority of a detection or event."""
+    if kind in ("zone_enter", "zone_exit"):
+        return HIGH
+    if kind == "motion" or confidence < settings.CONFIDENCE_THRESHOLD:
+        return LOW
+    return NORMAL
+
+
+class AdmissionController:
+    def __init__(self):
+        self.global_bucket = TokenBucket(settings.INGEST_GLOBAL_RATE, settings.INGEST_GLOBAL_BURST)
+        self.camera_buckets: Dict[int, TokenBucket] = {}
+        self.camera_versions: Dict[int, str] = {}  # "cameras" version when configured
+        self.pending = 0
+        self.camera_pending: Counter = Counter()
+        self.admitted: Counter = Counter()  # priority name -> count
+        self.shed: Counter = Counter()  # (reason, priority name) -> count
+        self.shed_by_camera: Counter = Counter()
+
+    def configure(self, camera_id: int, config: Optional[Dict[str, Any]]):
+        """Set a camera's rate limit from its config (or the defaults)."""
+        config = config or {}
+        rate = float(config.get("ingest_rate", settings.INGEST_CAMERA_RATE))
+        burst = float(config.get("ingest_burst", settings.INGEST_CAMERA_BURST))
+
+        bucket = self.camera_buckets.get(camera_id)
+        if bucket is None:
+            self.camera_buckets[camera_id] = TokenBucket(rate, burst)
+        else:
+            bucket.rate = rate
+            bucket.burst = burst
+            bucket.tokens = min(bucket.tokens, burst)
+        self.camera_versions[camera_id] = resource_versions.get("cameras")
+
+    def load_camera(self, camera_id: int):
+        """Take a camera's limits from the registry unless they're current."""
+        if self.camera_versions.get(camera_id) == resource_versions.get("cameras"):
+            return
+        camera = camera_registry.get(camera_id)
+        self.configure(camera_id, camera.config if camera else None)
+
+    def _camera_bucket(self, camera_id: int) -> TokenBucket:
+        if camera_id not in self.camera_buckets:
+            self.configure(camera_id, None)
+        return self.camera_buckets[camera_id]
+
+    def _reject(self, camera_id: int, priority: int, reason: str, retry_after: float):
+        self.shed[(reason, PRIORITY_NAMES[priority])] += 1
+        self.shed_by_camera[camera_id] += 1
+        retry_after = min(max(retry_after, settings.INGEST_MIN_RETRY_SECONDS), 60.0)
+        raise Overloaded(reason, retry_after)
+
+    @contextmanager
+    def admit(self, camera_id: int, kind: str, confidence: float = 1.0) -> Iterator[int]:
+        """
+        Hold a place for one write while the block runs.
+
+        Usage:
+            with admission_control.admit(camera_id, "person", 0.8):
+                await write(...)
+
+        Raises:
+            Overloaded: The write was shed
+        """
+        priority = priority_of(kind, confidence)
+        share = settings.INGEST_LOW_PRIORITY_SHARE if priority == LOW else 1.0
+
+        # Bounded queue: low priority only gets part of it
+        if self.pending >= settings.INGEST_MAX_PENDING * share:
+            self._reject(camera_id, priority, "queue_full", settings.INGEST_MIN_RETRY_SECONDS)
+        if self.camera_pending[camera_id] >= settings.INGEST_MAX_PENDING_PER_CAMERA * share:
+            self._reject(camera_id, priority, "camera_queue_full", settings.INGEST_MIN_RETRY_SECONDS)
+
+        # Rate limits: low priority leaves a reserve of tokens for the rest
+        if priority != HIGH:
+            buckets = (self.global_bucket, self._camera_bucket(camera_id))
+            wait = max(b.wait_time(reserve=b.burst * (1 - share)) for b in buckets)
+            if wait > 0:
+                self._reject(camera_id, priority, "rate_limited", wait)
+            for bucket in buckets:
+                bucket.take()
+
+        self.admitted[PRIORITY_NAMES[priority]] += 1
+        self.pending += 1
+        self.camera_pending[camera_id] += 1
+        try:
+            yield priority
+        finally:
+            self.pending -= 1
+            self.camera_pending[camera_id] -= 1
+            if not self.camera_pending[camera_id]:
+                del self.camera_pending[camera_id]
+
+    def stats(self) -> dict:
+        return {
+            "pending": self.pending,
+            "max_pending": settings.INGEST_MAX_PENDING,
+            "pending_by_camera": dict(self.camera_pending),
+            "admitted": dict(self.admitted),
+            "shed": [
+                {"reason": reason, "priority": priority, "count": count}
+                for (reason, priority), count in sorted(self.shed.items())
+            ],
+            "shed_by_camera": dict(self.shed_by_camera),
+            "global_tokens": round(self.global_bucket.tokens, 2),
+        }
+
+
+# Global admission controller instance
+admission_control = AdmissionController()
@@ -0,0 +1,143 @@
+"""
+Batch Writer
+
+Group commit for inserts. Producers `await writer.submit(values)` and get
+the new row's ID back; behind the scenes rows are collected until either
+BATCH_WRITER_MAX_ROWS are waiting or the oldest has waited
+BATCH_WRITER_MAX_DELAY_MS, then written as one multi-row INSERT ...
+RETURNING in a single transaction.
+
+If a batch fails, its rows are retried one at a time so a single bad row
+only fails its own submitter.
+"""
+
+import asyncio
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+
+from app.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.entity import Entity
+from app.models.event import Event
+
+Pending = Tuple[Dict[str, Any], asyncio.Future]
+
+
+class BatchWriter:
+    def __init__(
+        self,
+        model,
+        max_rows: int = settings.BATCH_WRITER_MAX_ROWS,
+        max_delay_ms: float = settings.BATCH_WRITER_MAX_DELAY_MS
+    ):
+        self.model = model
+        self.max_rows = max_rows
+        self.max_delay = max_delay_ms / 1000
+        self.pending: List[Pending] = []
+        self._wakeup = asyncio.Event()  # Rows waiting
+        self._full = asyncio.Event()  # Size threshold reached
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    async def submit(self, values: Dict[str, Any]) -> int:
+        """
+        Queue one row for insertion.
+
+        Returns:
+            The new row's ID once its batch is committed
+
+        Raises:
+            Whatever the INSERT raised for this row
+        """
+        if self._task is None or self._task.done():
+            self._stopping = False
+            self._task = asyncio.create_task(self._writer_loop())
+
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((values, future))
+        self._wakeup.set()
+        if len(self.pending) >= self.max_rows:
+            self._full.set()
+        return await future
+
+    async def stop(self):
+        """Write whatever is still queued and stop the writer loop."""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+    async def _writer_loop(self):
+        while True:
+            await self._wakeup.wait()
+            if not self._stopping:
+                try:
+                    # First row starts the clock; a full batch cuts it short
+                    await asyncio.wait_for(self._full.wait(), timeout=self.max_delay)
+                except asyncio.TimeoutError:
+                    pass
+            await self._flush()
+            if self._stopping and not self.pending:
+                return
+
+    async def _flush(self):
+        batch = self.pending[:self.max_rows]
+        self.pending = self.pending[self.max_rows:]
+        if len(self.pending) < self.max_rows:
+            self._full.clear()
+        if not self.pending:
+            self._wakeup.clear()
+        if not batch:
+            return
+
+        try:
+            ids = await self._insert([values for values, _ in batch])
+        except Exception:
+            await self._insert_one_by_one(batch)
+            return
+
+        for (_, future), row_id in zip(batch, ids):
+            if not future.done():
+                future.set_result(row_id)
+
+    async def _insert(self, rows: List[Dict[str, Any]]) -> List[int]:
+        """INSERT rows in one transaction; IDs come back in input order."""
+        # executemany needs the same columns in every row
+        groups: Dict[Tuple[str, ...], List[int]] = {}
+        for n, row in enumerate(rows):
+            groups.setdefault(tuple(sorted(row)), []).append(n)
+
+        ids: List[int] = [0] * len(rows)
+        async with AsyncSessionLocal() as db:
+            try:
+                for positions in groups.values():
+                    stmt = insert(self.model).returning(
+                        self.model.id, sort_by_parameter_order=True
+                    )
+                    result = await db.execute(stmt, [rows[n] for n in positions])
+                    for n, row_id in zip(positions, result.scalars()):
+                        ids[n] = row_id
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+        return ids
+
+    async def _insert_one_by_one(self, batch: List[Pending]):
+        for values, future in batch:
+            try:
+                (row_id,) = await self._insert([values])
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                continue
+            if not future.done():
+                future.set_result(row_id)
+
+
+# Global batch writer instances
+event_writer = BatchWriter(Event)
+entity_writer = BatchWriter(Entity)
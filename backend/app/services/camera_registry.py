@@ -0,0 +1,174 @@
+"""
+Camera Registry
+
+In-memory copy of the cameras table, shared by the API and the workers.
+
+Loaded once, then kept current by statement-level triggers on cameras
+that send pg_notify('camera_changes', '<op>:<id>,<id>,...') after every
+insert, update and delete - whoever made the change (API, scripts, psql).
+Each notification re-reads just those rows in one query, so changes reach
+every process in well under a second and reads never touch the database.
+Statements touching too many rows to list send 'RELOAD' instead. The
+service layer also applies its own writes directly, so a process sees
+them immediately.
+
+The whole table is re-read whenever the listener (re)connects, since
+notifications may have been missed in between. Until a first load
+succeeds, reads raise RegistryUnavailable (503 from the API) rather than
+answering from an empty registry.
+"""
+
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from sqlalchemy import select
+
+from app.db.notifications import notifications
+from app.db.session import AsyncSessionLocal
+from app.models.camera import Camera
+from app.services.versions import resource_versions
+
+CHANNEL = "camera_changes"
+
+Subscriber = Callable[[], None]
+
+
+class RegistryUnavailable(Exception):
+    """The cameras table couldn't be read and nothing is loaded yet."""
+
+
+class CameraInfo:
+    """One camera. Same attribute names as the Camera model."""
+    __slots__ = (
+        "id", "name", "description", "latitude", "longitude",
+        "rtsp_url", "username", "password", "is_active", "is_online",
+        "config", "created_at", "updated_at",
+    )
+
+    def __init__(self, **fields: Any):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    @classmethod
+    def from_model(cls, camera: Camera) -> "CameraInfo":
+        return cls(**{name: getattr(camera, name) for name in cls.__slots__})
+
+
+class CameraRegistry:
+    def __init__(self):
+        self.cameras: Dict[int, CameraInfo] = {}
+        self.loaded = False
+        self.subscribers: List[Subscriber] = []
+        self.refreshing: Set[int] = set()  # Cameras being re-read
+        self.stale: Set[int] = set()  # Changed again while being re-read
+        self._tasks = set()
+
+    def subscribe(self, callback: Subscriber):
+        """Call callback() after every change to the cameras."""
+        self.subscribers.append(callback)
+
+    async def ensure_loaded(self):
+        """
+        Load the registry if it never has been.
+
+        Raises:
+            RegistryUnavailable: The table couldn't be read
+        """
+        if not self.loaded and not await self.load():
+            raise RegistryUnavailable("Camera registry is not loaded (database unavailable)")
+
+    async def load(self) -> bool:
+        """
+        Read the whole table.
+
+        Returns:
+            True on success; on failure the previous contents are kept
+        """
+        async with AsyncSessionLocal() as db:
+            try:
+                result = await db.execute(select(Camera).order_by(Camera.id))
+                self.cameras = {camera.id: CameraInfo.from_model(camera) for camera in result.scalars()}
+                self.loaded = True
+                print(f"📹 Loaded {len(self.cameras)} cameras")
+            except Exception as e:
+                print(f"❌ Failed to load cameras: {e}")
+                return False
+        self._changed()
+        return True
+
+    def all(self) -> List[CameraInfo]:
+        return [self.cameras[camera_id] for camera_id in sorted(self.cameras)]
+
+    def get(self, camera_id: int) -> Optional[CameraInfo]:
+        return self.cameras.get(camera_id)
+
+    def put(self, camera: Camera):
+        """Apply a camera we just wrote ourselves."""
+        self.put_many([camera])
+
+    def put_many(self, cameras: List[Camera]):
+        """Apply cameras we just wrote ourselves (one change for all)."""
+        for camera in cameras:
+            self.cameras[camera.id] = CameraInfo.from_model(camera)
+        self._changed()
+
+    def remove(self, camera_id: int):
+        """Apply a camera we just deleted ourselves."""
+        if self.cameras.pop(camera_id, None) is not None:
+            self._changed()
+
+    def handle_notification(self, payload: str):
+        if payload == "RELOAD":
+            self._spawn(self.load())
+            return
+        op, _, ids = payload.partition(":")
+        try:
+            camera_ids = {int(camera_id) for camera_id in ids.split(",")}
+        except ValueError:
+            print(f"❌ Bad camera notification: {payload!r}")
+            return
+        # Ones being read already are read again once that's done, so an
+        # older read can't land after a newer one
+        self.stale |= camera_ids & self.refreshing
+        camera_ids -= self.refreshing
+        if camera_ids:
+            self.refreshing |= camera_ids
+            self._spawn(self._refresh(camera_ids))
+
+    def _spawn(self, coro):
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, camera_ids: Set[int]):
+        """Re-read some cameras (gone = deleted, whatever the notification said)."""
+        pending = set(camera_ids)
+        try:
+            while pending:
+                self.stale -= pending
+                async with AsyncSessionLocal() as db:
+                    result = await db.execute(select(Camera).where(Camera.id.in_(pending)))
+                    cameras = list(result.scalars())
+
+                for camera_id in pending - {camera.id for camera in cameras}:
+                    self.cameras.pop(camera_id, None)
+                self.put_many(cameras)
+                pending = camera_ids & self.stale
+        except Exception as e:
+            print(f"❌ Failed to refresh cameras {sorted(camera_ids)}: {e}")
+        finally:
+            self.refreshing -= camera_ids
+
+    def _changed(self):
+        # The trigger already announced a new version to other processes
+        resource_versions.bump("cameras", publish=False)
+        for callback in self.subscribers:
+            try:
+                callback()
+            except Exception as e:
+                print(f"❌ Camera subscriber failed: {e}")
+
+
+# Global camera registry instance
+camera_registry = CameraRegistry()
+notifications.listen(CHANNEL, camera_registry.handle_notification, on_connect=camera_registry.load)
@@ -3,15 +3,23 @@ Camera Service
 
 Business logic for camera operations.
 Keeps API endpoints clean.
+
+Reads come from the in-memory camera registry; writes go to the database
+and are applied to the registry right away (other processes hear about
+them through the cameras trigger).
 """
 
+from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List, Optional
+from sqlalchemy import insert, select, text, update
+from typing import Any, Dict, List, Optional
+from geoalchemy2.elements import WKTElement
 from geoalchemy2.functions import ST_SetSRID, ST_MakePoint
+from pydantic import ValidationError
 
 from app.models.camera import Camera
 from app.schemas.camera import CameraCreate, CameraUpdate
+from app.services.camera_registry import CameraInfo, camera_registry
 
 class CameraService:
     """
@@ -60,10 +68,116 @@ class CameraService:
         self.db.add(camera)
         await self.db.commit()
         await self.db.refresh(camera)  # Get the generated ID
+        camera_registry.put(camera)
 
         return camera
 
-    async def get_cameras(self, skip: int = 0, limit: int = 100) -> List[Camera]:
+    async def import_cameras(
+        self,
+        rows: List[Dict[str, Any]],
+        upsert_on: Optional[str] = None
+    ) -> dict:
+        """
+        Create (or update) many cameras in one transaction.
+
+        Each row is validated on its own; bad rows are reported and
+        skipped. The rest go in with multi-row INSERTs and one batched
+        UPDATE.
+
+        Args:
+            rows: CameraCreate fields per camera
+            upsert_on: "name" or "rtsp_url" - rows matching an existing
+                camera on this field update it instead
+
+        Returns:
+            created/updated/failed counts and a report per row
+        """
+        report = [{"row": n, "status": "error", "id": None, "errors": []} for n in range(len(rows))]
+        valid: Dict[int, CameraCreate] = {}
+        keys: Dict[str, int] = {}  # upsert key -> first row with it
+        for n, row in enumerate(rows):
+            try:
+                camera = CameraCreate.model_validate(row)
+            except ValidationError as e:
+                report[n]["errors"] = [
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                    for error in e.errors()
+                ]
+                continue
+            if upsert_on:
+                key = getattr(camera, upsert_on)
+                if key in keys:
+                    report[n]["errors"] = [f"{upsert_on}: same as row {keys[key]}"]
+                    continue
+                keys[key] = n
+            valid[n] = camera
+
+        existing: Dict[str, List[int]] = {}
+        if upsert_on and valid:
+            # Nobody can add a matching camera between this read and our insert
+            await self.db.execute(text("LOCK TABLE cameras IN SHARE ROW EXCLUSIVE MODE"))
+            column = getattr(Camera, upsert_on)
+            result = await self.db.execute(select(Camera.id, column).where(column.in_(list(keys))))
+            for camera_id, key in result:
+                existing.setdefault(key, []).append(camera_id)
+
+        now = datetime.utcnow()
+        inserts: List[tuple] = []
+        updates: Dict[bool, List[tuple]] = {True: [], False: []}  # With/without config
+        for n, camera in valid.items():
+            values = {
+                "name": camera.name,
+                "description": camera.description,
+                "location": WKTElement(f'POINT({camera.longitude} {camera.latitude})', srid=4326),
+                "rtsp_url": camera.rtsp_url,
+                "username": camera.username,
+                "password": camera.password,
+                "updated_at": now,
+            }
+            matches = existing.get(getattr(camera, upsert_on)) if upsert_on else None
+            if not matches:
+                values.update(config=camera.config or {}, created_at=now)
+                inserts.append((n, values))
+            elif len(matches) > 1:
+                report[n]["errors"] = [f"{upsert_on}: matches {len(matches)} existing cameras"]
+            else:
+                values["id"] = matches[0]
+                if camera.config is not None:
+                    values["config"] = camera.config  # Otherwise keep the current one
+                updates[camera.config is not None].append((n, values))
+
+        try:
+            if inserts:
+                result = await self.db.execute(
+                    insert(Camera).returning(Camera.id, sort_by_parameter_order=True),
+                    [values for _, values in inserts]
+                )
+                for (n, _), camera_id in zip(inserts, result.scalars()):
+                    report[n].update(status="created", id=camera_id)
+            for group in updates.values():
+                if group:
+                    # ORM bulk UPDATE by primary key -> a single executemany
+                    await self.db.execute(update(Camera), [values for _, values in group])
+                    for n, values in group:
+                        report[n].update(status="updated", id=values["id"])
+            await self.db.commit()
+        except Exception:
+            await self.db.rollback()
+            raise
+
+        written = [entry["id"] for entry in report if entry["status"] != "error"]
+        if written:
+            result = await self.db.execute(select(Camera).where(Camera.id.in_(written)))
+            camera_registry.put_many(list(result.scalars()))
+
+        return {
+            "created": sum(1 for entry in report if entry["status"] == "created"),
+            "updated": sum(1 for entry in report if entry["status"] == "updated"),
+            "failed": sum(1 for entry in report if entry["status"] == "error"),
+            "rows": report,
+        }
+
+    async def get_cameras(self, skip: int = 0, limit: int = 100) -> List[CameraInfo]:
         """
         Get all cameras.
 
@@ -72,16 +186,15 @@ class CameraService:
             limit: Maximum number of records to return
 
         Returns:
-            List of cameras
+            List of cameras, by ID
+
+        Raises:
+            RegistryUnavailable: The camera registry couldn't be loaded
         """
-        result = await self.db.execute(
-            select(Camera)
-            .offset(skip)
-            .limit(limit)
-        )
-        return result.scalars().all()
+        await camera_registry.ensure_loaded()
+        return camera_registry.all()[skip:skip + limit]
 
-    async def get_camera(self, camera_id: int) -> Optional[Camera]:
+    async def get_camera(self, camera_id: int) -> Optional[CameraInfo]:
         """
         Get a specific camera by ID.
 
@@ -90,7 +203,15 @@ class CameraService:
 
         Returns:
             Camera if found, None otherwise
+
+        Raises:
+            RegistryUnavailable: The camera registry couldn't be loaded
         """
+        await camera_registry.ensure_loaded()
+        return camera_registry.get(camera_id)
+
+    async def _get_model(self, camera_id: int) -> Optional[Camera]:
+        """The camera's row, for writing."""
         result = await self.db.execute(
             select(Camera).where(Camera.id == camera_id)
         )
@@ -111,7 +232,7 @@ class CameraService:
         Returns:
             Updated camera if found, None otherwise
         """
-        camera = await self.get_camera(camera_id)
+        camera = await self._get_model(camera_id)
         if not camera:
             return None
 
@@ -122,6 +243,7 @@ class CameraService:
 
         await self.db.commit()
         await self.db.refresh(camera)
+        camera_registry.put(camera)
 
         return camera
 
@@ -135,11 +257,12 @@ class CameraService:
         Returns:
             True if deleted, False if not found
         """
-        camera = await self.get_camera(camera_id)
+        camera = await self._get_model(camera_id)
         if not camera:
             return False
 
         await self.db.delete(camera)
         await self.db.commit()
+        camera_registry.remove(camera_id)
 
         return True
@@ -4,21 +4,73 @@ Entity Service
 Manages detected objects.
 """
 
+import asyncio
+from collections import deque
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from typing import List
+from sqlalchemy import select, text
+from typing import List, Optional, Union
 from geoalchemy2.functions import ST_SetSRID, ST_MakePoint
 from datetime import datetime
 
-from app.models.entity import Entity
+from app.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.entity import Entity, EntityArchive
 from app.schemas.entity import EntityCreate
+from app.services.latency_service import LatencyTrace, latency_tracker
+from app.services.live_state import live_state, LiveEntity
+from app.services.stream_recorder import stream_recorder
+from app.services.versions import resource_versions
+
+
+class EntityIdPool:
+    """
+    entities.id values reserved from the sequence ahead of their inserts.
+
+    An id also numbers entity_id, so it's unique across workers. Ids are
+    taken ENTITY_ID_BLOCK_SIZE at a time; ones never used leave gaps.
+    """
+
+    def __init__(self, block_size: int = settings.ENTITY_ID_BLOCK_SIZE):
+        self.block_size = block_size
+        self.ids = deque()
+        self._lock = asyncio.Lock()
+
+    async def reserve(self) -> int:
+        """Next reserved id, refilling the pool when it runs dry."""
+        if not self.ids:
+            async with self._lock:
+                if not self.ids:  # Another caller may have refilled it meanwhile
+                    await self._refill()
+        return self.ids.popleft()
+
+    async def _refill(self):
+        async with AsyncSessionLocal() as db:
+            result = await db.execute(
+                text(
+                    "SELECT nextval(pg_get_serial_sequence('entities', 'id')) "
+                    "FROM generate_series(1, :n)"
+                ),
+                {"n": self.block_size}
+            )
+            self.ids.extend(result.scalars())
+
 
 class EntityService:
     def __init__(self, db: AsyncSession):
         self.db = db
 
     async def create_entity(self, entity_data: EntityCreate) -> Entity:
-        """Create a new detected entity."""
+        """
+        Create a new detected entity.
+
+        first_seen is the capture time; upstream stage times plus persist
+        and publish go into the latency histograms.
+        """
+        trace = LatencyTrace(entity_data.camera_id, entity_data.captured_at)
+        for stage, at in (entity_data.stages or {}).items():
+            if stage in ("decode", "detect", "track"):
+                trace.mark(stage, at)
+
         location = ST_SetSRID(
             ST_MakePoint(entity_data.longitude, entity_data.latitude),
             4326
@@ -30,16 +82,45 @@ class EntityService:
             location=location,
             camera_id=entity_data.camera_id,
             confidence=entity_data.confidence,
-            first_seen=datetime.utcnow(),
-            last_seen=datetime.utcnow(),
+            first_seen=trace.captured_at,
+            last_seen=trace.captured_at,
         )
 
         self.db.add(entity)
         await self.db.commit()
         await self.db.refresh(entity)
+        trace.mark("persist")
+        stream_recorder.record(
+            "entity", trace.captured_at, camera_id=entity.camera_id, entity_id=entity.entity_id,
+            object_type=entity.object_type, latitude=entity_data.latitude,
+            longitude=entity_data.longitude, confidence=entity.confidence
+        )
 
+        live_state.add(LiveEntity.from_model(
+            entity, entity_data.latitude, entity_data.longitude
+        ))
+        resource_versions.bump("entities")
+        trace.mark("publish")
+        latency_tracker.observe(trace)
         return entity
 
+    async def get_entity(self, entity_id: str) -> Optional[Union[Entity, EntityArchive]]:
+        """Get an entity by entity_id, falling back to the archive (latest first)."""
+        result = await self.db.execute(
+            select(Entity).where(Entity.entity_id == entity_id)
+        )
+        entity = result.scalar_one_or_none()
+        if entity is not None:
+            return entity
+
+        result = await self.db.execute(
+            select(EntityArchive)
+            .where(EntityArchive.entity_id == entity_id)
+            .order_by(EntityArchive.last_seen.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
     async def get_active_entities(self) -> List[Entity]:
         """Get all active entities."""
         result = await self.db.execute(
@@ -68,4 +149,12 @@ class EntityService:
             await self.db.commit()
             await self.db.refresh(entity)
 
+            # Already persisted - just keep live state in step
+            live_state.move(entity_id, latitude, longitude, entity.last_seen, mark_dirty=False)
+            resource_versions.bump("entities")
+
         return entity
+
+
+# Global entity id pool
+entity_ids = EntityIdPool()
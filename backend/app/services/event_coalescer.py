@@ -0,0 +1,181 @@
+"""
+Event Coalescer
+
+Merges repeated events (same camera, type and entity) that arrive within a
+time window into a single row instead of inserting one row per detection.
+
+The row is the source of truth: a merge increments it in SQL and the open
+window is refreshed from what the UPDATE returns, so a merge whose
+transaction is rolled back leaves nothing inflated behind.
+"""
+
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import Float, Integer, cast, func, literal, literal_column, update
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.event import Event
+from app.services.batch_writer import event_writer
+
+
+class OpenWindow:
+    """An event row that is still accepting merges."""
+    __slots__ = ("event_id", "last_seen", "count", "max_confidence")
+
+    def __init__(self, event_id: int, timestamp: datetime, confidence: float):
+        self.event_id = event_id
+        self.last_seen = timestamp
+        self.count = 1
+        self.max_confidence = confidence
+
+
+class EventCoalescer:
+    """
+    Coalescing stage in front of event persistence.
+
+    Open windows are kept in an OrderedDict in least-recently-updated order,
+    so expired windows sit at the front and are cheap to drop. The number of
+    open windows is capped; the oldest are closed first when the cap is hit.
+    Closing a window only forgets it - the row already holds the final counts.
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = settings.EVENT_COALESCE_WINDOW_SECONDS,
+        max_open: int = settings.EVENT_COALESCE_MAX_OPEN
+    ):
+        self.window_seconds = window_seconds
+        self.max_open = max_open
+        self.windows: "OrderedDict[Tuple, OpenWindow]" = OrderedDict()
+
+    def _expire(self, now: datetime):
+        """Close windows that have gone quiet and enforce the size cap."""
+        while self.windows:
+            window = next(iter(self.windows.values()))
+            if (now - window.last_seen).total_seconds() <= self.window_seconds:
+                break
+            self.windows.popitem(last=False)
+
+        while len(self.windows) > self.max_open:
+            self.windows.popitem(last=False)
+
+    def is_open(
+        self,
+        camera_id: int,
+        event_type: str,
+        entity_id: Optional[str] = None,
+        now: Optional[datetime] = None
+    ) -> bool:
+        """Would an event with this key be merged into an existing row?"""
+        window = self.windows.get((camera_id, event_type, entity_id))
+        if window is None:
+            return False
+        now = now or datetime.utcnow()
+        return (now - window.last_seen).total_seconds() <= self.window_seconds
+
+    async def record(
+        self,
+        db: AsyncSession,
+        camera_id: int,
+        event_type: str,
+        confidence: float,
+        metadata: Optional[Dict[str, Any]] = None,
+        entity_id: Optional[str] = None,
+        timestamp: Optional[datetime] = None
+    ) -> Tuple[int, bool]:
+        """
+        Persist an event, merging it into an open window when possible.
+
+        New rows go through the batch writer and are committed when this
+        returns; merges are UPDATEs on the caller's session, which the
+        caller commits.
+
+        Returns:
+            (event row id, True if merged into an existing row)
+        """
+        now = timestamp or datetime.utcnow()
+        key = (camera_id, event_type, entity_id)
+        self._expire(now)
+
+        window = self.windows.get(key) if self.window_seconds > 0 else None
+        if window is not None:
+            merged = await self._merge(db, window.event_id, confidence, now)
+            if merged is not None:
+                window.count, window.max_confidence = merged
+                window.last_seen = now
+                self.windows.move_to_end(key)
+                return window.event_id, True
+            del self.windows[key]  # Row is gone (e.g. retention) - start a new one
+
+        metadata = dict(metadata or {})
+        if entity_id is not None:
+            metadata["entity_id"] = entity_id
+        metadata.update(count=1, last_seen=now.isoformat(), max_confidence=confidence)
+
+        event_id = await event_writer.submit({
+            "camera_id": camera_id,
+            "event_type": event_type,
+            "confidence": confidence,
+            "event_metadata": metadata,
+            "timestamp": now,
+        })
+
+        if self.window_seconds > 0:
+            self.windows[key] = OpenWindow(event_id, now, confidence)
+            self._expire(now)
+
+        return event_id, False
+
+    async def _merge(
+        self,
+        db: AsyncSession,
+        event_id: int,
+        confidence: float,
+        now: datetime
+    ) -> Optional[Tuple[int, float]]:
+        """
+        Count one more occurrence on an event row, on the caller's session.
+
+        Returns:
+            (count, max confidence) as now stored, or None if the row is gone
+        """
+        max_confidence = func.greatest(Event.confidence, cast(confidence, Float))
+        count = func.coalesce(Event.event_metadata["count"].astext.cast(Integer), 1) + 1
+        result = await db.execute(
+            update(Event)
+            .where(Event.id == event_id)
+            .values(
+                confidence=max_confidence,
+                # || keeps every other key, including ones added by annotate()
+                event_metadata=Event.event_metadata
+                .op("||")(literal({"last_seen": now.isoformat()}, JSONB))
+                .op("||")(func.jsonb_build_object(
+                    literal_column("'count'"), count,
+                    literal_column("'max_confidence'"), max_confidence,
+                )),
+                updated_at=now,
+            )
+            .returning(Event.event_metadata["count"].astext.cast(Integer), Event.confidence)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.first()
+        return (row[0], row[1]) if row is not None else None
+
+    async def annotate(self, event_id: int, fields: Dict[str, Any]):
+        """Add keys to an event's metadata; merges never overwrite them."""
+        async with AsyncSessionLocal() as db:
+            await db.execute(
+                update(Event)
+                .where(Event.id == event_id)
+                .values(event_metadata=Event.event_metadata.op("||")(literal(fields, JSONB)))
+            )
+            await db.commit()
+
+
+# Global coalescer instance
+event_coalescer = EventCoalescer()
@@ -0,0 +1,78 @@
+"""
+Gallery Service
+
+Business logic for the known-identity gallery.
+Every change bumps the "gallery" version, which makes the recognizer
+reload its matrix (in every process) on its next batch.
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import List, Optional
+
+from app.models.known_identity import KnownIdentity
+from app.schemas.known_identity import KnownIdentityCreate, KnownIdentityUpdate
+from app.services.versions import resource_versions
+
+
+class GalleryService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create_identity(self, identity_data: KnownIdentityCreate) -> KnownIdentity:
+        """Enroll a new identity."""
+        identity = KnownIdentity(
+            name=identity_data.name,
+            object_type=identity_data.object_type,
+            features=identity_data.features,
+        )
+
+        self.db.add(identity)
+        await self.db.commit()
+        await self.db.refresh(identity)
+        resource_versions.bump("gallery")
+        return identity
+
+    async def get_identities(self) -> List[KnownIdentity]:
+        """Get all identities."""
+        result = await self.db.execute(
+            select(KnownIdentity).order_by(KnownIdentity.id)
+        )
+        return result.scalars().all()
+
+    async def get_identity(self, identity_id: int) -> Optional[KnownIdentity]:
+        """Get a specific identity by ID."""
+        result = await self.db.execute(
+            select(KnownIdentity).where(KnownIdentity.id == identity_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def update_identity(
+        self,
+        identity_id: int,
+        identity_update: KnownIdentityUpdate
+    ) -> Optional[KnownIdentity]:
+        """Update identity fields and/or features."""
+        identity = await self.get_identity(identity_id)
+        if not identity:
+            return None
+
+        update_data = identity_update.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(identity, field, value)
+
+        await self.db.commit()
+        await self.db.refresh(identity)
+        resource_versions.bump("gallery")
+        return identity
+
+    async def delete_identity(self, identity_id: int) -> bool:
+        """Remove an identity from the gallery."""
+        identity = await self.get_identity(identity_id)
+        if not identity:
+            return False
+
+        await self.db.delete(identity)
+        await self.db.commit()
+        resource_versions.bump("gallery")
+        return True
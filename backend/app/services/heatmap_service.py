@@ -0,0 +1,243 @@
+"""
+Heatmap Service
+
+Bins events and entity positions into a square or hexagon grid in PostGIS.
+
+Full days that have been rolled up into heatmap_daily (as recorded in
+heatmap_coverage, so quiet days count too) are read from there; only the
+uncovered parts of the range (usually today and the partial days
+at either end) touch raw rows. That keeps long ranges cheap.
+"""
+
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.heatmap import HeatmapCoverage
+
+# Point sources, in Web Mercator (meters) so cell sizes are in meters.
+# Events have no position of their own - they use their camera's.
+# Coalesced events count every merged occurrence.
+SOURCES = {
+    "events": """
+        SELECT ST_Transform(cameras.location::geometry, 3857) AS p,
+               events.event_type AS kind,
+               events.timestamp AS ts,
+               COALESCE((events.event_metadata->>'count')::int, 1) AS w
+        FROM events JOIN cameras ON cameras.id = events.camera_id
+    """,
+    "entities": """
+        SELECT ST_Transform(location::geometry, 3857) AS p,
+               object_type AS kind,
+               last_seen AS ts,
+               1 AS w
+        FROM (
+            SELECT location, object_type, last_seen FROM entities
+            UNION ALL
+            SELECT location, object_type, last_seen FROM entities_archive
+        ) AS history
+        WHERE location IS NOT NULL
+    """,
+}
+
+# Grouped (kind, i, j, n) counts over raw_points
+BINNING = {
+    "square": """
+        SELECT kind, floor(ST_X(p) / CAST(:cell AS float8))::int AS i, floor(ST_Y(p) / CAST(:cell AS float8))::int AS j, sum(w) AS n
+        FROM raw_points
+        GROUP BY 1, 2, 3
+    """,
+    "hex": """
+        SELECT kind, h.i, h.j, sum(w) AS n
+        FROM raw_points
+        CROSS JOIN LATERAL (
+            SELECT hex.i, hex.j FROM ST_HexagonGrid(CAST(:cell AS float8), p) AS hex
+            WHERE ST_Intersects(hex.geom, p) LIMIT 1
+        ) AS h
+        GROUP BY 1, 2, 3
+    """,
+}
+
+# Cell outline from its indexes. The origin carries the SRID: the default
+# one is SRID 0, which ST_Transform refuses.
+CELL_ORIGIN = "ST_SetSRID(ST_MakePoint(0, 0), 3857)"
+CELL_GEOMETRY = {
+    "square": f"ST_Square(CAST(:cell AS float8), i, j, {CELL_ORIGIN})",
+    "hex": f"ST_Hexagon(CAST(:cell AS float8), i, j, {CELL_ORIGIN})",
+}
+
+
+def _raw_points_sql(source: str, ranges: List[Tuple[datetime, datetime]], params: dict, kind: Optional[str]) -> str:
+    """Wrap a source with time-range and kind filters."""
+    if ranges:
+        clauses = []
+        for n, (start, end) in enumerate(ranges):
+            params[f"s{n}"] = start
+            params[f"e{n}"] = end
+            clauses.append(f"(ts >= :s{n} AND ts < :e{n})")
+        condition = " OR ".join(clauses)
+    else:
+        condition = "FALSE"
+
+    if kind is not None:
+        params["kind"] = kind
+        condition = f"({condition}) AND kind = :kind"
+
+    return f"SELECT * FROM ({SOURCES[source]}) AS src WHERE {condition}"
+
+
+def _full_days(start: datetime, end: datetime) -> List[date]:
+    """Whole UTC days inside [start, end), excluding today."""
+    first = start.date() if start.time() == time.min else start.date() + timedelta(days=1)
+    last = min(end.date(), datetime.utcnow().date())  # Exclusive
+    return [first + timedelta(days=n) for n in range((last - first).days)]
+
+
+def _uncovered(start: datetime, end: datetime, covered: List[date]) -> List[Tuple[datetime, datetime]]:
+    """Parts of [start, end) not covered by the given days."""
+    ranges = []
+    cursor = start
+    for day in sorted(covered):
+        day_start = datetime.combine(day, time.min)
+        if day_start > cursor:
+            ranges.append((cursor, day_start))
+        cursor = max(cursor, day_start + timedelta(days=1))
+    if cursor < end:
+        ranges.append((cursor, end))
+    return ranges
+
+
+class HeatmapService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_heatmap(
+        self,
+        source: str,
+        start: datetime,
+        end: datetime,
+        cell_m: int,
+        shape: str = "square",
+        kind: Optional[str] = None
+    ) -> Dict[str, list]:
+        """
+        Counts per grid cell for a time range.
+
+        Returns:
+            Parallel arrays: latitude/longitude (cell centers), count, i, j
+        """
+        params = {"cell": cell_m, "source": source, "shape": shape}
+
+        # Days already rolled up at this resolution
+        rolled_days: List[date] = []
+        days = _full_days(start, end)
+        if days and cell_m in settings.HEATMAP_CELL_SIZES:
+            result = await self.db.execute(
+                select(HeatmapCoverage.day).where(
+                    HeatmapCoverage.cell_m == cell_m,
+                    HeatmapCoverage.day.in_(days),
+                )
+            )
+            rolled_days = list(result.scalars())
+        params["days"] = rolled_days
+
+        raw_points = _raw_points_sql(source, _uncovered(start, end, rolled_days), params, kind)
+        daily_kind = "AND kind = :kind" if kind is not None else ""
+
+        sql = f"""
+            WITH raw_points AS ({raw_points}),
+            raw_cells AS ({BINNING[shape]}),
+            daily_cells AS (
+                SELECT kind, i, j, count AS n FROM heatmap_daily
+                WHERE source = :source AND shape = :shape AND cell_m = :cell
+                  AND day = ANY(CAST(:days AS date[])) {daily_kind}
+            ),
+            cells AS (
+                SELECT i, j, sum(n)::int AS n
+                FROM (SELECT * FROM raw_cells UNION ALL SELECT * FROM daily_cells) AS u
+                GROUP BY i, j
+            )
+            SELECT i, j, n, ST_Y(center) AS latitude, ST_X(center) AS longitude
+            FROM cells,
+                 LATERAL (SELECT ST_Transform(ST_Centroid({CELL_GEOMETRY[shape]}), 4326) AS center) AS c
+            ORDER BY n DESC
+        """
+        result = await self.db.execute(text(sql), params)
+
+        heatmap = {"latitude": [], "longitude": [], "count": [], "i": [], "j": []}
+        for row in result:
+            heatmap["latitude"].append(row.latitude)
+            heatmap["longitude"].append(row.longitude)
+            heatmap["count"].append(row.n)
+            heatmap["i"].append(row.i)
+            heatmap["j"].append(row.j)
+        return heatmap
+
+    async def rolled_up_days(self, days: List[date]) -> List[date]:
+        """Which of these days are rolled up at every configured resolution."""
+        if not days:
+            return []
+        result = await self.db.execute(
+            select(HeatmapCoverage.day)
+            .where(
+                HeatmapCoverage.day.in_(days),
+                HeatmapCoverage.cell_m.in_(settings.HEATMAP_CELL_SIZES),
+            )
+            .group_by(HeatmapCoverage.day)
+            .having(func.count() == len(set(settings.HEATMAP_CELL_SIZES)))
+        )
+        return list(result.scalars())
+
+    async def rollup_day(self, day: date):
+        """
+        (Re)build heatmap_daily for one day at every configured resolution.
+
+        Replaces the day's rows and marks the day covered in a single
+        transaction, so readers see either the old rollup or the new one.
+        The caller commits.
+        """
+        start = datetime.combine(day, time.min)
+        end = start + timedelta(days=1)
+
+        for source in SOURCES:
+            for shape in BINNING:
+                for cell_m in settings.HEATMAP_CELL_SIZES:
+                    params = {"cell": cell_m, "day": day, "source": source, "shape": shape}
+                    raw_points = _raw_points_sql(source, [(start, end)], params, None)
+
+                    await self.db.execute(
+                        text(
+                            "DELETE FROM heatmap_daily WHERE day = :day AND source = :source "
+                            "AND shape = :shape AND cell_m = :cell"
+                        ),
+                        params,
+                    )
+                    await self.db.execute(
+                        text(f"""
+                            WITH raw_points AS ({raw_points})
+                            INSERT INTO heatmap_daily
+                                (day, source, kind, shape, cell_m, i, j, count, created_at, updated_at)
+                            SELECT CAST(:day AS date), CAST(:source AS varchar), kind,
+                                   CAST(:shape AS varchar), CAST(:cell AS integer), i, j, n,
+                                   now() AT TIME ZONE 'utc', now() AT TIME ZONE 'utc'
+                            FROM ({BINNING[shape]}) AS cells
+                        """),
+                        params,
+                    )
+
+        now = datetime.utcnow()
+        await self.db.execute(
+            insert(HeatmapCoverage)
+            .values([
+                {"day": day, "cell_m": cell_m, "created_at": now, "updated_at": now}
+                for cell_m in sorted(set(settings.HEATMAP_CELL_SIZES))
+            ])
+            .on_conflict_do_update(
+                index_elements=["cell_m", "day"],
+                set_={"updated_at": now},
+            )
+        )
@@ -0,0 +1,241 @@
+"""
+Latency Service
+
+End-to-end detection latency, from frame capture to the moment clients
+can see the result.
+
+Each detection carries a LatencyTrace: the capture time plus a timestamp
+per pipeline stage it went through -
+- decode: frame decoded
+- detect: objects detected
+- track: matched to tracks (re-id)
+- persist: written to the database
+- publish: resource version bumped, i.e. the next poll (If-None-Match)
+  by any client picks it up
+
+Stage latency is the time since the previous recorded stage; "total" is
+capture to the last stage. The tracker bins these into per-camera
+histograms (LATENCY_BUCKETS_MS) and adds them onto latency_hourly with
+upserts, so every process (API and workers) contributes to the same
+rows.
+"""
+
+import asyncio
+import bisect
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.latency import LatencyHourly
+from app.utils.timestamps import utc_naive
+
+STAGES = ("decode", "detect", "track", "persist", "publish")
+
+LatencyKey = Tuple[datetime, int, str, int]  # (hour, camera_id, stage, bucket)
+
+
+def latency_bucket(ms: float) -> int:
+    """Histogram bucket for a latency (last bucket = slower than all bounds)."""
+    return bisect.bisect_left(settings.LATENCY_BUCKETS_MS, ms)
+
+
+class LatencyTrace:
+    """Capture time and stage timestamps of one detection."""
+    __slots__ = ("camera_id", "captured_at", "marks")
+
+    def __init__(self, camera_id: int, captured_at: Optional[datetime] = None):
+        self.camera_id = camera_id
+        self.captured_at = utc_naive(captured_at) if captured_at else datetime.utcnow()
+        self.marks: Dict[str, datetime] = {}
+
+    def mark(self, stage: str, at: Optional[datetime] = None):
+        """Stage finished (now, or at a time reported by the camera)."""
+        self.marks[stage] = utc_naive(at) if at else datetime.utcnow()
+
+    def stage_ms(self) -> Dict[str, float]:
+        """Milliseconds per recorded stage, plus total."""
+        durations = {}
+        previous = self.captured_at
+        for stage in STAGES:
+            at = self.marks.get(stage)
+            if at is not None:
+                durations[stage] = max((at - previous).total_seconds() * 1000, 0.0)
+                previous = at
+        if durations:
+            durations["total"] = max((previous - self.captured_at).total_seconds() * 1000, 0.0)
+        return durations
+
+    def to_metadata(self) -> dict:
+        """Timestamps so far, for a record's metadata."""
+        return {
+            "captured_at": self.captured_at.isoformat(),
+            "stages": {stage: at.isoformat() for stage, at in self.marks.items()},
+        }
+
+
+class LatencyTracker:
+    def __init__(self):
+        self.pending: Dict[LatencyKey, List[float]] = {}  # -> [count, total_ms]
+        self.running = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Start the flush loop"""
+        self.running = True
+        self._task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self):
+        """Stop the flush loop and write out what's left"""
+        self.running = False
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self.flush()
+
+    def observe(self, trace: LatencyTrace):
+        """Add a finished detection's stage latencies to the histograms."""
+        hour = trace.captured_at.replace(minute=0, second=0, microsecond=0)
+        for stage, ms in trace.stage_ms().items():
+            totals = self.pending.setdefault((hour, trace.camera_id, stage, latency_bucket(ms)), [0, 0.0])
+            totals[0] += 1
+            totals[1] += ms
+
+    async def _flush_loop(self):
+        while self.running:
+            await asyncio.sleep(settings.LATENCY_FLUSH_SECONDS)
+            await self.flush()
+
+    async def flush(self) -> bool:
+        """
+        Add the accumulated histograms onto latency_hourly.
+
+        Returns:
+            True on success (or nothing to do), False if the write failed
+        """
+        if not self.pending:
+            return True
+
+        pending, self.pending = self.pending, {}
+        now = datetime.utcnow()
+
+        async with AsyncSessionLocal() as db:
+            try:
+                stmt = insert(LatencyHourly)
+                stmt = stmt.on_conflict_do_update(
+                    constraint="uq_latency_hourly_key",
+                    set_={
+                        "count": LatencyHourly.count + stmt.excluded.count,
+                        "total_ms": LatencyHourly.total_ms + stmt.excluded.total_ms,
+                        "updated_at": stmt.excluded.updated_at,
+                    },
+                )
+                await db.execute(stmt, [
+                    {
+                        "hour": key[0], "camera_id": key[1], "stage": key[2], "bucket": key[3],
+                        "count": count, "total_ms": total, "created_at": now, "updated_at": now,
+                    }
+                    for key, (count, total) in pending.items()
+                ])
+                await db.commit()
+                return True
+            except Exception as e:
+                print(f"❌ Failed to flush latency histograms: {e}")
+                await db.rollback()
+                # Merge back so the next flush retries them
+                for key, (count, total) in pending.items():
+                    totals = self.pending.setdefault(key, [0, 0.0])
+                    totals[0] += count
+                    totals[1] += total
+                return False
+
+
+class LatencyService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_latency(self, start: datetime, end: datetime, camera_id: Optional[int] = None) -> List[dict]:
+        """
+        Per camera and stage latency histograms over [start, end).
+
+        Returns:
+            Per camera: stages with count, average_ms, bucket-resolution
+            p50/p90/p99 upper bounds and the buckets; plus the share of
+            detections whose total stayed within LATENCY_SLO_MS
+        """
+        query = select(
+            LatencyHourly.camera_id,
+            LatencyHourly.stage,
+            LatencyHourly.bucket,
+            func.sum(LatencyHourly.count).label("count"),
+            func.sum(LatencyHourly.total_ms).label("total_ms"),
+        ).where(
+            LatencyHourly.hour >= start.replace(minute=0, second=0, microsecond=0),
+            LatencyHourly.hour < end,
+        )
+        if camera_id is not None:
+            query = query.where(LatencyHourly.camera_id == camera_id)
+
+        result = await self.db.execute(
+            query.group_by(LatencyHourly.camera_id, LatencyHourly.stage, LatencyHourly.bucket)
+        )
+        sums: Dict[int, Dict[str, Dict[int, Tuple[int, float]]]] = {}
+        for row in result:
+            sums.setdefault(row.camera_id, {}).setdefault(row.stage, {})[row.bucket] = (
+                int(row.count), float(row.total_ms)
+            )
+
+        bounds = list(settings.LATENCY_BUCKETS_MS) + [None]
+        cameras = []
+        for cam, stages in sorted(sums.items()):
+            summary = {"camera_id": cam, "stages": {}}
+            for stage in STAGES + ("total",):
+                if stage in stages:
+                    summary["stages"][stage] = _histogram(bounds, stages[stage])
+
+            total = stages.get("total", {})
+            detections = sum(count for count, _ in total.values())
+            within = sum(
+                count for bucket, (count, _) in total.items()
+                if bounds[bucket] is not None and bounds[bucket] <= settings.LATENCY_SLO_MS
+            )
+            summary["slo"] = {
+                "target_ms": settings.LATENCY_SLO_MS,
+                "within": within / detections if detections else None,
+            }
+            cameras.append(summary)
+        return cameras
+
+
+def _histogram(bounds: list, sums: Dict[int, Tuple[int, float]]) -> dict:
+    counts = [sums.get(n, (0, 0.0))[0] for n in range(len(bounds))]
+    total = sum(counts)
+    total_ms = sum(ms for _, ms in sums.values())
+
+    def percentile(p: float) -> Optional[float]:
+        running = 0
+        for bound, count in zip(bounds, counts):
+            running += count
+            if running >= p * total:
+                return bound
+        return None
+
+    return {
+        "count": total,
+        "average_ms": total_ms / total if total else None,
+        "p50_le_ms": percentile(0.5) if total else None,
+        "p90_le_ms": percentile(0.9) if total else None,
+        "p99_le_ms": percentile(0.99) if total else None,
+        "buckets": [
+            {"le_ms": bound, "count": count}
+            for bound, count in zip(bounds, counts)
+        ],
+    }
+
+
+# Global latency tracker instance
+latency_tracker = LatencyTracker()
@@ -0,0 +1,392 @@
+"""
+Live Entity State
+
+Authoritative in-memory copy of all active entities.
+
+Movement ticks and API reads work against this store instead of the
+entities table. Changes are marked dirty and written back to Postgres
+in one batched UPDATE per flush interval (write-behind), plus a final
+flush on shutdown.
+
+Each entity is written by exactly one process: the worker whose shard
+holds its camera. A store owns either everything (single writer), no
+cameras (a read-only mirror, e.g. the API) or a shard of cameras. Entities
+it doesn't own are refreshed every interval, so reads lag their owner by
+at most two intervals: a refresh only runs once an "entities" version
+announcement has come in, and then only re-reads rows whose updated_at
+is newer than the last sync (less an overlap for transactions that
+committed late). Owned entities stay authoritative in memory; ones
+created elsewhere on owned cameras (e.g. POST /entities) are adopted on
+the next refresh.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+from geoalchemy2.elements import WKTElement
+from sqlalchemy import select, update
+
+from app.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.entity import Entity
+from app.services.occupancy_service import occupancy_tracker
+from app.services.versions import resource_versions
+
+
+class LiveEntity:
+    """One active entity. Slots keep thousands of these cheap."""
+    __slots__ = (
+        "id", "entity_id", "object_type", "camera_id",
+        "latitude", "longitude", "confidence",
+        "first_seen", "last_seen", "is_active",
+        "is_recognized", "recognized_as", "linked_entity_id",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        entity_id: str,
+        object_type: str,
+        camera_id: int,
+        latitude: float,
+        longitude: float,
+        confidence: float,
+        first_seen: datetime,
+        last_seen: datetime,
+        is_active: bool = True,
+        is_recognized: bool = False,
+        recognized_as: Optional[str] = None,
+        linked_entity_id: Optional[int] = None,
+    ):
+        self.id = id
+        self.entity_id = entity_id
+        self.object_type = object_type
+        self.camera_id = camera_id
+        self.latitude = latitude
+        self.longitude = longitude
+        self.confidence = confidence
+        self.first_seen = first_seen
+        self.last_seen = last_seen
+        self.is_active = is_active
+        self.is_recognized = is_recognized
+        self.recognized_as = recognized_as
+        self.linked_entity_id = linked_entity_id
+
+    @classmethod
+    def from_model(cls, entity: Entity, latitude: float, longitude: float) -> "LiveEntity":
+        return cls(
+            id=entity.id,
+            entity_id=entity.entity_id,
+            object_type=entity.object_type,
+            camera_id=entity.camera_id,
+            latitude=latitude,
+            longitude=longitude,
+            confidence=entity.confidence,
+            first_seen=entity.first_seen,
+            last_seen=entity.last_seen,
+            is_active=entity.is_active if entity.is_active is not None else True,
+            is_recognized=bool(entity.is_recognized),
+            recognized_as=entity.recognized_as,
+            linked_entity_id=entity.linked_entity_id,
+        )
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class LiveEntityStore:
+    def __init__(self):
+        self.entities: Dict[str, LiveEntity] = {}
+        self.dirty: Set[str] = set()
+        self.running = False
+        self.cameras: Optional[Set[int]] = None  # Cameras whose entities we own (None = all)
+        self.synced: Optional[Tuple[int, Optional[int], datetime]] = None  # Last read: (baseline, version, time)
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, writer: bool = True):
+        """
+        Load active entities and start the background loop.
+
+        Args:
+            writer: True to own all entities (write-behind flushes),
+                False for a read-only mirror until set_cameras() hands
+                us a shard
+        """
+        self.cameras = None if writer else set()
+        await self.load()
+        self.running = True
+        self._task = asyncio.create_task(self._sync_loop())
+
+    def owns(self, camera_id: int) -> bool:
+        return self.cameras is None or camera_id in self.cameras
+
+    async def set_cameras(self, cameras: Set[int]):
+        """
+        Own exactly the entities of these cameras from now on.
+
+        Changes to entities we're giving up are flushed first, so their new
+        owner reads them; entities we gain are re-read for the same reason.
+        """
+        await self.flush()
+        gained = set(cameras) - (self.cameras or set())
+        self.cameras = set(cameras)
+        await self.load(fresh=gained)
+        occupancy_tracker.reset(self.owned())
+
+    async def stop(self):
+        """Stop the flush loop and write out everything still dirty."""
+        self.running = False
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        # Final flush - retry once so a transient error doesn't lose state
+        for _ in range(2):
+            if await self.flush() and await occupancy_tracker.flush():
+                break
+            await asyncio.sleep(0.5)
+
+    async def load(self, fresh: Optional[Set[int]] = None) -> bool:
+        """
+        Read active entities from the database.
+
+        Entities we own keep their in-memory state, except on cameras in
+        `fresh`; with fresh=None (first load) everything is read.
+
+        Returns:
+            True if the reloaded entities differ from what we held
+        """
+        marker = self._sync_marker()
+        async with AsyncSessionLocal() as db:
+            try:
+                result = await db.execute(
+                    select(Entity).where(Entity.is_active == True)
+                )
+                rows = list(result.scalars())
+            except Exception as e:
+                print(f"❌ Failed to load live entities: {e}")
+                return False
+
+        kept = {} if fresh is None else {
+            entity_id: entity for entity_id, entity in self.entities.items()
+            if self.owns(entity.camera_id) and entity.camera_id not in fresh
+        }
+        entities = {}
+        for row in rows:
+            if row.entity_id in kept:
+                continue
+            entity = LiveEntity.from_model(
+                row,
+                row.latitude if row.latitude is not None else 0.0,
+                row.longitude if row.longitude is not None else 0.0,
+            )
+            entities[row.entity_id] = entity
+            if fresh is not None and self.owns(entity.camera_id) and entity.camera_id not in fresh:
+                # Created elsewhere on one of our cameras - adopt it
+                occupancy_tracker.entered(entity.camera_id, entity.object_type, entity.first_seen)
+        changed = len(entities) + len(kept) != len(self.entities) or any(
+            (old := self.entities.get(entity_id)) is None or old.to_dict() != entity.to_dict()
+            for entity_id, entity in entities.items()
+        )
+        entities.update(kept)
+        self.entities = entities
+        self.dirty &= set(kept)
+        self.synced = marker
+
+        if fresh is None:
+            # Only owners count occupancy
+            occupancy_tracker.reset(self.owned())
+            if self.cameras != set() or not self.running:
+                print(f"🧠 Loaded {len(self.entities)} live entities")
+        return changed
+
+    def _sync_marker(self) -> Tuple[int, Optional[int], datetime]:
+        """What a read starting now is up to date with."""
+        return resource_versions.baseline, resource_versions.versions.get("entities"), datetime.utcnow()
+
+    async def refresh(self) -> bool:
+        """
+        Re-read entities changed since the last load or refresh.
+
+        Skipped while no process has announced an entity change. After the
+        listener reconnects (announcements may have been missed) it falls
+        back to a full load.
+
+        Returns:
+            True if anything we hold changed
+        """
+        marker = self._sync_marker()
+        if self.synced is None or marker[0] != self.synced[0]:
+            return await self.load(fresh=set())
+        if resource_versions.shared and marker[1] == self.synced[1]:
+            return False
+
+        since = self.synced[2] - timedelta(seconds=settings.LIVE_STATE_SYNC_OVERLAP_SECONDS)
+        async with AsyncSessionLocal() as db:
+            try:
+                result = await db.execute(select(Entity).where(Entity.updated_at >= since))
+                rows = list(result.scalars())
+            except Exception as e:
+                print(f"❌ Failed to refresh live entities: {e}")
+                return False
+
+        changed = False
+        for row in rows:
+            current = self.entities.get(row.entity_id)
+            owned = self.owns(row.camera_id)
+            if owned and current is not None:
+                continue  # Ours - memory is authoritative
+            if not row.is_active:
+                if current is not None:
+                    del self.entities[row.entity_id]
+                    changed = True
+                continue
+
+            entity = LiveEntity.from_model(
+                row,
+                row.latitude if row.latitude is not None else 0.0,
+                row.longitude if row.longitude is not None else 0.0,
+            )
+            if current is not None and current.to_dict() == entity.to_dict():
+                continue
+            self.entities[row.entity_id] = entity
+            changed = True
+            if owned:
+                # Created elsewhere on one of our cameras - adopt it
+                occupancy_tracker.entered(entity.camera_id, entity.object_type, entity.first_seen)
+
+        self.synced = marker
+        return changed
+
+    def add(self, entity: LiveEntity):
+        """Track an entity that was just inserted."""
+        self.entities[entity.entity_id] = entity
+        if self.owns(entity.camera_id):
+            occupancy_tracker.entered(entity.camera_id, entity.object_type, entity.first_seen)
+
+    def get(self, entity_id: str) -> Optional[LiveEntity]:
+        return self.entities.get(entity_id)
+
+    def active(self) -> List[LiveEntity]:
+        """All currently active entities."""
+        return [e for e in self.entities.values() if e.is_active]
+
+    def owned(self) -> List[LiveEntity]:
+        """Active entities on cameras we own."""
+        return [e for e in self.entities.values() if e.is_active and self.owns(e.camera_id)]
+
+    def move(
+        self,
+        entity_id: str,
+        latitude: float,
+        longitude: float,
+        seen_at: Optional[datetime] = None,
+        mark_dirty: bool = True
+    ) -> Optional[LiveEntity]:
+        """Update an entity's position in memory."""
+        entity = self.entities.get(entity_id)
+        if entity is None:
+            return None
+
+        entity.latitude = latitude
+        entity.longitude = longitude
+        entity.last_seen = seen_at or datetime.utcnow()
+        if mark_dirty:
+            self.dirty.add(entity_id)
+        return entity
+
+    def recognize(self, entity_id: str, name: Optional[str]):
+        """Set (or clear) who an entity was recognized as."""
+        entity = self.entities.get(entity_id)
+        if entity is None or entity.recognized_as == name:
+            return
+        entity.is_recognized = name is not None
+        entity.recognized_as = name
+        self.dirty.add(entity_id)
+
+    def deactivate(self, entity_id: str):
+        """Mark an entity inactive; it leaves the store on the next flush."""
+        entity = self.entities.get(entity_id)
+        if entity is not None and entity.is_active:
+            entity.is_active = False
+            self.dirty.add(entity_id)
+            if self.owns(entity.camera_id):
+                occupancy_tracker.exited(
+                    entity.camera_id, entity.object_type, entity.first_seen, entity.last_seen
+                )
+
+    def stale(self, cutoff: datetime) -> List[str]:
+        """IDs of owned active entities not seen since cutoff."""
+        return [e.entity_id for e in self.owned() if e.last_seen < cutoff]
+
+    async def flush(self) -> bool:
+        """
+        Write all dirty entities in one batched UPDATE.
+
+        Returns:
+            True on success (or nothing to do), False if the write failed
+        """
+        if not self.dirty:
+            return True
+
+        pending = self.dirty
+        self.dirty = set()
+
+        rows = []
+        for entity_id in pending:
+            entity = self.entities.get(entity_id)
+            if entity is None:
+                continue
+            rows.append({
+                "id": entity.id,
+                "location": WKTElement(f'POINT({entity.longitude} {entity.latitude})', srid=4326),
+                "last_seen": entity.last_seen,
+                "is_active": entity.is_active,
+                "is_recognized": entity.is_recognized,
+                "recognized_as": entity.recognized_as,
+                "updated_at": datetime.utcnow(),
+            })
+        if not rows:
+            return True  # Dirty entities were all dropped meanwhile
+
+        flushed = False
+        async with AsyncSessionLocal() as db:
+            try:
+                # ORM bulk UPDATE by primary key -> a single executemany
+                await db.execute(update(Entity), rows)
+                await db.commit()
+                flushed = True
+            except Exception as e:
+                print(f"❌ Failed to flush live entities: {e}")
+                await db.rollback()
+            finally:
+                if not flushed:
+                    self.dirty |= pending  # Try again next interval
+
+        if not flushed:
+            return False
+
+        # Inactive entities are now safely persisted - drop them
+        for entity_id in pending:
+            entity = self.entities.get(entity_id)
+            if entity is not None and not entity.is_active:
+                del self.entities[entity_id]
+
+        resource_versions.bump("entities")
+        print(f"💾 Flushed {len(rows)} live entities")
+        return True
+
+    async def _sync_loop(self):
+        while self.running:
+            await asyncio.sleep(settings.LIVE_STATE_FLUSH_SECONDS)
+            if self.cameras != set():
+                await self.flush()
+                await occupancy_tracker.flush()
+            if self.cameras is not None and await self.refresh():
+                # Only our copy changed - the owners already announced their writes
+                resource_versions.bump("entities", publish=False)
+
+
+# Global live state instance
+live_state = LiveEntityStore()
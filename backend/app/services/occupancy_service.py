@@ -0,0 +1,245 @@
+"""
+Occupancy Service
+
+Dwell-time histograms and concurrent-occupancy counts per camera and
+object type.
+
+The tracker is fed by the live entity store as entities appear and
+expire, keeps running totals in memory and adds them onto
+occupancy_hourly / dwell_daily with upserts on every write-behind flush.
+Reads only touch the summary rows for the requested range, never the
+entities table, so they cost the same however much history there is.
+"""
+
+import bisect
+from collections import Counter
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.occupancy import DwellDaily, OccupancyHourly
+
+HourKey = Tuple[datetime, int, str]  # (hour, camera_id, object_type)
+DwellKey = Tuple[date, int, str, int]  # (day, camera_id, object_type, bucket)
+
+
+def _hour(at: datetime) -> datetime:
+    return at.replace(minute=0, second=0, microsecond=0)
+
+
+def dwell_bucket(seconds: float) -> int:
+    """Histogram bucket for a dwell time (last bucket = longer than all bounds)."""
+    return bisect.bisect_left(settings.DWELL_BUCKETS_SECONDS, seconds)
+
+
+class OccupancyTracker:
+    def __init__(self):
+        self.current: Counter = Counter()  # (camera_id, object_type) -> entities now
+        self.hourly: Dict[HourKey, List[int]] = {}  # -> [entered, exited, peak]
+        self.dwell: Dict[DwellKey, List[float]] = {}  # -> [count, total_seconds]
+
+    def reset(self, entities: Iterable):
+        """Recount who is in view now (entities are LiveEntity-like)."""
+        self.current = Counter(
+            (e.camera_id, e.object_type) for e in entities if e.is_active
+        )
+
+    def _hour_totals(self, hour: datetime, camera_id: int, object_type: str) -> List[int]:
+        key = (hour, camera_id, object_type)
+        totals = self.hourly.get(key)
+        if totals is None:
+            # Whoever is still in view counts towards the new hour's peak
+            totals = self.hourly[key] = [0, 0, self.current[(camera_id, object_type)]]
+        return totals
+
+    def entered(self, camera_id: int, object_type: str, at: datetime):
+        """An entity appeared."""
+        self.current[(camera_id, object_type)] += 1
+        totals = self._hour_totals(_hour(at), camera_id, object_type)
+        totals[0] += 1
+        totals[2] = max(totals[2], self.current[(camera_id, object_type)])
+
+    def exited(self, camera_id: int, object_type: str, first_seen: datetime, last_seen: datetime):
+        """An entity expired after being in view from first_seen to last_seen."""
+        key = (camera_id, object_type)
+        self.current[key] = max(self.current[key] - 1, 0)
+        totals = self._hour_totals(_hour(last_seen), camera_id, object_type)
+        totals[1] += 1
+
+        seconds = max((last_seen - first_seen).total_seconds(), 0.0)
+        bucket = self.dwell.setdefault(
+            (last_seen.date(), camera_id, object_type, dwell_bucket(seconds)), [0, 0.0]
+        )
+        bucket[0] += 1
+        bucket[1] += seconds
+
+    async def flush(self) -> bool:
+        """
+        Add the accumulated totals onto the summary tables.
+
+        Returns:
+            True on success (or nothing to do), False if the write failed
+        """
+        # Hours with nothing happening still need their occupancy recorded
+        hour = _hour(datetime.utcnow())
+        for (camera_id, object_type), count in self.current.items():
+            if count:
+                self._hour_totals(hour, camera_id, object_type)
+
+        if not self.hourly and not self.dwell:
+            return True
+
+        hourly, self.hourly = self.hourly, {}
+        dwell, self.dwell = self.dwell, {}
+        now = datetime.utcnow()
+
+        async with AsyncSessionLocal() as db:
+            try:
+                if hourly:
+                    stmt = insert(OccupancyHourly)
+                    stmt = stmt.on_conflict_do_update(
+                        constraint="uq_occupancy_hourly_key",
+                        set_={
+                            "entered": OccupancyHourly.entered + stmt.excluded.entered,
+                            "exited": OccupancyHourly.exited + stmt.excluded.exited,
+                            "peak": func.greatest(OccupancyHourly.peak, stmt.excluded.peak),
+                            "updated_at": stmt.excluded.updated_at,
+                        },
+                    )
+                    await db.execute(stmt, [
+                        {
+                            "hour": key[0], "camera_id": key[1], "object_type": key[2],
+                            "entered": entered, "exited": exited, "peak": peak,
+                            "created_at": now, "updated_at": now,
+                        }
+                        for key, (entered, exited, peak) in hourly.items()
+                    ])
+
+                if dwell:
+                    stmt = insert(DwellDaily)
+                    stmt = stmt.on_conflict_do_update(
+                        constraint="uq_dwell_daily_key",
+                        set_={
+                            "count": DwellDaily.count + stmt.excluded.count,
+                            "total_seconds": DwellDaily.total_seconds + stmt.excluded.total_seconds,
+                            "updated_at": stmt.excluded.updated_at,
+                        },
+                    )
+                    await db.execute(stmt, [
+                        {
+                            "day": key[0], "camera_id": key[1], "object_type": key[2],
+                            "bucket": key[3], "count": count, "total_seconds": total,
+                            "created_at": now, "updated_at": now,
+                        }
+                        for key, (count, total) in dwell.items()
+                    ])
+
+                await db.commit()
+                return True
+            except Exception as e:
+                print(f"❌ Failed to flush occupancy analytics: {e}")
+                await db.rollback()
+                self._restore(hourly, dwell)
+                return False
+
+    def _restore(self, hourly: Dict[HourKey, List[int]], dwell: Dict[DwellKey, List[float]]):
+        """Merge unwritten totals back so the next flush retries them."""
+        for key, (entered, exited, peak) in hourly.items():
+            totals = self.hourly.setdefault(key, [0, 0, 0])
+            totals[0] += entered
+            totals[1] += exited
+            totals[2] = max(totals[2], peak)
+        for key, (count, total) in dwell.items():
+            bucket = self.dwell.setdefault(key, [0, 0.0])
+            bucket[0] += count
+            bucket[1] += total
+
+
+class OccupancyService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_occupancy(
+        self,
+        start: datetime,
+        end: datetime,
+        camera_id: Optional[int] = None,
+        object_type: Optional[str] = None
+    ) -> List[OccupancyHourly]:
+        """Hourly rows in [start, end), oldest first."""
+        query = select(OccupancyHourly).where(
+            OccupancyHourly.hour >= _hour(start),
+            OccupancyHourly.hour < end,
+        )
+        if camera_id is not None:
+            query = query.where(OccupancyHourly.camera_id == camera_id)
+        if object_type is not None:
+            query = query.where(OccupancyHourly.object_type == object_type)
+
+        result = await self.db.execute(
+            query.order_by(OccupancyHourly.hour, OccupancyHourly.camera_id, OccupancyHourly.object_type)
+        )
+        return list(result.scalars())
+
+    async def get_dwell(
+        self,
+        start: date,
+        end: date,
+        camera_id: Optional[int] = None,
+        object_type: Optional[str] = None
+    ) -> dict:
+        """
+        Dwell-time histogram over the days in [start, end].
+
+        Returns:
+            buckets (upper bound in seconds, None = longer), count,
+            average_seconds and bucket-resolution p50/p90 upper bounds
+        """
+        query = select(
+            DwellDaily.bucket,
+            func.sum(DwellDaily.count).label("count"),
+            func.sum(DwellDaily.total_seconds).label("total_seconds"),
+        ).where(
+            DwellDaily.day >= start,
+            DwellDaily.day <= end,
+        )
+        if camera_id is not None:
+            query = query.where(DwellDaily.camera_id == camera_id)
+        if object_type is not None:
+            query = query.where(DwellDaily.object_type == object_type)
+
+        result = await self.db.execute(query.group_by(DwellDaily.bucket))
+        sums = {row.bucket: (int(row.count), float(row.total_seconds)) for row in result}
+
+        bounds = list(settings.DWELL_BUCKETS_SECONDS) + [None]
+        counts = [sums.get(n, (0, 0.0))[0] for n in range(len(bounds))]
+        total = sum(counts)
+        total_seconds = sum(seconds for _, seconds in sums.values())
+
+        def percentile(p: float) -> Optional[int]:
+            running = 0
+            for bound, count in zip(bounds, counts):
+                running += count
+                if running >= p * total:
+                    return bound
+            return None
+
+        return {
+            "buckets": [
+                {"le_seconds": bound, "count": count}
+                for bound, count in zip(bounds, counts)
+            ],
+            "count": total,
+            "average_seconds": total_seconds / total if total else None,
+            "p50_le_seconds": percentile(0.5) if total else None,
+            "p90_le_seconds": percentile(0.9) if total else None,
+        }
+
+
+# Global occupancy tracker instance
+occupancy_tracker = OccupancyTracker()
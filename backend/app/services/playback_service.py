@@ -0,0 +1,116 @@
+"""
+Playback Service
+
+Rebuilds the scene at any past moment from the playback store.
+
+A lookup reads the latest keyframe at or before the moment and replays
+the deltas recorded since then - at most PLAYBACK_KEYFRAME_SECONDS of
+ticks - so it costs the same for five minutes ago as for last week.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from sqlalchemy import literal, select, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.playback import PlaybackDelta, PlaybackKeyframe
+
+Scene = Dict[str, list]  # entity_id -> [latitude, longitude, object_type, camera_id]
+
+
+def apply_delta(scene: Scene, changes: Dict[str, Any]):
+    """Apply one tick's changes to a scene in place."""
+    for entity_id in changes.get("removed", ()):
+        scene.pop(entity_id, None)
+    for entity_id, row in changes.get("added", {}).items():
+        scene[entity_id] = list(row)
+    for entity_id, (latitude, longitude) in changes.get("moved", {}).items():
+        row = scene.get(entity_id)
+        if row is not None:
+            row[0], row[1] = latitude, longitude
+
+
+class PlaybackService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def scene_at(self, at: datetime) -> Optional[Tuple[datetime, Scene]]:
+        """
+        Scene as it was at `at`.
+
+        Returns:
+            (keyframe time, scene), or None if nothing was recorded by then
+        """
+        result = await self.db.execute(
+            select(PlaybackKeyframe.ts, PlaybackKeyframe.entities)
+            .where(PlaybackKeyframe.ts <= at)
+            .order_by(PlaybackKeyframe.ts.desc())
+            .limit(1)
+        )
+        keyframe = result.first()
+        if keyframe is None:
+            return None
+
+        scene = {entity_id: list(row) for entity_id, row in keyframe.entities.items()}
+        result = await self.db.execute(
+            select(PlaybackDelta.changes)
+            .where(PlaybackDelta.ts > keyframe.ts, PlaybackDelta.ts <= at)
+            .order_by(PlaybackDelta.ts)
+        )
+        for changes in result.scalars():
+            apply_delta(scene, changes)
+        return keyframe.ts, scene
+
+
+async def stream_frames(start: datetime, end: datetime, speed: float) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Frames from start to end, paced at `speed` times real time.
+
+    The first frame is the full scene at start; after that every recorded
+    tick in (start, end] follows in order - a "delta" frame, or a "scene"
+    frame where the recorder wrote a keyframe. Gaps in the recording are
+    skipped rather than waited out.
+
+    Frames are read a page at a time by (ts, type), each page in its own
+    short session, so no connection is held while the stream is paced.
+    """
+    async with AsyncSessionLocal() as db:
+        found = await PlaybackService(db).scene_at(start)
+    yield {"type": "scene", "ts": start, "entities": found[1] if found else {}}
+
+    frames = union_all(
+        select(PlaybackDelta.ts, literal("delta").label("type"), PlaybackDelta.changes.label("data"))
+        .where(PlaybackDelta.ts > start, PlaybackDelta.ts <= end),
+        select(PlaybackKeyframe.ts, literal("scene").label("type"), PlaybackKeyframe.entities.label("data"))
+        .where(PlaybackKeyframe.ts > start, PlaybackKeyframe.ts <= end),
+    ).subquery()
+    page = (
+        select(frames.c.ts, frames.c.type, frames.c.data)
+        .order_by(frames.c.ts, frames.c.type)
+        .limit(settings.PLAYBACK_PAGE_SIZE)
+    )
+
+    previous = start
+    last = None  # (ts, type) of the last frame read
+    while True:
+        statement = page if last is None else page.where(tuple_(frames.c.ts, frames.c.type) > last)
+        async with AsyncSessionLocal() as db:
+            rows = (await db.execute(statement)).mappings().all()
+        if not rows:
+            return
+        last = (rows[-1]["ts"], rows[-1]["type"])
+
+        for row in rows:
+            wait = min((row["ts"] - previous).total_seconds(), settings.PLAYBACK_KEYFRAME_SECONDS)
+            if wait > 0:
+                await asyncio.sleep(wait / speed)
+            previous = row["ts"]
+
+            if row["type"] == "scene":
+                yield {"type": "scene", "ts": row["ts"], "entities": row["data"]}
+            else:
+                yield {"type": "delta", "ts": row["ts"], "changes": row["data"]}
@@ -0,0 +1,122 @@
+"""
+Request Profiling
+
+Opt-in cProfile of single requests, for finding out why an endpoint is
+slow in production without redeploying.
+
+A request is profiled when it carries the admin DEBUG_TOKEN, either as
+an X-Profile header or a ?profile= query parameter. The response gets an
+X-Profile-Id header; the profile (top PROFILE_LINES functions by
+cumulative time) is kept in memory for GET /debug/profiles/{id}.
+
+The middleware is only installed when DEBUG_TOKEN is set, so there's no
+overhead at all otherwise. One request is profiled at a time; cProfile
+sees the whole thread, so anything else the event loop runs meanwhile
+shows up in the profile too.
+"""
+
+import cProfile
+import hmac
+import io
+import pstats
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs
+
+from app.config import settings
+
+
+def is_admin_token(value: Optional[str]) -> bool:
+    """Does value match DEBUG_TOKEN? (never true without one configured)"""
+    return bool(value) and hmac.compare_digest(value, settings.DEBUG_TOKEN)
+
+
+class ProfileStore:
+    def __init__(self):
+        self.profiles: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self.next_id = 1
+        self.active = False  # A request is being profiled
+
+    def reserve(self) -> int:
+        profile_id = self.next_id
+        self.next_id += 1
+        return profile_id
+
+    def add(self, profile_id: int, request: str, status: Optional[int], duration_ms: float, profiler: cProfile.Profile):
+        out = io.StringIO()
+        stats = pstats.Stats(profiler, stream=out)
+        stats.sort_stats("cumulative").print_stats(settings.PROFILE_LINES)
+
+        self.profiles[profile_id] = {
+            "id": profile_id,
+            "at": datetime.utcnow(),
+            "request": request,
+            "status": status,
+            "duration_ms": round(duration_ms, 1),
+            "stats": out.getvalue(),
+        }
+        while len(self.profiles) > settings.PROFILE_KEEP:
+            self.profiles.popitem(last=False)
+
+    def get(self, profile_id: int) -> Optional[Dict[str, Any]]:
+        return self.profiles.get(profile_id)
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        """Newest first, without the stats text."""
+        return [
+            {key: value for key, value in profile.items() if key != "stats"}
+            for profile in reversed(self.profiles.values())
+        ]
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that profiles requests carrying the admin token."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def _requested(self, scope) -> bool:
+        for name, value in scope["headers"]:
+            if name == b"x-profile":
+                return is_admin_token(value.decode("latin-1"))
+        if b"profile=" in scope["query_string"]:
+            query = parse_qs(scope["query_string"].decode("latin-1"))
+            return is_admin_token(query.get("profile", [None])[0])
+        return False
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or profile_store.active or not self._requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = profile_store.reserve()
+        status = None
+
+        async def send_with_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", str(profile_id).encode())
+                ]
+            await send(message)
+
+        profiler = cProfile.Profile()
+        profile_store.active = True
+        started = time.perf_counter()
+        profiler.enable()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            profiler.disable()
+            profile_store.active = False
+            duration_ms = (time.perf_counter() - started) * 1000
+            request = f"{scope['method']} {scope['path']}"
+            profile_store.add(profile_id, request, status, duration_ms, profiler)
+            print(f"⏱️ Profiled {request} ({duration_ms:.0f}ms) as #{profile_id}")
+
+
+# Global profile store instance
+profile_store = ProfileStore()
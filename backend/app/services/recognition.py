@@ -0,0 +1,120 @@
+"""
+Recognition
+
+Matches tracks against the known-identity gallery.
+
+Active gallery vectors are held as one normalized NumPy matrix, so a
+batch of queries is a single matrix product. Results are cached per
+track: a track is recognized once and only re-checked every
+RECOGNITION_RECHECK_SECONDS, not on every frame.
+
+The matrix reloads whenever the "gallery" resource version changes
+(bumped by GalleryService in any process), without a restart.
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+
+from app.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.known_identity import KnownIdentity
+from app.services.reid import DESCRIPTOR_SIZE
+from app.services.versions import resource_versions
+
+Result = Optional[Tuple[int, str, float]]  # (identity id, name, similarity)
+
+
+class Recognizer:
+    def __init__(self):
+        self.matrix = np.zeros((0, DESCRIPTOR_SIZE), dtype=np.float32)
+        self.ids: List[int] = []
+        self.names: List[str] = []
+        self.object_types = np.array([], dtype=object)
+        self.version: Optional[str] = None  # Gallery version the matrix was built from
+        self.cache: Dict[str, Tuple[Result, float]] = {}  # track -> (result, checked at)
+
+    async def refresh_if_changed(self):
+        """Reload the gallery if it changed since the last load."""
+        version = resource_versions.get("gallery")
+        if version == self.version:
+            return
+
+        async with AsyncSessionLocal() as db:
+            try:
+                result = await db.execute(
+                    select(KnownIdentity).where(KnownIdentity.is_active == True)
+                )
+                identities = [
+                    identity for identity in result.scalars()
+                    if len(identity.features) == DESCRIPTOR_SIZE
+                ]
+            except Exception as e:
+                print(f"❌ Failed to load recognition gallery: {e}")
+                return
+
+        matrix = np.array([identity.features for identity in identities], dtype=np.float32)
+        matrix = matrix.reshape(len(identities), DESCRIPTOR_SIZE)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        self.matrix = matrix / np.where(norms > 0, norms, 1.0)
+        self.ids = [identity.id for identity in identities]
+        self.names = [identity.name for identity in identities]
+        self.object_types = np.array([identity.object_type for identity in identities], dtype=object)
+        self.version = version
+        self.cache.clear()  # Everyone gets checked against the new gallery
+        print(f"🪪 Loaded {len(identities)} known identities")
+
+    def due(self, track: str, now: Optional[float] = None) -> bool:
+        """Does this track need (re)checking?"""
+        cached = self.cache.get(track)
+        if cached is None:
+            return True
+        now = now or time.monotonic()
+        return now - cached[1] >= settings.RECOGNITION_RECHECK_SECONDS
+
+    def recognize(self, queries: List[Tuple[str, np.ndarray, str]]) -> List[Result]:
+        """
+        Match a batch of (track, descriptor, object_type) against the gallery.
+
+        Tracks with a fresh cached result are not matched again.
+
+        Returns:
+            Per query: (identity id, name, similarity) or None
+        """
+        now = time.monotonic()
+        results: List[Result] = [None] * len(queries)
+        pending = []
+        for n, (track, _, _) in enumerate(queries):
+            if self.due(track, now):
+                pending.append(n)
+            else:
+                results[n] = self.cache[track][0]
+
+        if pending and len(self.ids):
+            batch = np.stack([queries[n][1] for n in pending])
+            norms = np.linalg.norm(batch, axis=1, keepdims=True)
+            similarity = (batch / np.where(norms > 0, norms, 1.0)) @ self.matrix.T
+
+            # Only compare against identities of the same object type
+            kinds = np.array([queries[n][2] for n in pending], dtype=object)
+            similarity[kinds[:, None] != self.object_types[None, :]] = -np.inf
+
+            best = np.argmax(similarity, axis=1)
+            scores = similarity[np.arange(len(pending)), best]
+            for n, row, score in zip(pending, best, scores):
+                if score >= settings.RECOGNITION_MIN_SIMILARITY:
+                    results[n] = (self.ids[row], self.names[row], float(score))
+
+        for n in pending:
+            self.cache[queries[n][0]] = (results[n], now)
+        return results
+
+    def forget(self, track: str):
+        """Drop a finished track's cached result."""
+        self.cache.pop(track, None)
+
+
+# Global recognizer instance
+recognizer = Recognizer()
@@ -0,0 +1,196 @@
+"""
+Re-Identification
+
+Links a new track to a recent track of the same object on a nearby camera,
+so someone walking from the driveway camera to the porch camera shows up
+as one linked identity instead of two unrelated entities.
+
+Each track gets a compact appearance descriptor (a normalized HSV color
+histogram of its crop - CPU only). Recent descriptors live in a
+preallocated NumPy matrix; a batch of new tracks is matched against all
+of them with a single matrix product, masked by time window and camera
+adjacency. Live tracks always match; ended ones for REID_WINDOW_SECONDS
+after they ended, then they are evicted.
+"""
+
+import math
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+
+# Histogram bins for hue, saturation and value
+HIST_BINS = (8, 4, 4)
+DESCRIPTOR_SIZE = HIST_BINS[0] * HIST_BINS[1] * HIST_BINS[2]
+
+EARTH_RADIUS_M = 6371000.0
+
+
+def appearance_descriptor(crop: np.ndarray) -> np.ndarray:
+    """
+    Appearance descriptor of an RGB crop (H x W x 3, uint8).
+
+    Returns:
+        Unit-length float32 vector; the dot product of two descriptors is
+        their similarity (1.0 = identical color distribution)
+    """
+    rgb = crop.reshape(-1, 3).astype(np.float32) / 255.0
+    r, g, b = rgb[:, 0], rgb[:, 1], rgb[:, 2]
+    high = rgb.max(axis=1)
+    low = rgb.min(axis=1)
+    spread = high - low
+    safe = np.where(spread > 0, spread, 1.0)
+
+    # RGB -> HSV, hue in [0, 1)
+    hue = np.where(
+        high == r, ((g - b) / safe) % 6,
+        np.where(high == g, (b - r) / safe + 2, (r - g) / safe + 4)
+    ) / 6.0
+    hue = np.where(spread > 0, hue, 0.0)
+    saturation = np.where(high > 0, spread / np.where(high > 0, high, 1.0), 0.0)
+
+    h_bins, s_bins, v_bins = HIST_BINS
+    h = np.minimum((hue * h_bins).astype(np.int32), h_bins - 1)
+    s = np.minimum((saturation * s_bins).astype(np.int32), s_bins - 1)
+    v = np.minimum((high * v_bins).astype(np.int32), v_bins - 1)
+
+    histogram = np.bincount((h * s_bins + s) * v_bins + v, minlength=DESCRIPTOR_SIZE)
+    # Square root (Hellinger) keeps dominant colors from swamping the rest
+    descriptor = np.sqrt(histogram.astype(np.float32))
+    norm = np.linalg.norm(descriptor)
+    return descriptor / norm if norm > 0 else descriptor
+
+
+class ReIdIndex:
+    """
+    Recent track descriptors, one row per track.
+
+    Rows are preallocated; free rows are marked invalid and reused. Each
+    row carries the track's entity ID, its identity (the first entity in
+    its chain of links), camera, last-seen time and whether it is still
+    live (not ended yet).
+    """
+
+    def __init__(self, capacity: int = settings.REID_MAX_TRACKS):
+        self.capacity = capacity
+        self.vectors = np.zeros((capacity, DESCRIPTOR_SIZE), dtype=np.float32)
+        self.seen = np.zeros(capacity, dtype=np.float64)  # Epoch seconds
+        self.camera_index = np.full(capacity, -1, dtype=np.int32)
+        self.entity_ids = np.zeros(capacity, dtype=np.int64)
+        self.identities = np.zeros(capacity, dtype=np.int64)
+        self.valid = np.zeros(capacity, dtype=bool)
+        self.live = np.zeros(capacity, dtype=bool)  # Track hasn't ended - never evicted
+        self.rows: Dict[int, int] = {}  # entity id -> row
+
+        self.cameras: Dict[int, int] = {}  # camera id -> adjacency index
+        # Last row/column stands for unknown cameras (index -1): never adjacent
+        self.adjacency = np.zeros((1, 1), dtype=bool)
+
+    def set_cameras(self, cameras: Iterable[dict]):
+        """
+        Work out which cameras are near each other.
+
+        Cameras need id, latitude and longitude. Two cameras are adjacent
+        if they're within REID_CAMERA_RADIUS_M of each other (a camera is
+        not adjacent to itself - that's the tracker's job).
+        """
+        cameras = list(cameras)
+        old = {index: camera_id for camera_id, index in self.cameras.items()}
+        self.cameras = {camera['id']: n for n, camera in enumerate(cameras)}
+
+        lat = np.radians([camera['latitude'] for camera in cameras])
+        lon = np.radians([camera['longitude'] for camera in cameras])
+        # Haversine distance between every pair
+        dlat = lat[:, None] - lat[None, :]
+        dlon = lon[:, None] - lon[None, :]
+        a = np.sin(dlat / 2) ** 2 + np.cos(lat[:, None]) * np.cos(lat[None, :]) * np.sin(dlon / 2) ** 2
+        distance = 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+        adjacency = distance <= settings.REID_CAMERA_RADIUS_M
+        np.fill_diagonal(adjacency, False)
+        self.adjacency = np.zeros((len(cameras) + 1, len(cameras) + 1), dtype=bool)
+        self.adjacency[:-1, :-1] = adjacency
+
+        # Re-point stored rows at the new camera indexes
+        for row in np.flatnonzero(self.valid):
+            camera_id = old.get(int(self.camera_index[row]))
+            self.camera_index[row] = self.cameras.get(camera_id, -1)
+
+    def _current(self, now: float) -> np.ndarray:
+        """Rows that can still be matched: live, or ended within the window."""
+        return self.valid & (self.live | (self.seen >= now - settings.REID_WINDOW_SECONDS))
+
+    def evict(self, now: Optional[float] = None):
+        """Drop tracks that ended longer than the window ago."""
+        now = now or time.time()
+        expired = self.valid & ~self._current(now)
+        for row in np.flatnonzero(expired):
+            del self.rows[int(self.entity_ids[row])]
+        self.valid &= ~expired
+
+    def add(self, entity_id: int, camera_id: int, descriptor: np.ndarray, identity: Optional[int] = None, seen: Optional[float] = None):
+        """Remember a track (identity defaults to the track itself)."""
+        row = self.rows.get(entity_id)
+        if row is None:
+            free = np.flatnonzero(~self.valid)
+            if not len(free):
+                self.evict()
+                free = np.flatnonzero(~self.valid)
+            if len(free):
+                row = int(free[0])
+            else:
+                # Full of fresh tracks - replace the stalest, ended ones first
+                row = int(np.argmin(np.where(self.live, np.inf, self.seen)))
+                if self.live[row]:
+                    row = int(np.argmin(self.seen))
+                del self.rows[int(self.entity_ids[row])]
+
+        self.vectors[row] = descriptor
+        self.seen[row] = seen or time.time()
+        self.camera_index[row] = self.cameras.get(camera_id, -1)
+        self.entity_ids[row] = entity_id
+        self.identities[row] = identity if identity is not None else entity_id
+        self.valid[row] = True
+        self.live[row] = True
+        self.rows[entity_id] = row
+
+    def end(self, entity_id: int, seen: Optional[float] = None):
+        """Track ended (last seen at `seen`) - its window starts now."""
+        row = self.rows.get(entity_id)
+        if row is not None:
+            self.seen[row] = seen or time.time()
+            self.live[row] = False
+
+    def match(self, queries: List[Tuple[np.ndarray, int]], now: Optional[float] = None) -> List[Optional[Tuple[int, float]]]:
+        """
+        Best recent match on a nearby camera for each (descriptor, camera_id).
+
+        Returns:
+            Per query: (identity, similarity), or None below REID_MIN_SIMILARITY
+        """
+        if not queries:
+            return []
+        now = now or time.time()
+
+        # Query camera -> which stored rows are on an adjacent camera
+        query_cameras = np.array([self.cameras.get(camera_id, -1) for _, camera_id in queries])
+        allowed = self.adjacency[query_cameras[:, None], self.camera_index[None, :]]
+        allowed &= self._current(now)[None, :]
+
+        # Cosine similarity of every query with every stored track
+        batch = np.stack([descriptor for descriptor, _ in queries])
+        similarity = batch @ self.vectors.T
+        similarity[~allowed] = -math.inf
+
+        best = np.argmax(similarity, axis=1)
+        scores = similarity[np.arange(len(queries)), best]
+        return [
+            (int(self.identities[row]), float(score)) if score >= settings.REID_MIN_SIMILARITY else None
+            for row, score in zip(best, scores)
+        ]
+
+
+# Global re-identification index instance
+reid_index = ReIdIndex()
@@ -0,0 +1,48 @@
+"""
+Sharding
+
+Consistent hashing of cameras onto workers.
+
+Every worker is placed on a hash ring at WORKER_VNODES points; a camera
+belongs to the first worker point at or after its own hash. When a
+worker joins it only takes over the arcs in front of its points, and
+when one leaves only its cameras move - about 1/N of them either way,
+instead of nearly all of them as with camera_id % N.
+
+Hashes are blake2b, so every process computes the same assignment from
+the same list of workers.
+"""
+
+import bisect
+import hashlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.config import settings
+
+
+def _hash(key: str) -> int:
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    def __init__(self, workers: Iterable[str], vnodes: int = settings.WORKER_VNODES):
+        points: List[Tuple[int, str]] = sorted(
+            (_hash(f"{worker}#{n}"), worker)
+            for worker in set(workers)
+            for n in range(vnodes)
+        )
+        self.hashes = [point for point, _ in points]
+        self.workers = [worker for _, worker in points]
+
+    def owner(self, camera_id: int) -> Optional[str]:
+        """Worker a camera belongs to (None without workers)."""
+        if not self.hashes:
+            return None
+        n = bisect.bisect_left(self.hashes, _hash(f"camera:{camera_id}"))
+        return self.workers[n % len(self.workers)]
+
+
+def assign(workers: Iterable[str], camera_ids: Iterable[int]) -> Dict[int, Optional[str]]:
+    """camera_id -> worker_id for every camera."""
+    ring = HashRing(workers)
+    return {camera_id: ring.owner(camera_id) for camera_id in camera_ids}
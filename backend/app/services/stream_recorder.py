@@ -0,0 +1,90 @@
+"""
+Stream Recorder
+
+Captures the detection stream entering the system, so a run (or an
+incident) can be replayed later with `python -m app.workers.replay`.
+
+With STREAM_RECORD_DIR set, every process appends what it ingests to its
+own gzipped NDJSON file there, one record per line:
+
+    {"t": capture time, "type": "entity", "camera_id", "entity_id", "object_type", "latitude", "longitude", "confidence"}
+    {"t": ..., "type": "move", "entity_id", "latitude", "longitude"}
+    {"t": ..., "type": "lost", "entity_id"}
+    {"t": ..., "type": "event", "camera_id", "event_type", "confidence", "metadata"}
+
+Records are buffered and written every STREAM_RECORD_FLUSH_SECONDS; each
+write is a separate gzip member, so a crash loses at most one interval
+and the file stays readable.
+"""
+
+import asyncio
+import gzip
+import os
+from datetime import datetime
+from typing import List, Optional
+
+import orjson
+
+from app.config import settings
+
+
+def _append(path: str, lines: List[bytes]):
+    """Compress and append lines (runs in a thread)."""
+    with gzip.open(path, "ab") as f:
+        f.writelines(lines)
+
+
+class StreamRecorder:
+    def __init__(self):
+        self.path: Optional[str] = None  # None = not recording
+        self.buffer: List[bytes] = []
+        self.recorded = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self, name: str):
+        """Start recording to a new file for this process (if enabled)."""
+        if not settings.STREAM_RECORD_DIR or self.path is not None:
+            return
+        os.makedirs(settings.STREAM_RECORD_DIR, exist_ok=True)
+        stamp = datetime.utcnow().strftime("%Y%m%dT%H%M%S")
+        safe_name = "".join(c if c.isalnum() or c in "-_" else "-" for c in name)
+        self.path = os.path.join(settings.STREAM_RECORD_DIR, f"{safe_name}-{stamp}.ndjson.gz")
+        self._task = asyncio.create_task(self._flush_loop())
+        print(f"⏺️ Recording detection stream to {self.path}")
+
+    async def stop(self):
+        """Write out what's buffered and close the recording."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self.path is not None:
+            await self.flush()
+            print(f"⏹️ Recorded {self.recorded} stream records to {self.path}")
+            self.path = None
+
+    def record(self, kind: str, at: Optional[datetime] = None, **fields):
+        """Add one record (no-op unless recording)."""
+        if self.path is None:
+            return
+        fields["t"] = at or datetime.utcnow()
+        fields["type"] = kind
+        self.buffer.append(orjson.dumps(fields) + b"\n")
+
+    async def flush(self):
+        if not self.buffer or self.path is None:
+            return
+        lines, self.buffer = self.buffer, []
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, _append, self.path, lines)
+            self.recorded += len(lines)
+        except Exception as e:
+            print(f"❌ Failed to write stream recording: {e}")
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(settings.STREAM_RECORD_FLUSH_SECONDS)
+            await self.flush()
+
+
+# Global stream recorder instance
+stream_recorder = StreamRecorder()
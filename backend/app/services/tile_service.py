@@ -0,0 +1,216 @@
+"""
+Tile Service
+
+Renders Mapbox vector tiles (MVT) for cameras, active entities and recent
+events with PostGIS ST_AsMVT. At low zoom levels points are clustered
+server-side on a grid so tiles stay small however many points there are.
+
+Rendered tiles are cached per layer/z/x/y under the layer's current
+version counter; bumping the version invalidates the whole layer at once.
+The events layer shows a sliding window, so its tiles are also keyed by
+a time bucket and expire when the bucket rolls over.
+"""
+
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import time
+from typing import Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.services.versions import resource_versions
+
+# Width of the Web Mercator world in meters
+WORLD_METERS = 40075016.68557849
+
+# Tiles from this zoom on are pre-filtered with `geom && <tile as
+# geography>`, which the GiST index on the column serves. Lower zooms span
+# 180+ degrees of longitude - ambiguous as geography, and most of the
+# table anyway.
+INDEX_MIN_ZOOM = 2
+
+# Layer definitions. These are constants - never build them from user input.
+#   source:   FROM clause (table is the one whose rows become features)
+#   geom:     geography column holding the point (GiST indexed)
+#   where:    filter (may use :since)
+#   columns:  feature properties when not clustering
+#   cluster:  aggregate properties when clustering, named in cluster_names
+LAYERS = {
+    "cameras": {
+        "table": "cameras",
+        "source": "cameras",
+        "geom": "location",
+        "where": "TRUE",
+        "columns": "id, name, is_online",
+        "cluster": "sum(CASE WHEN is_online THEN 1 ELSE 0 END) AS online_count",
+        "cluster_names": "online_count",
+    },
+    "entities": {
+        "table": "entities",
+        "source": "entities",
+        "geom": "location",
+        "where": "is_active AND location IS NOT NULL",
+        "columns": "id, entity_id, object_type, camera_id, confidence",
+        "cluster": "mode() WITHIN GROUP (ORDER BY object_type) AS object_type",
+        "cluster_names": "object_type",
+    },
+    "events": {
+        # Events have no location of their own - use their camera's
+        "table": "events",
+        "source": "events JOIN cameras ON cameras.id = events.camera_id",
+        "geom": "cameras.location",
+        "where": "events.timestamp >= :since",
+        "columns": "events.id, events.camera_id, event_type, events.confidence, events.timestamp::text AS timestamp",
+        "cluster": "mode() WITHIN GROUP (ORDER BY event_type) AS event_type",
+        "cluster_names": "event_type",
+    },
+}
+
+_PLAIN_SQL = """
+WITH bounds AS (
+    SELECT ST_TileEnvelope(:z, :x, :y) AS env,
+           ST_Transform(ST_TileEnvelope(:z, :x, :y), 4326)::geography AS area
+),
+features AS (
+    SELECT {columns},
+           ST_AsMVTGeom(ST_Transform({geom}::geometry, 3857), bounds.env) AS geom
+    FROM {source}, bounds
+    WHERE {where}
+      {area_filter}
+      AND ST_Intersects({geom}::geometry, ST_Transform(bounds.env, 4326))
+)
+SELECT ST_AsMVT(features, :layer, 4096, 'geom') FROM features
+"""
+
+_CLUSTER_SQL = """
+WITH bounds AS (
+    SELECT ST_TileEnvelope(:z, :x, :y) AS env,
+           ST_Transform(ST_TileEnvelope(:z, :x, :y), 4326)::geography AS area
+),
+points AS (
+    SELECT {table}.*, ST_Transform({geom}::geometry, 3857) AS mvt_point
+    FROM {source}, bounds
+    WHERE {where}
+      {area_filter}
+      AND ST_Intersects({geom}::geometry, ST_Transform(bounds.env, 4326))
+),
+clusters AS (
+    SELECT count(*) AS point_count,
+           {cluster},
+           ST_Centroid(ST_Collect(mvt_point)) AS center
+    FROM points
+    GROUP BY ST_SnapToGrid(mvt_point, :cell)
+),
+features AS (
+    SELECT point_count, {cluster_names},
+           ST_AsMVTGeom(center, bounds.env) AS geom
+    FROM clusters, bounds
+)
+SELECT ST_AsMVT(features, :layer, 4096, 'geom') FROM features
+"""
+
+
+def time_bucket(layer: str) -> Optional[int]:
+    """Current time bucket for layers that depend on the clock, else None."""
+    if layer != "events":
+        return None
+    return int(time.time() // settings.TILE_EVENTS_BUCKET_SECONDS)
+
+
+def tile_etag(layer: str) -> str:
+    """ETag for a layer's tiles: its version, plus the time bucket if any."""
+    etag = resource_versions.etag(layer)
+    bucket = time_bucket(layer)
+    return etag if bucket is None else f'{etag[:-1]}-{bucket}"'
+
+
+class TileCache:
+    """LRU of rendered tiles keyed by (layer, version, bucket, z, x, y)."""
+
+    def __init__(self, max_tiles: int = settings.TILE_CACHE_MAX_TILES):
+        self.max_tiles = max_tiles
+        self.tiles: "OrderedDict[Tuple, bytes]" = OrderedDict()
+
+    def get(self, key: Tuple) -> Optional[bytes]:
+        tile = self.tiles.get(key)
+        if tile is not None:
+            self.tiles.move_to_end(key)
+        return tile
+
+    def put(self, key: Tuple, tile: bytes):
+        self.tiles[key] = tile
+        self.tiles.move_to_end(key)
+        while len(self.tiles) > self.max_tiles:
+            self.tiles.popitem(last=False)  # Old versions age out here
+
+
+def _area_filter(layer: str, z: int) -> str:
+    if z < INDEX_MIN_ZOOM:
+        return ""
+    return f"AND {LAYERS[layer]['geom']} && bounds.area"
+
+
+def _cluster_sql(layer: str, z: int) -> str:
+    spec = LAYERS[layer]
+    return _CLUSTER_SQL.format(
+        table=spec["table"],
+        source=spec["source"],
+        geom=spec["geom"],
+        where=spec["where"],
+        area_filter=_area_filter(layer, z),
+        cluster=spec["cluster"],
+        cluster_names=spec["cluster_names"],
+    )
+
+
+def _plain_sql(layer: str, z: int) -> str:
+    spec = LAYERS[layer]
+    return _PLAIN_SQL.format(
+        source=spec["source"],
+        geom=spec["geom"],
+        where=spec["where"],
+        area_filter=_area_filter(layer, z),
+        columns=spec["columns"],
+    )
+
+
+class TileService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_tile(self, layer: str, z: int, x: int, y: int) -> bytes:
+        """Get a tile, rendering it on a cache miss."""
+        bucket = time_bucket(layer)
+        key = (layer, resource_versions.get(layer), bucket, z, x, y)
+        tile = tile_cache.get(key)
+        if tile is not None:
+            return tile
+
+        tile = await self._render(layer, z, x, y, bucket)
+        tile_cache.put(key, tile)
+        return tile
+
+    async def _render(self, layer: str, z: int, x: int, y: int, bucket: Optional[int] = None) -> bytes:
+        params = {"z": z, "x": x, "y": y, "layer": layer}
+        if layer == "events":
+            # Window measured from the bucket start, so a cached tile matches its key
+            params["since"] = datetime.utcfromtimestamp(
+                bucket * settings.TILE_EVENTS_BUCKET_SECONDS
+            ) - timedelta(minutes=settings.TILE_EVENTS_WINDOW_MINUTES)
+
+        if z < settings.TILE_CLUSTER_MAX_ZOOM:
+            # Grid cell size in meters: a fixed fraction of the tile width
+            params["cell"] = WORLD_METERS / (2 ** z) / settings.TILE_CLUSTER_GRID
+            sql = _cluster_sql(layer, z)
+        else:
+            sql = _plain_sql(layer, z)
+
+        result = await self.db.execute(text(sql), params)
+        tile = result.scalar()
+        return bytes(tile) if tile else b""
+
+
+# Global tile cache instance
+tile_cache = TileCache()
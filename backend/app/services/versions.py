@@ -0,0 +1,120 @@
+"""
+Resource Versions
+
+Cheap per-resource version counters ("cameras", "entities", "events").
+Writers bump a counter after committing; caches and ETags key on the
+counter, so invalidation is just an integer increment.
+
+Versions are shared between processes: a bump takes the next value of
+the resource_version_seq sequence and announces it with pg_notify; every
+process LISTENs (app/db/notifications.py) and adopts it. Until the
+announcement comes back the bump is also counted locally, so a process
+always sees its own writes immediately.
+"""
+
+import asyncio
+from typing import Dict, Optional, Set
+
+from sqlalchemy import text
+
+from app.db.notifications import notifications
+from app.db.session import engine
+
+CHANNEL = "resource_versions"
+
+
+class ResourceVersions:
+    def __init__(self):
+        self.baseline = 0  # Sequence value when we (re)connected
+        self.versions: Dict[str, int] = {}  # Last announced version per resource
+        self.local: Dict[str, int] = {}  # Bumps not yet covered by an announcement
+        self.published: Dict[str, int] = {}  # Our own latest announced version
+        self.pending: Set[str] = set()  # Bumps waiting to be announced
+        self.inflight: Set[str] = set()  # Bumps being announced right now
+        self.shared = False  # Announce bumps to other processes
+        self._publishing: Optional[asyncio.Task] = None
+
+    def get(self, resource: str) -> str:
+        version = str(self.versions.get(resource, self.baseline))
+        local = self.local.get(resource, 0)
+        return f"{version}.{local}" if local else version
+
+    def etag(self, resource: str) -> str:
+        return f'W/"{resource}-{self.get(resource)}"'
+
+    def bump(self, resource: str, publish: bool = True) -> str:
+        """
+        Mark a resource as changed.
+
+        Args:
+            publish: False for changes only this process can see (e.g. a
+                mirror reloading), which must not invalidate other processes
+        """
+        self.local[resource] = self.local.get(resource, 0) + 1
+        if publish and self.shared:
+            self.pending.add(resource)
+            if self._publishing is None or self._publishing.done():
+                self._publishing = asyncio.get_running_loop().create_task(self._publish())
+        return self.get(resource)
+
+    def observe(self, resource: str, version: int):
+        """Adopt a version announced by any process (including this one)."""
+        if version <= self.versions.get(resource, self.baseline):
+            return
+        self.versions[resource] = version
+        # Our own unannounced bumps are newer than this - keep counting them
+        unannounced = resource in self.pending or resource in self.inflight
+        if not unannounced and version >= self.published.get(resource, 0):
+            self.local.pop(resource, None)
+
+    def handle_notification(self, payload: str):
+        resource, _, version = payload.rpartition(":")
+        try:
+            self.observe(resource, int(version))
+        except ValueError:
+            print(f"❌ Bad version notification: {payload!r}")
+
+    async def sync(self):
+        """
+        (Re)start from the current sequence value.
+
+        Called whenever the listener (re)connects: announcements may have
+        been missed, so every resource gets a version newer than anything
+        a client could have seen from this process.
+        """
+        async with engine.connect() as conn:
+            result = await conn.execute(text("SELECT last_value FROM resource_version_seq"))
+            self.baseline = result.scalar()
+        self.versions = {resource: self.baseline for resource in self.versions}
+        self.shared = True
+
+    async def _publish(self):
+        while self.pending:
+            self.inflight, self.pending = self.pending, set()
+            try:
+                async with engine.connect() as conn:
+                    for resource in self.inflight:
+                        result = await conn.execute(
+                            text(
+                                "WITH seq AS (SELECT nextval('resource_version_seq') AS v) "
+                                "SELECT v, pg_notify(:channel, :resource || ':' || v) FROM seq"
+                            ),
+                            {"channel": CHANNEL, "resource": resource},
+                        )
+                        self.published[resource] = result.scalar()
+                    await conn.commit()  # Notifications go out on commit
+            except Exception as e:
+                print(f"❌ Failed to publish resource versions: {e}")
+                self.inflight = set()  # Still counted locally
+                return
+
+            done, self.inflight = self.inflight, set()
+            for resource in done:
+                # The announcement may have come back before we got here
+                if resource not in self.pending and self.versions.get(resource, self.baseline) >= self.published[resource]:
+                    self.local.pop(resource, None)
+
+
+# Global versions instance
+resource_versions = ResourceVersions()
+notifications.listen(CHANNEL, resource_versions.handle_notification, on_connect=resource_versions.sync)
@@ -0,0 +1,79 @@
+"""
+Worker Service
+
+Worker registry and camera assignments.
+"""
+
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models.worker_node import WorkerNode
+from app.services.camera_registry import camera_registry
+from app.services.sharding import assign
+
+# Registry rows of workers dead this long are deleted
+DEAD_WORKER_RETENTION = timedelta(hours=1)
+
+
+def default_worker_id() -> str:
+    return settings.WORKER_ID or f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _db_now():
+    """Heartbeats use the database clock so worker clock skew doesn't matter."""
+    return func.timezone("UTC", func.now())
+
+
+class WorkerService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def heartbeat(self, worker_id: str, started_at: datetime):
+        """Register the worker or refresh its heartbeat (caller commits)."""
+        stmt = insert(WorkerNode).values(
+            worker_id=worker_id,
+            hostname=socket.gethostname(),
+            pid=os.getpid(),
+            started_at=started_at,
+            heartbeat_at=_db_now(),
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow(),
+        )
+        await self.db.execute(stmt.on_conflict_do_update(
+            index_elements=["worker_id"],
+            set_={"heartbeat_at": stmt.excluded.heartbeat_at, "updated_at": stmt.excluded.updated_at},
+        ))
+        await self.db.execute(
+            delete(WorkerNode).where(WorkerNode.heartbeat_at < _db_now() - DEAD_WORKER_RETENTION)
+        )
+
+    async def deregister(self, worker_id: str):
+        """Leave the registry so the others take over right away (caller commits)."""
+        await self.db.execute(delete(WorkerNode).where(WorkerNode.worker_id == worker_id))
+
+    async def live_workers(self) -> List[WorkerNode]:
+        result = await self.db.execute(
+            select(WorkerNode)
+            .where(WorkerNode.heartbeat_at >= _db_now() - timedelta(seconds=settings.WORKER_TIMEOUT_SECONDS))
+            .order_by(WorkerNode.worker_id)
+        )
+        return list(result.scalars())
+
+    async def assignments(self, workers: Optional[List[WorkerNode]] = None) -> Dict[int, Optional[str]]:
+        """
+        camera_id -> worker_id for every camera.
+
+        Inactive cameras are assigned too: their owner isn't processing
+        them, but still looks after any entities they left behind.
+        """
+        if workers is None:
+            workers = await self.live_workers()
+        await camera_registry.ensure_loaded()
+        return assign((worker.worker_id for worker in workers), sorted(camera_registry.cameras))
@@ -0,0 +1,213 @@
+"""
+Zone Evaluator
+
+Checks entity positions against alert zones in memory.
+
+Zones are indexed in a uniform lat/lon grid: each cell lists the zones
+whose bounding box overlaps it, so a position update only tests the few
+zones near it instead of every zone (and never queries PostGIS).
+"""
+
+import json
+import math
+from datetime import datetime
+from typing import Dict, FrozenSet, List, Optional, Set, Tuple
+
+from sqlalchemy import select, func
+
+from app.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.alert_zone import AlertZone
+
+Ring = List[Tuple[float, float]]  # (lon, lat) vertices
+
+
+class ZoneShape:
+    """In-memory copy of one zone polygon."""
+    __slots__ = ("id", "name", "ring", "min_lon", "min_lat", "max_lon", "max_lat")
+
+    def __init__(self, zone_id: int, name: str, ring: Ring):
+        self.id = zone_id
+        self.name = name
+        self.ring = ring
+        lons = [p[0] for p in ring]
+        lats = [p[1] for p in ring]
+        self.min_lon, self.max_lon = min(lons), max(lons)
+        self.min_lat, self.max_lat = min(lats), max(lats)
+
+    def contains(self, lat: float, lon: float) -> bool:
+        """Ray-casting point-in-polygon test."""
+        if not (self.min_lon <= lon <= self.max_lon and self.min_lat <= lat <= self.max_lat):
+            return False
+
+        inside = False
+        ring = self.ring
+        j = len(ring) - 1
+        for i in range(len(ring)):
+            xi, yi = ring[i]
+            xj, yj = ring[j]
+            if (yi > lat) != (yj > lat) and lon < (xj - xi) * (lat - yi) / (yj - yi) + xi:
+                inside = not inside
+            j = i
+        return inside
+
+
+def parse_ring(geojson: str) -> Ring:
+    """Outer ring of a GeoJSON polygon, without the closing vertex."""
+    coordinates = json.loads(geojson)["coordinates"][0]
+    ring = [(float(lon), float(lat)) for lon, lat in coordinates]
+    if len(ring) > 1 and ring[0] == ring[-1]:
+        ring.pop()
+    return ring
+
+
+class ZoneEvaluator:
+    def __init__(self, cell_degrees: float = settings.ZONE_GRID_CELL_DEGREES):
+        self.cell = cell_degrees
+        self.zones: Dict[int, ZoneShape] = {}
+        self.grid: Dict[Tuple[int, int], List[int]] = {}
+        self.large_zones: Set[int] = set()  # Too big to spread over the grid
+        self.inside: Dict[str, FrozenSet[int]] = {}  # entity_id -> zones it's in
+        self.signature: Optional[Tuple] = None  # (count, last update) at last load
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return math.floor(lon / self.cell), math.floor(lat / self.cell)
+
+    def _cells(self, shape: ZoneShape):
+        x0, y0 = self._cell(shape.min_lat, shape.min_lon)
+        x1, y1 = self._cell(shape.max_lat, shape.max_lon)
+        return x0, y0, x1, y1
+
+    def _index(self, shape: ZoneShape):
+        x0, y0, x1, y1 = self._cells(shape)
+        if (x1 - x0 + 1) * (y1 - y0 + 1) > settings.ZONE_GRID_MAX_CELLS:
+            self.large_zones.add(shape.id)
+            return
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                self.grid.setdefault((x, y), []).append(shape.id)
+
+    def _unindex(self, shape: ZoneShape):
+        if shape.id in self.large_zones:
+            self.large_zones.discard(shape.id)
+            return
+        x0, y0, x1, y1 = self._cells(shape)
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                ids = self.grid.get((x, y))
+                if ids and shape.id in ids:
+                    ids.remove(shape.id)
+                    if not ids:
+                        del self.grid[(x, y)]
+
+    async def _signature(self, db) -> Tuple:
+        result = await db.execute(
+            select(func.count(AlertZone.id), func.max(AlertZone.updated_at))
+        )
+        return tuple(result.one())
+
+    async def refresh_if_changed(self):
+        """Reload zones if the table changed (one tiny aggregate query)."""
+        async with AsyncSessionLocal() as db:
+            try:
+                if await self._signature(db) == self.signature:
+                    return
+            except Exception as e:
+                print(f"❌ Failed to check alert zones: {e}")
+                return
+        await self.load()
+
+    async def load(self):
+        """Load all active zones from the database."""
+        async with AsyncSessionLocal() as db:
+            try:
+                self.signature = await self._signature(db)
+                result = await db.execute(
+                    select(
+                        AlertZone.id,
+                        AlertZone.name,
+                        func.ST_AsGeoJSON(AlertZone.area).label('geojson')
+                    ).where(AlertZone.is_active == True)
+                )
+
+                self.zones.clear()
+                self.grid.clear()
+                self.large_zones.clear()
+                for row in result:
+                    self.upsert(row.id, row.name, parse_ring(row.geojson))
+
+                print(f"🚧 Loaded {len(self.zones)} alert zones")
+            except Exception as e:
+                print(f"❌ Failed to load alert zones: {e}")
+
+    def upsert(self, zone_id: int, name: str, ring: Ring):
+        """Add or replace a zone."""
+        self.remove(zone_id)
+        shape = ZoneShape(zone_id, name, ring)
+        self.zones[zone_id] = shape
+        self._index(shape)
+
+    def remove(self, zone_id: int):
+        """Drop a zone (entities inside it won't get an exit event)."""
+        shape = self.zones.pop(zone_id, None)
+        if shape is not None:
+            self._unindex(shape)
+
+    def zones_at(self, lat: float, lon: float) -> FrozenSet[int]:
+        """IDs of all zones containing the point."""
+        candidates = self.grid.get(self._cell(lat, lon), ())
+        hits = [z for z in candidates if self.zones[z].contains(lat, lon)]
+        hits.extend(z for z in self.large_zones if self.zones[z].contains(lat, lon))
+        return frozenset(hits)
+
+    def check(self, entity_id: str, lat: float, lon: float) -> List[Tuple[str, ZoneShape]]:
+        """
+        Update an entity's position.
+
+        Returns:
+            List of ("zone_enter" | "zone_exit", zone) transitions
+        """
+        current = self.zones_at(lat, lon)
+        previous = self.inside.get(entity_id, frozenset())
+        if current == previous:
+            return []
+
+        if current:
+            self.inside[entity_id] = current
+        else:
+            self.inside.pop(entity_id, None)
+
+        transitions = []
+        for zone_id in previous - current:
+            shape = self.zones.get(zone_id)
+            if shape is not None:
+                transitions.append(("zone_exit", shape))
+        for zone_id in current - previous:
+            transitions.append(("zone_enter", self.zones[zone_id]))
+        return transitions
+
+    def event_rows(self, entity_id: str, camera_id: int, lat: float, lon: float) -> list:
+        """zone_enter/zone_exit event rows for an entity's new position."""
+        rows = []
+        for event_type, zone in self.check(entity_id, lat, lon):
+            rows.append({
+                "camera_id": camera_id,
+                "event_type": event_type,
+                "confidence": 1.0,
+                "event_metadata": {
+                    "zone_id": zone.id,
+                    "zone_name": zone.name,
+                    "entity_id": entity_id,
+                },
+                "timestamp": datetime.utcnow(),
+            })
+            print(f"🚨 {entity_id} {'entered' if event_type == 'zone_enter' else 'left'} zone {zone.name}")
+        return rows
+
+    def forget(self, entity_id: str):
+        """Stop tracking an entity that is no longer active."""
+        self.inside.pop(entity_id, None)
+
+
+# Global zone evaluator instance
+zone_evaluator = ZoneEvaluator()
@@ -0,0 +1,107 @@
+"""
+Zone Service
+
+Business logic for alert zone operations.
+Keeps the in-memory zone evaluator in sync with the database.
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func
+from typing import List, Optional, Tuple
+from geoalchemy2.elements import WKTElement
+
+from app.models.alert_zone import AlertZone
+from app.schemas.alert_zone import AlertZoneCreate, AlertZoneUpdate, ZonePoint
+from app.services.zone_evaluator import zone_evaluator, parse_ring, Ring
+
+
+def _polygon(points: List[ZonePoint]) -> WKTElement:
+    """Build a closed polygon from zone vertices (lon first!)."""
+    ring = [f"{p.longitude} {p.latitude}" for p in points]
+    ring.append(ring[0])
+    return WKTElement(f"POLYGON(({', '.join(ring)}))", srid=4326)
+
+
+class ZoneService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_ring(self, zone_id: int) -> Ring:
+        """Read a zone outline back from PostGIS."""
+        result = await self.db.execute(
+            select(func.ST_AsGeoJSON(AlertZone.area)).where(AlertZone.id == zone_id)
+        )
+        return parse_ring(result.scalar_one())
+
+    def _sync(self, zone: AlertZone, ring: Ring):
+        """Push a zone change into the live evaluator."""
+        if zone.is_active:
+            zone_evaluator.upsert(zone.id, zone.name, ring)
+        else:
+            zone_evaluator.remove(zone.id)
+
+    async def create_zone(self, zone_data: AlertZoneCreate) -> Tuple[AlertZone, Ring]:
+        """Create a new zone."""
+        zone = AlertZone(
+            name=zone_data.name,
+            description=zone_data.description,
+            area=_polygon(zone_data.points),
+        )
+
+        self.db.add(zone)
+        await self.db.commit()
+        await self.db.refresh(zone)
+
+        ring = await self.get_ring(zone.id)
+        self._sync(zone, ring)
+        return zone, ring
+
+    async def get_zones(self) -> List[Tuple[AlertZone, Ring]]:
+        """Get all zones with their outlines."""
+        result = await self.db.execute(
+            select(AlertZone, func.ST_AsGeoJSON(AlertZone.area).label('geojson'))
+            .order_by(AlertZone.id)
+        )
+        return [(row.AlertZone, parse_ring(row.geojson)) for row in result]
+
+    async def get_zone(self, zone_id: int) -> Optional[AlertZone]:
+        """Get a specific zone by ID."""
+        result = await self.db.execute(
+            select(AlertZone).where(AlertZone.id == zone_id)
+        )
+        return result.scalar_one_or_none()
+
+    async def update_zone(
+        self,
+        zone_id: int,
+        zone_update: AlertZoneUpdate
+    ) -> Optional[Tuple[AlertZone, Ring]]:
+        """Update zone fields and/or outline."""
+        zone = await self.get_zone(zone_id)
+        if not zone:
+            return None
+
+        update_data = zone_update.model_dump(exclude_unset=True, exclude={"points"})
+        for field, value in update_data.items():
+            setattr(zone, field, value)
+        if zone_update.points is not None:
+            zone.area = _polygon(zone_update.points)
+
+        await self.db.commit()
+        await self.db.refresh(zone)
+
+        ring = await self.get_ring(zone.id)
+        self._sync(zone, ring)
+        return zone, ring
+
+    async def delete_zone(self, zone_id: int) -> bool:
+        """Delete a zone."""
+        zone = await self.get_zone(zone_id)
+        if not zone:
+            return False
+
+        await self.db.delete(zone)
+        await self.db.commit()
+
+        zone_evaluator.remove(zone_id)
+        return True
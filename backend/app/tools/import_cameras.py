@@ -0,0 +1,68 @@
+"""
+Camera CSV importer.
+
+    python -m app.tools.import_cameras cameras.csv
+    python -m app.tools.import_cameras cameras.csv --upsert-on rtsp_url
+
+Columns: name, latitude, longitude, rtsp_url (required) and description,
+username, password, config (a JSON object). Empty cells are left out.
+All valid rows are written in one transaction (see
+CameraService.import_cameras); invalid ones are listed by line number
+and make the exit status 1.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import sys
+from typing import List, Optional
+
+from app.db.session import AsyncSessionLocal, engine
+from app.services.camera_service import CameraService
+
+
+def read_csv(path: str) -> List[dict]:
+    """Rows as dicts, without empty cells; config parsed as JSON."""
+    rows = []
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            row = {
+                name.strip(): value.strip() for name, value in row.items()
+                if name and isinstance(value, str) and value.strip()
+            }
+            if "config" in row:
+                try:
+                    row["config"] = json.loads(row["config"])
+                except ValueError:
+                    pass  # Reported as an invalid config
+            rows.append(row)
+    return rows
+
+
+async def main(path: str, upsert_on: Optional[str] = None) -> int:
+    rows = read_csv(path)
+    print(f"📥 Importing {len(rows)} cameras from {path}")
+
+    try:
+        async with AsyncSessionLocal() as db:
+            report = await CameraService(db).import_cameras(rows, upsert_on)
+    finally:
+        await engine.dispose()
+
+    for entry in report["rows"]:
+        if entry["status"] == "error":
+            # +2: header line, and lines count from 1
+            print(f"❌ Line {entry['row'] + 2}: {'; '.join(entry['errors'])}")
+    print(f"✅ Created {report['created']}, updated {report['updated']}, failed {report['failed']}")
+    return 1 if report["failed"] else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import cameras from a CSV file")
+    parser.add_argument("csv", help="CSV file with a header row")
+    parser.add_argument(
+        "--upsert-on", choices=("name", "rtsp_url"),
+        help="Update existing cameras matching on this column instead of adding duplicates"
+    )
+    args = parser.parse_args()
+    sys.exit(asyncio.run(main(args.csv, args.upsert_on)))
@@ -0,0 +1,12 @@
+"""
+Timestamp Helpers
+Timestamps are stored as naive UTC throughout.
+"""
+from datetime import datetime, timezone
+
+
+def utc_naive(value: datetime) -> datetime:
+    """Convert an aware timestamp to naive UTC (naive ones are already UTC)."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
@@ -0,0 +1,55 @@
+"""
+Background worker process.
+
+    python -m app.workers
+
+Run one or more of these next to the API (started with
+RUN_BACKGROUND_WORKERS=false). Each joins the worker registry and
+processes its consistent-hash share of the cameras; when one joins or
+dies only its share moves. They also elect a leader through a Postgres
+advisory lock to run the rollups, playback recording and entity
+archival, and a standby takes over within LEADER_CHECK_SECONDS if it dies.
+
+Workers register as hostname:pid, so several can run on one machine;
+set WORKER_ID for a stable name:
+
+    WORKER_ID=w1 python -m app.workers &
+    WORKER_ID=w2 python -m app.workers &
+    curl localhost:8000/api/v1/workers
+"""
+import asyncio
+import signal
+from app.config import settings
+from app.db.notifications import notifications
+from app.db.session import engine
+from app.services.latency_service import latency_tracker
+from app.services.stream_recorder import stream_recorder
+from app.services.worker_service import default_worker_id
+from app.workers.runner import background_workers
+
+
+async def main():
+    print(f"🛠️ Starting {settings.APP_NAME} workers")
+    print(f"📊 Database: {settings.DATABASE_URL.split('@')[1]}")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await notifications.start()
+    await latency_tracker.start()
+    await stream_recorder.start(default_worker_id())
+    await background_workers.start()
+    await stop.wait()
+
+    print("👋 Shutting down workers gracefully...")
+    await background_workers.stop()
+    await stream_recorder.stop()
+    await latency_tracker.stop()
+    await notifications.stop()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
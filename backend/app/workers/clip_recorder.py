@@ -0,0 +1,185 @@
+"""
+Event Clip Recorder
+Keeps the last few seconds of encoded packets per camera and writes
+pre-roll + post-roll clips to storage when an event fires.
+
+Packets come from whatever reads the camera streams via push_packet();
+for now that is the simulator, which pushes synthetic MJPEG frames.
+"""
+import asyncio
+import os
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from app.config import settings
+
+
+class PacketRingBuffer:
+    """
+    Bounded buffer of recent encoded packets for one camera.
+
+    Packets are stored exactly as received (JPEG frames, H.264 NAL units...),
+    so nothing is ever decoded or re-encoded. Old packets are evicted once the
+    buffer spans more than max_seconds or holds more than max_bytes.
+    """
+    __slots__ = ("max_seconds", "max_bytes", "packets", "size")
+
+    def __init__(self, max_seconds: float, max_bytes: int):
+        self.max_seconds = max_seconds
+        self.max_bytes = max_bytes
+        self.packets = deque()  # (timestamp, is_keyframe, data)
+        self.size = 0
+
+    def append(self, timestamp: float, data: bytes, keyframe: bool = True):
+        self.packets.append((timestamp, keyframe, data))
+        self.size += len(data)
+
+        # Evict from the front until both limits hold again
+        while self.packets and (
+            self.size > self.max_bytes
+            or timestamp - self.packets[0][0] > self.max_seconds
+        ):
+            _, _, old = self.packets.popleft()
+            self.size -= len(old)
+
+    def window(self, start: float, end: float) -> List[bytes]:
+        """Packets between start and end, beginning at the first keyframe."""
+        result = []
+        for timestamp, keyframe, data in self.packets:
+            if timestamp < start or timestamp > end:
+                continue
+            if not result and not keyframe:
+                continue  # A clip can't start mid-GOP
+            result.append(data)
+        return result
+
+
+# on_finished(path, error): path once the clip is on disk, else why it isn't
+ClipCallback = Callable[[Optional[str], Optional[str]], Awaitable[None]]
+
+
+def _write_clip(path: str, packets: List[bytes]):
+    """Write packets to disk (runs in the writer pool)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.part"
+    with open(tmp_path, "wb") as f:
+        for data in packets:
+            f.write(data)
+    os.replace(tmp_path, path)  # Readers never see half-written clips
+
+
+class ClipRecorder:
+    def __init__(self):
+        self.pre_roll = settings.CLIP_PRE_ROLL_SECONDS
+        self.post_roll = settings.CLIP_POST_ROLL_SECONDS
+        self.buffers: Dict[int, PacketRingBuffer] = {}
+        self.executor: Optional[ThreadPoolExecutor] = None
+        self.pending = set()
+        self._closing = asyncio.Event()
+
+    def start(self):
+        """Accept clips again (after stop(), post-rolls are cut short)."""
+        self._closing = asyncio.Event()
+
+    def push_packet(
+        self,
+        camera_id: int,
+        data: bytes,
+        timestamp: Optional[float] = None,
+        keyframe: bool = True
+    ):
+        """Add an encoded packet from a camera stream to its ring buffer."""
+        buffer = self.buffers.get(camera_id)
+        if buffer is None:
+            buffer = PacketRingBuffer(
+                max_seconds=self.pre_roll + self.post_roll,
+                max_bytes=settings.CLIP_BUFFER_MAX_BYTES
+            )
+            self.buffers[camera_id] = buffer
+        buffer.append(timestamp or time.time(), data, keyframe)
+
+    def trigger(
+        self,
+        camera_id: int,
+        event_time: Optional[float] = None,
+        on_finished: Optional[ClipCallback] = None
+    ) -> Optional[str]:
+        """
+        Schedule a clip around an event.
+
+        Returns immediately with the path the clip will be written to,
+        or None if nothing is buffered for this camera. The post-roll wait
+        and the file write happen in the background; the file doesn't
+        exist yet, so link it from on_finished, which is awaited once the
+        clip is written (or has failed).
+        """
+        buffer = self.buffers.get(camera_id)
+        if buffer is None or not buffer.packets:
+            return None
+
+        event_time = event_time or time.time()
+        stamp = datetime.utcfromtimestamp(event_time).strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(
+            settings.CLIP_STORAGE_DIR,
+            f"camera_{camera_id}",
+            f"{stamp}_{uuid.uuid4().hex[:8]}.{settings.CLIP_FILE_EXTENSION}"
+        )
+
+        task = asyncio.create_task(self._finish_clip(buffer, event_time, path, on_finished))
+        self.pending.add(task)
+        task.add_done_callback(self.pending.discard)
+        return path
+
+    async def _finish_clip(
+        self,
+        buffer: PacketRingBuffer,
+        event_time: float,
+        path: str,
+        on_finished: Optional[ClipCallback]
+    ):
+        """Wait out the post-roll, then hand the packets to the writer pool."""
+        try:
+            await asyncio.wait_for(self._closing.wait(), timeout=self.post_roll)
+        except asyncio.TimeoutError:
+            pass  # Normal case - post-roll elapsed
+
+        error = None
+        packets = buffer.window(event_time - self.pre_roll, event_time + self.post_roll)
+        if not packets:
+            error = "no packets around the event"
+        else:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(
+                    max_workers=settings.CLIP_WRITER_THREADS,
+                    thread_name_prefix="clip-writer"
+                )
+            try:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(self.executor, _write_clip, path, packets)
+                print(f"🎞️ Saved clip: {path} ({len(packets)} packets)")
+            except Exception as e:
+                error = f"write failed: {e}"
+                print(f"❌ Failed to write clip {path}: {e}")
+
+        if on_finished is not None:
+            try:
+                await on_finished(None if error else path, error)
+            except Exception as e:
+                print(f"❌ Failed to link clip {path}: {e}")
+
+    async def stop(self):
+        """Finish pending clips with whatever post-roll is buffered."""
+        self._closing.set()
+        if self.pending:
+            await asyncio.gather(*self.pending, return_exceptions=True)
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+            self.executor = None
+
+
+# Global clip recorder instance
+clip_recorder = ClipRecorder()
@@ -0,0 +1,91 @@
+"""
+Entity Archiver
+Moves long-inactive entities out of the hot entities table.
+
+Entities inactive for more than ENTITY_ARCHIVE_AFTER_HOURS are moved to
+entities_archive, ENTITY_ARCHIVE_BATCH rows per transaction (a single
+DELETE ... RETURNING feeding an INSERT, so a row is never in both tables or
+neither). Runs in the leader only.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from app.config import settings
+from app.db.session import AsyncSessionLocal
+
+# Everything but the generated lat/lon columns, which Postgres fills in
+COLUMNS = (
+    "id, entity_id, object_type, location, camera_id, first_seen, last_seen, is_active, "
+    "confidence, linked_entity_id, is_recognized, recognized_as, created_at, updated_at"
+)
+
+# Oldest first; SKIP LOCKED leaves rows someone is updating for next time
+ARCHIVE_BATCH = text(f"""
+    WITH moved AS (
+        DELETE FROM entities
+        WHERE id IN (
+            SELECT id FROM entities
+            WHERE NOT is_active AND last_seen < :cutoff
+            ORDER BY last_seen
+            LIMIT :batch
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING {COLUMNS}
+    )
+    INSERT INTO entities_archive ({COLUMNS}, archived_at)
+    SELECT {COLUMNS}, :now FROM moved
+""")
+
+
+class EntityArchiver:
+    def __init__(self):
+        self.running = False
+        self._task = None
+
+    async def start(self):
+        """Start the archival loop"""
+        self.running = True
+        self._task = asyncio.create_task(self._archive_loop())
+
+    async def stop(self):
+        """Stop the archival loop"""
+        self.running = False
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _archive_loop(self):
+        while self.running:
+            await self.archive()
+            await asyncio.sleep(settings.ENTITY_ARCHIVE_INTERVAL_SECONDS)
+
+    async def archive(self) -> int:
+        """Move every entity past the retention period; returns rows moved."""
+        now = datetime.utcnow()
+        cutoff = now - timedelta(hours=settings.ENTITY_ARCHIVE_AFTER_HOURS)
+        total = 0
+        while self.running:
+            async with AsyncSessionLocal() as db:
+                try:
+                    result = await db.execute(
+                        ARCHIVE_BATCH,
+                        {"cutoff": cutoff, "batch": settings.ENTITY_ARCHIVE_BATCH, "now": now}
+                    )
+                    await db.commit()
+                except Exception as e:
+                    print(f"❌ Failed to archive entities: {e}")
+                    await db.rollback()
+                    break
+
+            total += result.rowcount
+            if result.rowcount < settings.ENTITY_ARCHIVE_BATCH:
+                break
+            await asyncio.sleep(0)  # Let the hot path in between batches
+
+        if total:
+            print(f"📦 Archived {total} inactive entities")
+        return total
+
+
+# Global entity archiver instance
+entity_archiver = EntityArchiver()
@@ -0,0 +1,60 @@
+"""
+Heatmap Rollup
+Precomputes daily heatmap grids so long time ranges read aggregates.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from app.config import settings
+from app.db.session import AsyncSessionLocal
+from app.services.heatmap_service import HeatmapService
+
+
+class HeatmapRollup:
+    def __init__(self):
+        self.running = False
+        self._task = None
+
+    async def start(self):
+        """Start the rollup loop"""
+        self.running = True
+        self._task = asyncio.create_task(self._rollup_loop())
+
+    async def stop(self):
+        """Stop the rollup loop"""
+        self.running = False
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _rollup_loop(self):
+        while self.running:
+            await self.rollup_recent_days()
+            await asyncio.sleep(settings.HEATMAP_ROLLUP_INTERVAL_SECONDS)
+
+    async def rollup_recent_days(self):
+        """Roll up each completed day in the lookback window not yet covered."""
+        today = datetime.utcnow().date()
+        days = [today - timedelta(days=offset) for offset in range(settings.HEATMAP_ROLLUP_LOOKBACK_DAYS, 0, -1)]
+        async with AsyncSessionLocal() as db:
+            try:
+                covered = set(await HeatmapService(db).rolled_up_days(days))
+            except Exception as e:
+                print(f"❌ Failed to read heatmap coverage: {e}")
+                return
+
+        for day in days:
+            if day in covered:
+                continue
+
+            async with AsyncSessionLocal() as db:
+                try:
+                    await HeatmapService(db).rollup_day(day)
+                    await db.commit()
+                    print(f"🗺️ Rolled up heatmap for {day}")
+                except Exception as e:
+                    print(f"❌ Failed to roll up heatmap for {day}: {e}")
+                    await db.rollback()
+
+
+# Global rollup instance
+heatmap_rollup = HeatmapRollup()
@@ -0,0 +1,102 @@
+"""
+Leader Election
+Picks exactly one process to run singleton background jobs.
+
+Every candidate holds its own database connection and tries to take a
+Postgres session-level advisory lock on it. Whoever holds the lock is the
+leader. If the leader dies its connection closes, Postgres releases the
+lock, and the next candidate to retry takes over.
+"""
+import asyncio
+from typing import Awaitable, Callable, Optional
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from app.config import settings
+from app.db.session import engine
+
+Callback = Callable[[], Awaitable[None]]
+
+
+class LeaderElection:
+    def __init__(self, on_elected: Callback, on_demoted: Callback, lock_id: int = settings.LEADER_LOCK_ID):
+        self.on_elected = on_elected
+        self.on_demoted = on_demoted
+        self.lock_id = lock_id
+        self.is_leader = False
+        self.running = False
+        self._conn: Optional[AsyncConnection] = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Start campaigning for leadership"""
+        self.running = True
+        self._task = asyncio.create_task(self._election_loop())
+
+    async def stop(self):
+        """Step down (if leading) and stop campaigning"""
+        self.running = False
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+        if self.is_leader:
+            await self._demote()
+            try:
+                await self._conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": self.lock_id})
+            except Exception:
+                pass  # Invalidating the connection releases it anyway
+        await self._close()
+
+    async def _election_loop(self):
+        while self.running:
+            try:
+                if self._conn is None:
+                    conn = await engine.connect()
+                    # No transactions - the lock lives on the session itself
+                    self._conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+
+                if self.is_leader:
+                    # Still leader as long as our session is alive
+                    await self._conn.execute(text("SELECT 1"))
+                else:
+                    result = await self._conn.execute(
+                        text("SELECT pg_try_advisory_lock(:id)"), {"id": self.lock_id}
+                    )
+                    if result.scalar():
+                        self.is_leader = True
+                        print(f"👑 Elected leader (lock {self.lock_id})")
+                        await self.on_elected()
+            except Exception as e:
+                print(f"❌ Leader election error: {e}")
+                if self.is_leader:
+                    await self._demote()
+                await self._close()
+
+            await asyncio.sleep(settings.LEADER_CHECK_SECONDS)
+
+    async def _demote(self):
+        self.is_leader = False
+        print("🪑 Stepping down as leader")
+        try:
+            await self.on_demoted()
+        except Exception as e:
+            print(f"❌ Failed to stop leader jobs: {e}")
+
+    async def _close(self):
+        """
+        End our database session for good.
+
+        The connection is invalidated rather than returned to the pool:
+        a pooled session would keep holding the advisory lock (e.g. after
+        on_elected failed), and nobody could become leader again.
+        """
+        if self._conn is not None:
+            try:
+                await self._conn.invalidate()
+            except Exception:
+                pass
+            try:
+                await self._conn.close()
+            except Exception:
+                pass
+            self._conn = None
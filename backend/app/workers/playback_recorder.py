@@ -0,0 +1,116 @@
+"""
+Playback Recorder
+Records the live scene for historical playback.
+
+Every PLAYBACK_TICK_SECONDS the active entities are compared with the
+previous tick and only what changed is written as a delta. Every
+PLAYBACK_KEYFRAME_SECONDS (and after any failed write, so a lost delta
+never corrupts what follows) the whole scene is written as a keyframe
+instead. Recordings older than PLAYBACK_RETENTION_DAYS are pruned.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from sqlalchemy import delete
+from app.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.playback import PlaybackDelta, PlaybackKeyframe
+from app.services.live_state import live_state
+
+
+def snapshot() -> Dict[str, list]:
+    """Current scene: entity_id -> [latitude, longitude, object_type, camera_id]"""
+    return {
+        entity.entity_id: [
+            round(entity.latitude, 6), round(entity.longitude, 6),
+            entity.object_type, entity.camera_id,
+        ]
+        for entity in live_state.active()
+    }
+
+
+def diff(before: Dict[str, list], after: Dict[str, list]) -> dict:
+    """Changes turning one scene into the next (empty parts left out)."""
+    changes = {}
+    added = {entity_id: row for entity_id, row in after.items() if entity_id not in before}
+    moved = {
+        entity_id: row[:2] for entity_id, row in after.items()
+        if entity_id in before and before[entity_id][:2] != row[:2]
+    }
+    removed = [entity_id for entity_id in before if entity_id not in after]
+    if added:
+        changes["added"] = added
+    if moved:
+        changes["moved"] = moved
+    if removed:
+        changes["removed"] = removed
+    return changes
+
+
+class PlaybackRecorder:
+    def __init__(self):
+        self.running = False
+        self.scene: Optional[Dict[str, list]] = None  # As of the last write
+        self.keyframe_at: Optional[datetime] = None
+        self.pruned_at: Optional[datetime] = None
+        self._task = None
+
+    async def start(self):
+        """Start recording"""
+        self.running = True
+        self.scene = None  # Always begin with a keyframe
+        self._task = asyncio.create_task(self._record_loop())
+
+    async def stop(self):
+        """Stop recording"""
+        self.running = False
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _record_loop(self):
+        while self.running:
+            await self.record()
+            await asyncio.sleep(settings.PLAYBACK_TICK_SECONDS)
+
+    async def record(self):
+        """Write this tick's keyframe or delta."""
+        now = datetime.utcnow()
+        scene = snapshot()
+        keyframe = (
+            self.scene is None
+            or (now - self.keyframe_at).total_seconds() >= settings.PLAYBACK_KEYFRAME_SECONDS
+        )
+        if keyframe:
+            row = PlaybackKeyframe(ts=now, entities=scene)
+        else:
+            changes = diff(self.scene, scene)
+            if not changes:
+                return
+            row = PlaybackDelta(ts=now, changes=changes)
+
+        async with AsyncSessionLocal() as db:
+            try:
+                db.add(row)
+                if self.pruned_at is None or now - self.pruned_at >= timedelta(hours=1):
+                    await self._prune(db, now)
+                await db.commit()
+            except Exception as e:
+                print(f"❌ Failed to record playback: {e}")
+                await db.rollback()
+                self.scene = None  # Next tick starts over from a keyframe
+                return
+
+        self.scene = scene
+        if keyframe:
+            self.keyframe_at = now
+
+    async def _prune(self, db, now: datetime):
+        cutoff = now - timedelta(days=settings.PLAYBACK_RETENTION_DAYS)
+        await db.execute(delete(PlaybackDelta).where(PlaybackDelta.ts < cutoff))
+        await db.execute(delete(PlaybackKeyframe).where(PlaybackKeyframe.ts < cutoff))
+        self.pruned_at = now
+
+
+# Global playback recorder instance
+playback_recorder = PlaybackRecorder()
@@ -0,0 +1,83 @@
+"""
+Worker Registry
+Heartbeats this worker into the registry and works out its shard.
+
+Every heartbeat re-reads the live workers and recomputes the consistent
+hash assignment over the cameras in the camera registry, so a worker that joins or dies moves its share of
+cameras within one heartbeat (WORKER_TIMEOUT_SECONDS for one that dies
+without deregistering). A worker that can't reach the database for
+WORKER_TIMEOUT_SECONDS drops its shard, since the others will have
+taken it over by then.
+"""
+import asyncio
+import time
+from datetime import datetime
+from typing import Awaitable, Callable, Optional, Set
+from app.config import settings
+from app.db.session import AsyncSessionLocal
+from app.services.worker_service import WorkerService, default_worker_id
+
+ShardCallback = Callable[[Set[int]], Awaitable[None]]
+
+
+class WorkerRegistry:
+    def __init__(self, on_shard_changed: ShardCallback):
+        self.on_shard_changed = on_shard_changed
+        self.worker_id = default_worker_id()
+        self.started_at = datetime.utcnow()
+        self.shard: Set[int] = set()
+        self.running = False
+        self.last_heartbeat = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Join the registry"""
+        self.running = True
+        self._task = asyncio.create_task(self._heartbeat_loop())
+
+    async def stop(self):
+        """Give up our cameras and leave the registry"""
+        self.running = False
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        await self._set_shard(set())
+
+        async with AsyncSessionLocal() as db:
+            try:
+                await WorkerService(db).deregister(self.worker_id)
+                await db.commit()
+                print(f"👋 Worker {self.worker_id} left the registry")
+            except Exception as e:
+                print(f"❌ Failed to deregister worker: {e}")
+
+    async def _heartbeat_loop(self):
+        while self.running:
+            shard = self.shard
+            async with AsyncSessionLocal() as db:
+                try:
+                    service = WorkerService(db)
+                    await service.heartbeat(self.worker_id, self.started_at)
+                    await db.commit()
+                    assignments = await service.assignments()
+                    self.last_heartbeat = time.monotonic()
+                    shard = {camera_id for camera_id, worker in assignments.items() if worker == self.worker_id}
+                except Exception as e:
+                    print(f"❌ Worker heartbeat failed: {e}")
+                    await db.rollback()
+                    if time.monotonic() - self.last_heartbeat > settings.WORKER_TIMEOUT_SECONDS:
+                        shard = set()
+
+            await self._set_shard(shard)
+            await asyncio.sleep(settings.WORKER_HEARTBEAT_SECONDS)
+
+    async def _set_shard(self, shard: Set[int]):
+        if shard == self.shard:
+            return
+        gained, lost = shard - self.shard, self.shard - shard
+        self.shard = shard
+        print(f"🧩 Worker {self.worker_id} shard: {sorted(shard)} (+{sorted(gained)} -{sorted(lost)})")
+        try:
+            await self.on_shard_changed(set(shard))
+        except Exception as e:
+            print(f"❌ Failed to apply shard change: {e}")
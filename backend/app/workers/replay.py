@@ -0,0 +1,264 @@
+"""
+Stream replay.
+
+    python -m app.workers.replay recordings/*.ndjson.gz --speed 10
+    python -m app.workers.replay recordings/*.ndjson.gz --speed max
+
+Feeds detection streams captured by the stream recorder
+(app/services/stream_recorder.py) back through the normal write paths -
+admission control, the batch writers, the event coalescer, zone checks
+and live state with its write-behind flush - at 1x to 100x their
+recorded pace, or as fast as possible, then prints the throughput.
+Several files (one per recording process) are merged in time order.
+
+Recorded entities get fresh IDs, so a recording can be replayed into the
+same database again and again. Cameras are matched by ID. Run it with no
+workers and the API in mirror mode (RUN_BACKGROUND_WORKERS=false): the
+replay owns every entity while it runs.
+"""
+import argparse
+import asyncio
+import gzip
+import heapq
+import time
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+import orjson
+from geoalchemy2.elements import WKTElement
+
+from app.config import settings
+from app.db.notifications import notifications
+from app.db.session import AsyncSessionLocal, engine
+from app.services.admission import admission_control, Overloaded
+from app.services.batch_writer import entity_writer, event_writer
+from app.services.camera_registry import camera_registry
+from app.services.entity_service import entity_ids
+from app.services.event_coalescer import event_coalescer
+from app.services.latency_service import LatencyTrace, latency_tracker
+from app.services.live_state import live_state, LiveEntity
+from app.services.versions import resource_versions
+from app.services.zone_evaluator import zone_evaluator
+
+
+def read_records(paths: Iterable[str]) -> Iterator[dict]:
+    """Records from all recordings, merged by time."""
+    def read(path: str) -> Iterator[dict]:
+        with gzip.open(path, "rb") as f:
+            for line in f:
+                if line.strip():
+                    record = orjson.loads(line)
+                    record["t"] = datetime.fromisoformat(record["t"])
+                    yield record
+
+    return heapq.merge(*(read(path) for path in paths), key=lambda record: record["t"])
+
+
+def parse_speed(value: str) -> Optional[float]:
+    """1-100 (times the recorded pace), or "max" (None) for no pacing."""
+    if value == "max":
+        return None
+    try:
+        speed = float(value)
+    except ValueError:
+        speed = 0.0
+    if not 1 <= speed <= 100:
+        raise argparse.ArgumentTypeError("speed must be between 1 and 100, or max")
+    return speed
+
+
+class Replayer:
+    def __init__(self, speed: Optional[float]):
+        self.speed = speed
+        self.entities: Dict[str, asyncio.Task] = {}  # recorded entity_id -> new entity_id (None if shed)
+        self.tasks: Set[asyncio.Task] = set()
+        self.slots = asyncio.Semaphore(settings.REPLAY_MAX_IN_FLIGHT)
+        self.counts: Counter = Counter()
+
+    async def run(self, records: Iterable[dict]) -> float:
+        """Replay all records; returns the seconds it took."""
+        started = time.monotonic()
+        first = None
+        for record in records:
+            if self.speed is not None:
+                first = first or record["t"]
+                delay = started + (record["t"] - first).total_seconds() / self.speed - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            await self.dispatch(record)
+
+        while self.tasks:
+            await asyncio.gather(*list(self.tasks))
+        return time.monotonic() - started
+
+    async def dispatch(self, record: dict):
+        kind = record["type"]
+        self.counts[kind] += 1
+        if kind == "entity":
+            task = await self._spawn(self._create(record))
+            if record.get("entity_id"):
+                self.entities[record["entity_id"]] = task
+        elif kind == "event":
+            await self._spawn(self._event(record))
+        elif kind in ("move", "lost"):
+            task = self.entities.get(record["entity_id"])
+            entity_id = await task if task is not None else None
+            if entity_id is None:
+                self.counts["skipped"] += 1  # Never created (shed, or before the recording)
+            elif kind == "move":
+                entity = live_state.move(entity_id, record["latitude"], record["longitude"])
+                if entity is not None:
+                    rows = zone_evaluator.event_rows(entity_id, entity.camera_id, entity.latitude, entity.longitude)
+                    if rows:
+                        await self._spawn(self._zone_events(rows))
+            else:
+                live_state.deactivate(entity_id)
+                zone_evaluator.forget(entity_id)
+
+    async def _spawn(self, coro) -> asyncio.Task:
+        """Run a write in the background, at most REPLAY_MAX_IN_FLIGHT at once."""
+        await self.slots.acquire()
+        task = asyncio.create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        task.add_done_callback(lambda _: self.slots.release())
+        return task
+
+    async def _create(self, record: dict) -> Optional[str]:
+        """Insert a recorded detection as a new entity; returns its entity_id."""
+        camera_id = record["camera_id"]
+        object_type = record["object_type"]
+        latitude, longitude = record["latitude"], record["longitude"]
+        trace = LatencyTrace(camera_id)
+        admission_control.load_camera(camera_id)
+        try:
+            with admission_control.admit(camera_id, object_type, record["confidence"]):
+                row_id = await entity_ids.reserve()
+                entity_id = f"{object_type}_{row_id}"
+                await entity_writer.submit({
+                    "id": row_id,
+                    "entity_id": entity_id,
+                    "object_type": object_type,
+                    "camera_id": camera_id,
+                    "location": WKTElement(f'POINT({longitude} {latitude})', srid=4326),
+                    "first_seen": trace.captured_at,
+                    "last_seen": trace.captured_at,
+                    "is_active": True,
+                    "confidence": record["confidence"],
+                    "is_recognized": False,
+                })
+        except Overloaded:
+            self.counts["shed"] += 1
+            return None
+        except Exception as e:
+            print(f"❌ Failed to replay entity: {e}")
+            self.counts["failed"] += 1
+            return None
+        trace.mark("persist")
+
+        live_state.add(LiveEntity(
+            id=row_id,
+            entity_id=entity_id,
+            object_type=object_type,
+            camera_id=camera_id,
+            latitude=latitude,
+            longitude=longitude,
+            confidence=record["confidence"],
+            first_seen=trace.captured_at,
+            last_seen=trace.captured_at,
+        ))
+        resource_versions.bump("entities")
+        trace.mark("publish")
+        latency_tracker.observe(trace)
+        self.counts["written"] += 1
+
+        rows = zone_evaluator.event_rows(entity_id, camera_id, latitude, longitude)
+        if rows:
+            await self._zone_events(rows)
+        return entity_id
+
+    async def _event(self, record: dict):
+        """Record a replayed event (merged into open windows like any other)."""
+        camera_id = record["camera_id"]
+        trace = LatencyTrace(camera_id)
+        metadata = dict(record.get("metadata") or {}, replayed=True)
+        admission_control.load_camera(camera_id)
+        async with AsyncSessionLocal() as db:
+            try:
+                with admission_control.admit(camera_id, record["event_type"], record["confidence"]):
+                    await event_coalescer.record(
+                        db,
+                        camera_id=camera_id,
+                        event_type=record["event_type"],
+                        confidence=record["confidence"],
+                        metadata=metadata,
+                        timestamp=trace.captured_at
+                    )
+                    await db.commit()
+            except Overloaded:
+                self.counts["shed"] += 1
+                return
+            except Exception as e:
+                print(f"❌ Failed to replay event: {e}")
+                self.counts["failed"] += 1
+                await db.rollback()
+                return
+        trace.mark("persist")
+        resource_versions.bump("events")
+        trace.mark("publish")
+        latency_tracker.observe(trace)
+        self.counts["written"] += 1
+
+    async def _zone_events(self, rows: List[dict]):
+        for row in rows:
+            try:
+                with admission_control.admit(row["camera_id"], row["event_type"], row["confidence"]):
+                    await event_writer.submit(row)
+            except Exception as e:
+                print(f"❌ Failed to save zone event: {e}")
+        resource_versions.bump("events")
+
+
+async def main(paths: List[str], speed: Optional[float]):
+    pace = "as fast as possible" if speed is None else f"at {speed:g}x"
+    print(f"⏯️ Replaying {len(paths)} recording(s) {pace}")
+    print(f"📊 Database: {settings.DATABASE_URL.split('@')[1]}")
+
+    await notifications.start()
+    await camera_registry.ensure_loaded()
+    await zone_evaluator.load()
+    await latency_tracker.start()
+    await live_state.start(writer=True)
+
+    replayer = Replayer(speed)
+    try:
+        elapsed = await replayer.run(read_records(paths))
+    finally:
+        await event_writer.stop()  # Write out queued inserts
+        await entity_writer.stop()
+        await live_state.stop()  # Final write-behind flush
+        await latency_tracker.stop()
+        await notifications.stop()
+        await engine.dispose()
+
+    counts = replayer.counts
+    records = sum(counts[kind] for kind in ("entity", "move", "lost", "event"))
+    print(f"🏁 Replayed {records} records in {elapsed:.1f}s ({records / max(elapsed, 1e-9):.0f}/s)")
+    print(
+        f"   entities {counts['entity']}, moves {counts['move']}, lost {counts['lost']}, events {counts['event']}; "
+        f"written {counts['written']}, shed {counts['shed']}, failed {counts['failed']}, skipped {counts['skipped']}"
+    )
+    for shed in admission_control.stats()["shed"]:
+        print(f"   🚦 shed {shed['count']} {shed['priority']} ({shed['reason']})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded detection streams")
+    parser.add_argument("recordings", nargs="+", help="Recorded .ndjson.gz files")
+    parser.add_argument(
+        "--speed", type=parse_speed, default=1.0,
+        help="1-100 times the recorded pace, or max (default: 1)"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.recordings, args.speed))
@@ -0,0 +1,66 @@
+"""
+Background Workers
+Runs camera processing for this worker's shard, and the singleton jobs
+(heatmap rollups, playback recording, entity archival) in whichever
+worker wins the leader election.
+
+Every worker joins the registry and gets a consistent-hash share of the
+cameras; its simulator processes only those, and its live entity store
+owns only their entities. If the leader loses the lock it stops the
+singleton jobs and keeps processing its shard.
+"""
+from typing import Set
+from app.services.batch_writer import entity_writer, event_writer
+from app.services.live_state import live_state
+from app.workers.clip_recorder import clip_recorder
+from app.workers.entity_archiver import entity_archiver
+from app.workers.heatmap_rollup import heatmap_rollup
+from app.workers.leader import LeaderElection
+from app.workers.playback_recorder import playback_recorder
+from app.workers.registry import WorkerRegistry
+from app.workers.simulator import simulator
+
+
+class BackgroundWorkers:
+    def __init__(self):
+        self.election = LeaderElection(self._lead, self._follow)
+        self.registry = WorkerRegistry(self._reshard)
+
+    async def start(self):
+        """Mirror entities until assigned a shard, and campaign for leader"""
+        await live_state.start(writer=False)
+        clip_recorder.start()
+        await simulator.start()
+        await self.registry.start()
+        await self.election.start()
+
+    async def stop(self):
+        """Hand back our cameras, stop jobs (if leading) and give up the lock"""
+        await self.registry.stop()
+        await self.election.stop()
+        await simulator.stop()
+        await event_writer.stop()  # Write out queued inserts
+        await entity_writer.stop()
+        await live_state.stop()  # Final write-behind flush
+        await clip_recorder.stop()
+
+    async def _reshard(self, cameras: Set[int]):
+        await simulator.set_shard(cameras)
+        # Let in-flight inserts land before handing cameras over
+        await event_writer.stop()
+        await entity_writer.stop()
+        await live_state.set_cameras(cameras)
+
+    async def _lead(self):
+        await heatmap_rollup.start()
+        await playback_recorder.start()
+        await entity_archiver.start()
+
+    async def _follow(self):
+        await heatmap_rollup.stop()
+        await playback_recorder.stop()
+        await entity_archiver.stop()
+
+
+# Global background workers instance
+background_workers = BackgroundWorkers()
@@ -1,73 +1,134 @@
 """
 Camera Simulator
 Generates fake camera data for testing.
+
+Every worker runs one, limited to the cameras in its shard: it only
+detects on active cameras it has been assigned, and only moves, names
+and expires entities on cameras it owns.
+
+Set SIMULATOR_SEED for reproducible synthetic data. What it generates is
+recorded by the stream recorder (when enabled) for later replay.
 """
 import asyncio
+import functools
 import random
-from datetime import datetime, timedelta
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+import numpy as np
 from geoalchemy2.elements import WKTElement
-from sqlalchemy import select, func
+from app.config import settings
 from app.db.session import AsyncSessionLocal
-from app.models.camera import Camera
-from app.models.entity import Entity
-from app.models.event import Event
+from app.services.admission import admission_control, Overloaded
+from app.services.batch_writer import entity_writer, event_writer
+from app.services.camera_registry import camera_registry, RegistryUnavailable
+from app.services.entity_service import entity_ids
+from app.services.event_coalescer import event_coalescer
+from app.services.latency_service import LatencyTrace, latency_tracker
+from app.services.live_state import live_state, LiveEntity
+from app.services.recognition import recognizer
+from app.services.reid import appearance_descriptor, reid_index
+from app.services.stream_recorder import stream_recorder
+from app.services.versions import resource_versions
+from app.services.zone_evaluator import zone_evaluator
+from app.workers.clip_recorder import clip_recorder
 
 
 class CameraSimulator:
     def __init__(self):
         self.running = False
         self.cameras = []
-        self.entity_counter = 0
+        self.shard = set()  # Camera IDs assigned to this worker
+        self.subscribed = False  # To camera registry changes
+        self._task = None
+        self._packet_task = None
+        self.frames = 0  # Synthetic frames pushed so far
+        self.recent_looks = deque(maxlen=50)  # (palette, camera_id) of recent entities
+        self.descriptors = {}  # entity_id -> appearance descriptor of active entities
+        # Own generators, so SIMULATOR_SEED makes runs repeatable
+        self.random = random.Random(settings.SIMULATOR_SEED)
+        self.rng = np.random.default_rng(settings.SIMULATOR_SEED)
         
     async def start(self):
         """Start the simulator"""
         self.running = True
         print("🎬 Simulator started")
         
-        # Load cameras from database
-        await self._load_cameras()
+        # Cameras come from the registry and follow every change; zones from the database
+        try:
+            await camera_registry.ensure_loaded()
+        except RegistryUnavailable as e:
+            # Cameras arrive through the subscription once a heartbeat loads it
+            print(f"⚠️ Simulator starting without cameras: {e}")
+        if not self.subscribed:
+            camera_registry.subscribe(self._apply_cameras)
+            self.subscribed = True
+        self._apply_cameras()
+        await zone_evaluator.load()
         
-        # Start simulation loop
-        asyncio.create_task(self._simulation_loop())
+        # Start simulation loop, and the camera streams clips are cut from
+        self._task = asyncio.create_task(self._simulation_loop())
+        self._packet_task = asyncio.create_task(self._packet_loop())
         
     async def stop(self):
         """Stop the simulator"""
         self.running = False
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        if self._packet_task is not None:
+            self._packet_task.cancel()
+            self._packet_task = None
         print("🛑 Simulator stopped")
         
-    async def _load_cameras(self):
-        """Load cameras from database - get lat/lon from Geography field"""
-        async with AsyncSessionLocal() as db:
-            try:
-                # Query cameras with their locations extracted
-                result = await db.execute(
-                    select(
-                        Camera.id,
-                        Camera.name,
-                        func.ST_Y(func.ST_AsText(Camera.location)).label('latitude'),
-                        func.ST_X(func.ST_AsText(Camera.location)).label('longitude')
-                    )
-                )
-                
-                self.cameras = []
-                for row in result:
-                    self.cameras.append({
-                        'id': row.id,
-                        'name': row.name,
-                        'latitude': float(row.latitude),
-                        'longitude': float(row.longitude)
-                    })
-                
-                print(f"📹 Simulating cameras: {[c['id'] for c in self.cameras]}")
-            except Exception as e:
-                print(f"❌ Failed to load cameras: {e}")
+    async def set_shard(self, cameras: set):
+        """Process only these cameras from now on"""
+        self.shard = set(cameras)
+        
+    def _processing(self) -> list:
+        """Active cameras in our shard"""
+        return [c for c in self.cameras if c['id'] in self.shard and c['is_active']]
+        
+    def _apply_cameras(self):
+        """Pick up the current cameras from the registry (called on every change)"""
+        self.cameras = [
+            {
+                'id': camera.id,
+                'name': camera.name,
+                'latitude': float(camera.latitude),
+                'longitude': float(camera.longitude),
+                'is_active': camera.is_active is not False
+            }
+            for camera in camera_registry.all()
+        ]
+        for camera in camera_registry.all():
+            admission_control.configure(camera.id, camera.config)
+        reid_index.set_cameras(self.cameras)
+        
+    async def _packet_loop(self):
+        """Feed each camera's clip buffer a synthetic encoded stream"""
+        while self.running:
+            await asyncio.sleep(1 / settings.SIMULATOR_PACKET_FPS)
+            now = time.time()
+            for camera in self._processing():
+                clip_recorder.push_packet(camera['id'], self._frame(camera['id'], now), now)
             
+    def _frame(self, camera_id: int, now: float) -> bytes:
+        """Stand-in MJPEG frame: JPEG start/end markers around a small payload"""
+        self.frames += 1
+        payload = f"camera {camera_id} frame {self.frames} at {now:.3f}".encode()
+        return b"\xff\xd8" + payload + b"\xff\xd9"
+        
     async def _simulation_loop(self):
         """Main simulation loop"""
         while self.running:
             try:
                 # Heartbeat
-                print(f"💓 Simulator heartbeat - Active cameras: {len(self.cameras)}")
+                print(f"💓 Simulator heartbeat - Cameras in shard: {len(self._processing())}")
+                
+                # Pick up zone edits made through the API (possibly another process)
+                await zone_evaluator.refresh_if_changed()
                 
                 # Generate random entities
                 await self._generate_entities()
@@ -78,6 +139,9 @@ class CameraSimulator:
                 # Update existing entities (make them move)
                 await self._update_entities()
                 
+                # Name entities that match the known-identity gallery
+                await self._recognize_entities()
+                
                 # Clean up old entities (less aggressively)
                 await self._cleanup_entities()
                 
@@ -90,155 +154,264 @@ class CameraSimulator:
                 
     async def _generate_entities(self):
         """Generate new random entities near cameras"""
-        if not self.cameras:
+        cameras = self._processing()
+        if not cameras:
             return
             
         # Randomly decide if we should spawn a new entity (50% chance each cycle)
-        if random.random() > 0.5:
+        if self.random.random() > 0.5:
             return
             
-        async with AsyncSessionLocal() as db:
-            try:
-                # Pick random camera
-                camera = random.choice(self.cameras)
-                
-                # Random entity type
-                entity_types = ["person", "vehicle", "animal"]
-                entity_type = random.choice(entity_types)
-                
+        try:
+            # Pick random camera
+            camera = self.random.choice(cameras)
+            trace = LatencyTrace(camera['id'])  # Frame captured
+            
+            # Random entity type
+            entity_types = ["person", "vehicle", "animal"]
+            entity_type = self.random.choice(entity_types)
+            
+            # Create entity near camera with small random offset
+            lat_offset = self.random.uniform(-0.0005, 0.0005)
+            lon_offset = self.random.uniform(-0.0005, 0.0005)
+            
+            lat = camera['latitude'] + lat_offset
+            lon = camera['longitude'] + lon_offset
+            
+            now = trace.captured_at
+            confidence = self.random.uniform(0.7, 0.99)
+            
+            crop = self._crop(camera['id'])
+            trace.mark("decode")
+            descriptor = appearance_descriptor(crop)
+            trace.mark("detect")
+            
+            # Same object as one recently seen on a nearby camera?
+            (match,) = reid_index.match([(descriptor, camera['id'])])
+            linked_entity_id = match[0] if match else None
+            trace.mark("track")
+            
+            with admission_control.admit(camera['id'], entity_type, confidence):
                 # Create unique entity ID
-                self.entity_counter += 1
-                entity_id = f"{entity_type}_{self.entity_counter}"
-                
-                # Create entity near camera with small random offset
-                lat_offset = random.uniform(-0.0005, 0.0005)
-                lon_offset = random.uniform(-0.0005, 0.0005)
-                
-                lat = camera['latitude'] + lat_offset
-                lon = camera['longitude'] + lon_offset
-                
-                now = datetime.utcnow()
-                
-                entity = Entity(
-                    entity_id=entity_id,
-                    object_type=entity_type,
-                    camera_id=camera['id'],
-                    location=WKTElement(f'POINT({lon} {lat})', srid=4326),
-                    first_seen=now,
-                    last_seen=now,
-                    is_active=True,
-                    confidence=random.uniform(0.7, 0.99),
-                    is_recognized=False
-                )
-                
-                db.add(entity)
-                await db.commit()
-                print(f"✨ Created entity: {entity_id} near camera {camera['name']}")
+                row_id = await entity_ids.reserve()
+                entity_id = f"{entity_type}_{row_id}"
                 
-            except Exception as e:
-                print(f"❌ Failed to generate entity: {e}")
-                await db.rollback()
+                await entity_writer.submit({
+                    "id": row_id,
+                    "entity_id": entity_id,
+                    "object_type": entity_type,
+                    "camera_id": camera['id'],
+                    "location": WKTElement(f'POINT({lon} {lat})', srid=4326),
+                    "first_seen": now,
+                    "last_seen": now,
+                    "is_active": True,
+                    "confidence": confidence,
+                    "is_recognized": False,
+                    "linked_entity_id": linked_entity_id
+                })
+            trace.mark("persist")
+            stream_recorder.record(
+                "entity", now, camera_id=camera['id'], entity_id=entity_id, object_type=entity_type,
+                latitude=lat, longitude=lon, confidence=confidence
+            )
+            reid_index.add(row_id, camera['id'], descriptor, identity=linked_entity_id)
+            self.descriptors[entity_id] = descriptor
+            
+            live_state.add(LiveEntity(
+                id=row_id,
+                entity_id=entity_id,
+                object_type=entity_type,
+                camera_id=camera['id'],
+                latitude=lat,
+                longitude=lon,
+                confidence=confidence,
+                first_seen=now,
+                last_seen=now,
+                linked_entity_id=linked_entity_id
+            ))
+            resource_versions.bump("entities")
+            trace.mark("publish")
+            latency_tracker.observe(trace)
+            print(f"✨ Created entity: {entity_id} near camera {camera['name']}")
+            if match:
+                print(f"🔗 Re-identified {entity_id} as entity #{match[0]} (similarity {match[1]:.2f})")
+            
+            if await self._write_zone_events(zone_evaluator.event_rows(entity_id, camera['id'], lat, lon)):
+                resource_versions.bump("events")
+            
+        except Overloaded as e:
+            # Recorded anyway - a replay should offer the same load
+            stream_recorder.record(
+                "entity", now, camera_id=camera['id'], entity_id=None, object_type=entity_type,
+                latitude=lat, longitude=lon, confidence=confidence
+            )
+            print(f"🚦 Shed entity at camera {camera['id']}: {e.reason}")
+        except Exception as e:
+            print(f"❌ Failed to generate entity: {e}")
+    
+    def _crop(self, camera_id: int) -> np.ndarray:
+        """Fake 32x16 RGB crop: a few colors plus noise (sometimes a returning look)"""
+        others = [look for look in self.recent_looks if look[1] != camera_id]
+        if others and self.random.random() < 0.3:
+            palette = self.random.choice(others)[0]
+        else:
+            palette = self.rng.integers(0, 256, size=(3, 3)).astype(np.float32)
+        self.recent_looks.append((palette, camera_id))
+        
+        pixels = palette[self.rng.integers(0, len(palette), size=(32, 16))]
+        pixels += self.rng.normal(0, 6, size=pixels.shape)
+        return np.clip(pixels, 0, 255).astype(np.uint8)
+    
+    async def _recognize_entities(self):
+        """Check due entities against the gallery in one batch (results are cached)"""
+        await recognizer.refresh_if_changed()
+        
+        queries = [
+            (entity.entity_id, self.descriptors[entity.entity_id], entity.object_type)
+            for entity in live_state.owned()
+            if entity.entity_id in self.descriptors and recognizer.due(entity.entity_id)
+        ]
+        if not queries:
+            return
+        
+        for (entity_id, _, _), result in zip(queries, recognizer.recognize(queries)):
+            name = result[1] if result else None
+            entity = live_state.get(entity_id)
+            if name and entity.recognized_as != name:
+                print(f"🪪 Recognized {entity_id} as {name} (similarity {result[2]:.2f})")
+            live_state.recognize(entity_id, name)
     
     async def _update_entities(self):
-        """Move existing entities around"""
-        async with AsyncSessionLocal() as db:
-            try:
-                # Get all active entities
-                result = await db.execute(
-                    select(
-                        Entity.id,
-                        Entity.entity_id,
-                        Entity.camera_id,
-                        func.ST_Y(func.ST_AsText(Entity.location)).label('latitude'),
-                        func.ST_X(func.ST_AsText(Entity.location)).label('longitude')
-                    ).where(Entity.is_active == True)
-                )
-                
-                entities = result.all()
-                
-                for entity_row in entities:
-                    # Move entity slightly (simulate movement)
-                    lat = float(entity_row.latitude)
-                    lon = float(entity_row.longitude)
-                    
-                    # Random movement
-                    lat += random.uniform(-0.0001, 0.0001)
-                    lon += random.uniform(-0.0001, 0.0001)
-                    
-                    # Update entity location
-                    entity = await db.get(Entity, entity_row.id)
-                    
-                    if entity:
-                        entity.location = WKTElement(f'POINT({lon} {lat})', srid=4326)
-                        entity.last_seen = datetime.utcnow()
-                
-                if entities:
-                    await db.commit()
-                    print(f"🚶 Updated {len(entities)} entities")
-                    
-            except Exception as e:
-                print(f"❌ Failed to update entities: {e}")
-                await db.rollback()
+        """Move existing entities around (in memory - flushed by live_state)"""
+        entities = live_state.owned()
+        if not entities:
+            return
+            
+        zone_events = []
+        for entity in entities:
+            # Random movement
+            lat = entity.latitude + self.random.uniform(-0.0001, 0.0001)
+            lon = entity.longitude + self.random.uniform(-0.0001, 0.0001)
+            
+            live_state.move(entity.entity_id, lat, lon)
+            stream_recorder.record("move", entity_id=entity.entity_id, latitude=lat, longitude=lon)
+            zone_events.extend(zone_evaluator.event_rows(entity.entity_id, entity.camera_id, lat, lon))
+        
+        # Only zone transitions need a write right away
+        if await self._write_zone_events(zone_events):
+            resource_versions.bump("events")
+        print(f"🚶 Updated {len(entities)} entities")
+    
+    async def _write_zone_events(self, rows: list) -> int:
+        """Submit zone events together so they share one batch; returns rows written"""
+        results = await asyncio.gather(
+            *(self._submit_event(row) for row in rows), return_exceptions=True
+        )
+        for error in (r for r in results if isinstance(r, Exception)):
+            print(f"❌ Failed to save zone event: {error}")
+        return sum(1 for r in results if not isinstance(r, Exception))
+    
+    async def _submit_event(self, row: dict) -> int:
+        with admission_control.admit(row["camera_id"], row["event_type"], row["confidence"]):
+            return await event_writer.submit(row)
     
     async def _cleanup_entities(self):
-        """Remove entities that haven't been seen in a while"""
-        async with AsyncSessionLocal() as db:
-            try:
-                # Deactivate entities older than 60 seconds (much longer now!)
-                cutoff_time = datetime.utcnow() - timedelta(seconds=60)
-                
-                result = await db.execute(
-                    select(Entity).where(
-                        Entity.is_active == True,
-                        Entity.last_seen < cutoff_time
-                    )
-                )
-                
-                old_entities = result.scalars().all()
-                count = 0
-                
-                for entity in old_entities:
-                    entity.is_active = False
-                    count += 1
-                
-                if count > 0:
-                    await db.commit()
-                    print(f"🧹 Deactivated {count} old entities")
-                    
-            except Exception as e:
-                print(f"❌ Failed to cleanup entities: {e}")
-                await db.rollback()
+        """Deactivate entities that haven't been seen in a while"""
+        # Deactivate entities older than 60 seconds (much longer now!)
+        cutoff_time = datetime.utcnow() - timedelta(seconds=60)
+        
+        old_entities = live_state.stale(cutoff_time)
+        for entity_id in old_entities:
+            entity = live_state.get(entity_id)
+            # Re-id window runs from when the track ended
+            reid_index.end(entity.id, entity.last_seen.replace(tzinfo=timezone.utc).timestamp())
+            live_state.deactivate(entity_id)
+            stream_recorder.record("lost", entity_id=entity_id)
+            zone_evaluator.forget(entity_id)
+            recognizer.forget(entity_id)
+            self.descriptors.pop(entity_id, None)
+        reid_index.evict()
+        
+        if old_entities:
+            print(f"🧹 Deactivated {len(old_entities)} old entities")
             
     async def _generate_events(self):
-        """Generate random events"""
-        if not self.cameras:
+        """Generate random events (about one per cycle across our cameras)"""
+        cameras = self._processing()
+        if not cameras:
             return
-            
+        
+        # Cameras detect independently; concurrent inserts share a batch
+        chance = 1 / len(cameras)
+        detecting = [c for c in cameras if self.random.random() < chance]
+        if not detecting:
+            return
+        
+        traces = await asyncio.gather(*(self._generate_event(c) for c in detecting))
+        traces = [trace for trace in traces if trace is not None]
+        if traces:
+            resource_versions.bump("events")
+        for trace in traces:
+            trace.mark("publish")
+            latency_tracker.observe(trace)
+    
+    async def _link_clip(self, event_id: int, path: Optional[str], error: Optional[str]):
+        """Point an event at its saved clip, or say why there is none"""
+        await event_coalescer.annotate(event_id, {"clip": path} if path else {"clip_error": error})
+    
+    async def _generate_event(self, camera: dict) -> Optional[LatencyTrace]:
+        """Generate one random event at a camera; returns its latency trace if saved"""
+        trace = LatencyTrace(camera['id'])  # Frame captured
         async with AsyncSessionLocal() as db:
             try:
-                # Pick random camera
-                camera = random.choice(self.cameras)
-                
                 # Random event type
                 event_types = ["motion", "person", "vehicle", "animal"]
-                event_type = random.choice(event_types)
+                event_type = self.random.choice(event_types)
+                trace.mark("detect")
                 
-                # Create event
-                event = Event(
-                    camera_id=camera['id'],
-                    event_type=event_type,
-                    confidence=random.uniform(0.7, 0.99),
-                    event_metadata={"simulated": True, "location": camera['name']}
+                metadata = {"simulated": True, "location": camera['name']}
+                confidence = self.random.uniform(0.7, 0.99)
+                stream_recorder.record(
+                    "event", trace.captured_at, camera_id=camera['id'], event_type=event_type,
+                    confidence=confidence, metadata=dict(metadata)
                 )
                 
-                db.add(event)
-                await db.commit()
+                with admission_control.admit(camera['id'], event_type, confidence):
+                    trace.mark("track")
+                    metadata["latency"] = trace.to_metadata()
+                    
+                    # Create event (or merge into an open one), stamped with capture time
+                    event_id, merged = await event_coalescer.record(
+                        db,
+                        camera_id=camera['id'],
+                        event_type=event_type,
+                        confidence=confidence,
+                        metadata=metadata,
+                        timestamp=trace.captured_at
+                    )
+                    await db.commit()
+                    trace.mark("persist")
                 
-                print(f"🎯 Generated event: {event_type} detected at {camera['name']}")
+                if merged:
+                    print(f"🔁 Merged event: {event_type} at {camera['name']} into #{event_id}")
+                else:
+                    print(f"🎯 Generated event: {event_type} detected at {camera['name']}")
+                    # Save pre-roll + post-roll from the camera's packet buffer
+                    # (once per coalesced event), linked once it's on disk
+                    clip_recorder.trigger(
+                        camera['id'],
+                        event_time=trace.captured_at.replace(tzinfo=timezone.utc).timestamp(),
+                        on_finished=functools.partial(self._link_clip, event_id)
+                    )
+                return trace
                 
+            except Overloaded as e:
+                print(f"🚦 Shed {event_type} event at {camera['name']}: {e.reason}")
+                return None
             except Exception as e:
                 print(f"❌ Failed to generate event: {e}")
                 await db.rollback()
+                return None
 
 
 # Global simulator instance
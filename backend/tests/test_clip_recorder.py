@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+from app.config import settings
+from app.workers.clip_recorder import ClipRecorder, PacketRingBuffer
+
+
+def test_ring_buffer_evicts_by_age_and_size():
+    buffer = PacketRingBuffer(max_seconds=2, max_bytes=10)
+    for t in range(5):
+        buffer.append(float(t), b"ab")
+    assert [p[0] for p in buffer.packets] == [2.0, 3.0, 4.0]
+
+    buffer.append(5.0, b"x" * 9)
+    assert buffer.size <= 10
+    assert [p[0] for p in buffer.packets] == [5.0]
+
+
+def test_window_starts_at_keyframe():
+    buffer = PacketRingBuffer(max_seconds=60, max_bytes=1000)
+    buffer.append(1.0, b"p1", keyframe=False)
+    buffer.append(2.0, b"k2")
+    buffer.append(3.0, b"p3", keyframe=False)
+    buffer.append(9.0, b"k9")
+    assert buffer.window(0, 5) == [b"k2", b"p3"]
+
+
+def _recorder(monkeypatch, tmp_path, post_roll=0.05):
+    monkeypatch.setattr(settings, "CLIP_STORAGE_DIR", str(tmp_path))
+    recorder = ClipRecorder()
+    recorder.pre_roll = 5
+    recorder.post_roll = post_roll
+    return recorder
+
+
+def test_clip_is_written_before_it_is_linked(monkeypatch, tmp_path):
+    recorder = _recorder(monkeypatch, tmp_path)
+    linked = []
+
+    async def on_finished(path, error):
+        with open(path, "rb") as f:
+            linked.append((f.read(), error))
+
+    async def run():
+        now = time.time()
+        recorder.push_packet(1, b"one", now - 1)
+        recorder.push_packet(1, b"two", now)
+        assert recorder.trigger(1, now, on_finished) is not None
+        assert not linked  # Still waiting out the post-roll
+        await recorder.stop()
+
+    asyncio.run(run())
+    assert linked == [(b"onetwo", None)]
+
+
+def test_empty_window_reports_error(monkeypatch, tmp_path):
+    recorder = _recorder(monkeypatch, tmp_path)
+    results = []
+
+    async def on_finished(path, error):
+        results.append((path, error))
+
+    async def run():
+        recorder.push_packet(1, b"old", time.time() - 60)
+        recorder.trigger(1, time.time(), on_finished)
+        await recorder.stop()
+
+    asyncio.run(run())
+    assert results == [(None, "no packets around the event")]
+    assert not list(tmp_path.rglob("*.*"))
+
+
+def test_post_roll_is_waited_for_after_restart(monkeypatch, tmp_path):
+    recorder = _recorder(monkeypatch, tmp_path, post_roll=0.2)
+
+    async def run():
+        await recorder.stop()
+        recorder.start()
+        recorder.push_packet(1, b"frame")
+        started = time.monotonic()
+        recorder.trigger(1)
+        await asyncio.gather(*recorder.pending)
+        return time.monotonic() - started
+
+    assert asyncio.run(run()) >= 0.2
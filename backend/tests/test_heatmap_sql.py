@@ -0,0 +1,58 @@
+"""
+Heatmap queries against PostGIS.
+
+Needs TEST_DATABASE_URL pointing at a database migrated with alembic;
+everything runs in a transaction that is rolled back.
+"""
+import asyncio
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.services.heatmap_service import HeatmapService
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+pytestmark = pytest.mark.skipif(not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set")
+
+
+async def _heatmap(shape: str) -> dict:
+    engine = create_async_engine(TEST_DATABASE_URL)
+    try:
+        async with engine.connect() as conn:
+            transaction = await conn.begin()
+            try:
+                camera_id = (await conn.execute(text("""
+                    INSERT INTO cameras (name, rtsp_url, location)
+                    VALUES ('heatmap test', 'rtsp://test', ST_GeogFromText('SRID=4326;POINT(-122.4194 37.7749)'))
+                    RETURNING id
+                """))).scalar()
+                now = datetime.utcnow()
+                await conn.execute(
+                    text("""
+                        INSERT INTO events (camera_id, event_type, confidence, event_metadata, timestamp)
+                        VALUES (:camera_id, 'heatmap_test', 0.9, '{}', :ts)
+                    """),
+                    {"camera_id": camera_id, "ts": now - timedelta(minutes=5)},
+                )
+                db = AsyncSession(bind=conn)
+                return await HeatmapService(db).get_heatmap(
+                    "events", now - timedelta(hours=1), now, cell_m=100, shape=shape, kind="heatmap_test"
+                )
+            finally:
+                await transaction.rollback()
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.parametrize("shape", ["square", "hex"])
+def test_heatmap_cell_centers(shape):
+    heatmap = asyncio.run(_heatmap(shape))
+
+    assert heatmap["count"] == [1]
+    # Cell center within a cell's width of the camera (~0.001 degrees per 100m)
+    assert abs(heatmap["latitude"][0] - 37.7749) < 0.002
+    assert abs(heatmap["longitude"][0] - -122.4194) < 0.002
@@ -0,0 +1,50 @@
+import time
+
+import numpy as np
+
+from app.config import settings
+from app.services.reid import DESCRIPTOR_SIZE, ReIdIndex
+
+CAMERAS = [
+    {"id": 1, "latitude": 37.7749, "longitude": -122.4194},
+    {"id": 2, "latitude": 37.7750, "longitude": -122.4195},  # ~15m away
+]
+
+
+def _descriptor(seed: int) -> np.ndarray:
+    vector = np.random.default_rng(seed).random(DESCRIPTOR_SIZE).astype(np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def _index() -> ReIdIndex:
+    index = ReIdIndex(capacity=8)
+    index.set_cameras(CAMERAS)
+    return index
+
+
+def test_live_track_outlasting_the_window_still_matches():
+    index = _index()
+    descriptor = _descriptor(1)
+    index.add(100, 1, descriptor, seen=0.0)
+
+    later = 10 * settings.REID_WINDOW_SECONDS
+    index.evict(now=later)
+    assert index.match([(descriptor, 2)], now=later)[0][0] == 100
+
+    # Once it ends, the window runs from its end
+    index.end(100, seen=later)
+    index.evict(now=later + settings.REID_WINDOW_SECONDS / 2)
+    assert index.match([(descriptor, 2)], now=later + settings.REID_WINDOW_SECONDS / 2)[0][0] == 100
+    index.evict(now=later + 2 * settings.REID_WINDOW_SECONDS)
+    assert 100 not in index.rows
+
+
+def test_full_index_replaces_ended_tracks_first():
+    index = _index()
+    now = time.time()
+    for entity_id in range(8):
+        index.add(entity_id, 1, _descriptor(entity_id), seen=now - 100 + entity_id)
+    index.end(5, seen=now)  # Ended just now (within the window), still live: the rest
+    index.add(99, 1, _descriptor(99), seen=now)
+    assert 5 not in index.rows
+    assert 0 in index.rows
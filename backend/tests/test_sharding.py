@@ -0,0 +1,55 @@
+import json
+import os
+import subprocess
+import sys
+
+from app.services.sharding import HashRing, assign
+
+CAMERAS = range(1, 5001)
+WORKERS = [f"worker-{n}" for n in range(5)]
+
+
+def test_adding_a_worker_only_takes_over_cameras_for_it():
+    before = assign(WORKERS, CAMERAS)
+    after = assign(WORKERS + ["worker-new"], CAMERAS)
+
+    moved = [camera_id for camera_id in CAMERAS if before[camera_id] != after[camera_id]]
+    assert all(after[camera_id] == "worker-new" for camera_id in moved)
+    # About 1/N of the cameras (N = 6 workers now)
+    assert 0.5 / 6 < len(moved) / len(CAMERAS) < 1.5 / 6
+
+
+def test_removing_a_worker_only_moves_its_cameras():
+    before = assign(WORKERS, CAMERAS)
+    after = assign(WORKERS[1:], CAMERAS)
+
+    moved = [camera_id for camera_id in CAMERAS if before[camera_id] != after[camera_id]]
+    assert moved == [camera_id for camera_id in CAMERAS if before[camera_id] == WORKERS[0]]
+    assert 0.5 / 5 < len(moved) / len(CAMERAS) < 1.5 / 5
+
+
+def test_every_camera_is_assigned():
+    assert set(assign(WORKERS, CAMERAS).values()) == set(WORKERS)
+    assert HashRing([]).owner(1) is None
+
+
+def test_assignment_ignores_worker_order_and_duplicates():
+    assert assign(WORKERS, CAMERAS) == assign(list(reversed(WORKERS)) + WORKERS[:2], CAMERAS)
+
+
+def test_assignment_is_the_same_in_every_process():
+    script = (
+        "import json; from app.services.sharding import assign; "
+        f"print(json.dumps(assign({WORKERS!r}, range(1, 201))))"
+    )
+    results = []
+    for seed in ("1", "2"):
+        env = dict(os.environ, PYTHONHASHSEED=seed)  # str hashes differ per process
+        output = subprocess.run(
+            [sys.executable, "-c", script], env=env, check=True, capture_output=True, text=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        ).stdout
+        results.append(json.loads(output.strip().splitlines()[-1]))
+
+    expected = {str(camera_id): worker for camera_id, worker in assign(WORKERS, range(1, 201)).items()}
+    assert results[0] == results[1] == expected
@@ -37,10 +37,7 @@ if [ -n "$CAMERA_ID" ]; then
     
     echo "✅ Camera is now online"
     
-    # Restart backend to reload simulator
-    echo "🔄 Restarting backend..."
-    docker-compose restart backend > /dev/null 2>&1
-    
+    # Workers pick the camera up on their own (no restart needed)
     echo "🎉 Done! Refresh your browser."
 else
     echo "❌ Failed to create camera"